@@ -12,21 +12,40 @@ Usage:
     python3 build_book.py --lang es       # Spanish edition (ES suffix)
     python3 build_book.py --lang ru       # Russian edition
     python3 build_book.py --lang uk       # Ukrainian edition
+    python3 build_book.py --lang all -j 0 # every edition, formats in parallel
     python3 build_book.py --bump          # increment version (v9 → v10)
+    python3 build_book.py --no-cache      # rebuild even if nothing changed
+
+Builds are incremental: each artefact is skipped when the SHA-256 of its
+inputs (chapters, listing sources, metadata, CHANGELOG, images, pandoc
+version and this script) matches the last successful build, recorded in
+build/cache/book.json.
+
+Each pandoc run is a job with its own log in build/logs/; jobs run on a
+pool of -j workers, a failed job does not stop the others, and a summary
+table lists wall time per artefact.
 """
 
 import argparse
+import hashlib
 import json
+import os
 import re
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 from glob import glob
 from pathlib import Path
 
 ROOT = Path(__file__).parent
 BUILD_DIR = ROOT / "build"
 VERSION_FILE = ROOT / "version.json"
+CACHE_FILE = BUILD_DIR / "cache" / "book.json"
+LOG_DIR = BUILD_DIR / "logs"
 
 TITLE = "Coding the Impossible"
 SUBTITLE = "Z80 Demoscene Techniques for Modern Makers"
@@ -65,6 +84,7 @@ TRANSLATIONS = {
         "extra_files": ["translations/uk/glossary.md"],
     },
 }
+LANGUAGES = ["en"] + list(TRANSLATIONS)
 
 
 def load_version():
@@ -111,6 +131,29 @@ _TAGGED_SRC_RE = re.compile(
 )
 
 
+def _resolve_listing(src_path, base_dir=ROOT):
+    """Path of a src: listing, relative to base_dir then ROOT, or None."""
+    full_path = base_dir / src_path
+    if not full_path.exists():
+        full_path = ROOT / src_path
+    return full_path if full_path.exists() else None
+
+
+def listing_sources(text, base_dir=ROOT):
+    """Source files that preprocess_listings() would splice into text."""
+    found = []
+    for line in text.split('\n'):
+        m = _TAGGED_SRC_RE.match(line)
+        if not m:
+            continue
+        tags = dict(re.findall(r'(\w+):(\S+)', m.group(2)))
+        if 'src' in tags:
+            path = _resolve_listing(tags['src'], base_dir)
+            if path is not None and path not in found:
+                found.append(path)
+    return found
+
+
 def preprocess_listings(text, base_dir=ROOT):
     """Replace content of src:-tagged code blocks with fresh source file content.
 
@@ -139,13 +182,8 @@ def preprocess_listings(text, base_dir=ROOT):
                 while j < len(lines) and lines[j].rstrip() != '```':
                     j += 1
 
-                # Resolve source file
-                src_path = tags['src']
-                full_path = base_dir / src_path
-                if not full_path.exists():
-                    full_path = ROOT / src_path
-
-                if full_path.exists():
+                full_path = _resolve_listing(tags['src'], base_dir)
+                if full_path is not None:
                     src_text = full_path.read_text(encoding='utf-8')
                     src_lines = src_text.split('\n')
 
@@ -246,9 +284,95 @@ def combine_chapters(chapter_glob=CHAPTER_GLOB, extra_files=EXTRA_FILES,
     return "\n".join(parts)
 
 
-def write_metadata(vs, vtag="", paper="a4", title=TITLE, subtitle=SUBTITLE, lang=LANG):
+def book_inputs(chapter_glob=CHAPTER_GLOB, extra_files=EXTRA_FILES,
+                appendix_glob=APPENDIX_GLOB, changelog=False):
+    """Every file the combined markdown is built from, in build order:
+    the combine_chapters() inputs, their src: listings and the changelog."""
+    files = []
+    if DISCLAIMER_FILE.exists():
+        files.append(DISCLAIMER_FILE)
+    files += [Path(p) for p in sorted(glob(str(ROOT / chapter_glob)))]
+    files += [ROOT / name for name in extra_files if (ROOT / name).exists()]
+    files += [Path(p) for p in sorted(glob(str(ROOT / appendix_glob)))]
+    for path in list(files):
+        for src in listing_sources(path.read_text(encoding='utf-8')):
+            if src not in files:
+                files.append(src)
+    if changelog:
+        files.append(CHANGELOG_FILE)
+    return files
+
+
+def hash_files(paths, extra=()):
+    """SHA-256 over file names and contents, plus any extra strings."""
+    h = hashlib.sha256()
+    for item in extra:
+        h.update(item.encode("utf-8") + b"\0")
+    for path in paths:
+        try:
+            name = str(Path(path).resolve().relative_to(ROOT.resolve()))
+        except ValueError:
+            name = str(path)
+        h.update(name.encode("utf-8") + b"\0")
+        h.update(Path(path).read_bytes() + b"\0")
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def pandoc_version():
+    """First line of `pandoc --version`, part of every artefact's key."""
+    try:
+        result = subprocess.run(["pandoc", "--version"],
+                                capture_output=True, text=True)
+    except FileNotFoundError:
+        return "pandoc: not found"
+    return result.stdout.split("\n", 1)[0]
+
+
+# Images referenced from the combined markdown: ![alt](path ...)
+_IMAGE_RE = re.compile(r'!\[[^\]]*\]\(\s*([^)\s]+)')
+
+
+def artefact_key(cmd, combined, out):
+    """Cache key of one pandoc run: its command line, the pandoc version,
+    this script, and the contents of the files and images it reads."""
+    files = [Path(__file__)]
+    files += [Path(a) for a in cmd if a != str(out) and Path(a).is_file()]
+    for ref in _IMAGE_RE.findall(Path(combined).read_text(encoding="utf-8")):
+        path = ROOT / ref
+        if path.is_file() and path not in files:
+            files.append(path)
+    return hash_files(files, extra=[pandoc_version()] + cmd)
+
+
+def load_cache():
+    try:
+        with open(CACHE_FILE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    cache.setdefault("combined", {})
+    cache.setdefault("artefacts", {})
+    return cache
+
+
+# Parallel jobs share one cache dict; updates and saves go through this lock
+_CACHE_LOCK = threading.Lock()
+
+
+def save_cache(cache):
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = CACHE_FILE.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(cache, f, indent=2)
+        f.write("\n")
+    tmp.replace(CACHE_FILE)
+
+
+def write_metadata(vs, vtag="", paper="a4", title=TITLE, subtitle=SUBTITLE, lang=LANG,
+                   lang_suffix=""):
     """Generate metadata.yaml for pandoc with version on title page."""
-    meta = BUILD_DIR / "metadata.yaml"
+    meta = BUILD_DIR / f"metadata{lang_suffix}.yaml"
     date = datetime.now().strftime("%Y-%m-%d")
     date_line = f"{AUTHOR} --- {vtag} ({date})"
 
@@ -278,87 +402,247 @@ header-includes: |
     return meta
 
 
-def write_combined(text, vs):
+def combined_paths(vs, lang_suffix=""):
+    """(versioned, latest) combined markdown paths for one edition."""
+    return (BUILD_DIR / f"combined_{vs}{lang_suffix}.md",
+            BUILD_DIR / f"combined{lang_suffix}.md")
+
+
+def write_combined(text, vs, lang_suffix=""):
     """Write combined markdown to build dir."""
-    out = BUILD_DIR / f"combined_{vs}.md"
+    out, latest = combined_paths(vs, lang_suffix)
     out.write_text(text, encoding="utf-8")
     # Also write as "latest" for convenience
-    latest = BUILD_DIR / "combined.md"
     latest.write_text(text, encoding="utf-8")
     return latest
 
 
-def run_pandoc(args, label):
-    print(f"  Building {label}...")
+class BuildError(Exception):
+    """pandoc failed; the message carries its stderr."""
+
+
+def run_pandoc(args, label, cache=None, cache_id=None, log=None):
+    """Run pandoc unless cache[cache_id] records identical inputs and the
+    output still exists. Returns True if pandoc ran.
+
+    With a log path, pandoc's command line and output go to that file and
+    only a warning count is printed. Raises BuildError on failure."""
     cmd = ["pandoc", f"--resource-path={ROOT}"] + args
+    out = Path(args[args.index("-o") + 1])
+    key = None
+    if cache is not None:
+        key = artefact_key(cmd, args[1], out)
+        with _CACHE_LOCK:
+            cached = cache["artefacts"].get(cache_id)
+        if cached == key and out.exists():
+            print(f"  Up to date: {label}")
+            return False
+    print(f"  Building {label}...")
     result = subprocess.run(cmd, capture_output=True, text=True)
+    if log is not None:
+        log.parent.mkdir(parents=True, exist_ok=True)
+        log.write_text(f"$ {subprocess.list2cmdline(cmd)}\n"
+                       f"exit status {result.returncode}\n\n"
+                       f"{result.stdout}{result.stderr}", encoding="utf-8")
     if result.returncode != 0:
-        print(f"ERROR building {label}:", file=sys.stderr)
-        print(result.stderr, file=sys.stderr)
-        sys.exit(1)
-    if result.stderr:
+        raise BuildError(f"ERROR building {label}:\n{result.stderr}")
+    warnings = [line for line in result.stderr.strip().split("\n") if line.strip()]
+    if warnings and log is not None:
+        print(f"  [warn] {len(warnings)} line(s) from {label}, see {log.relative_to(ROOT)}")
+    else:
         # Print warnings but don't fail
-        for line in result.stderr.strip().split("\n"):
-            if line.strip():
-                print(f"  [warn] {line}")
+        for line in warnings:
+            print(f"  [warn] {line}")
+    if cache is not None:
+        with _CACHE_LOCK:
+            cache["artefacts"][cache_id] = key
+            save_cache(cache)
+    return True
+
+
+@lru_cache(maxsize=None)
+def _mermaid_filter_available():
+    return subprocess.run(["which", "mermaid-filter"],
+                          capture_output=True).returncode == 0
 
 
 def _mermaid_filter():
     """Return pandoc mermaid filter args if available."""
-    result = subprocess.run(["which", "mermaid-filter"], capture_output=True)
-    if result.returncode == 0:
+    if _mermaid_filter_available():
         return ["-F", "mermaid-filter"]
     return []
 
 
-def _copy_stable(out, base, ext):
+def _copy_stable(out, base, ext, built=True):
     """Copy build output to stable name: book-a4-v9-ES.pdf."""
     import shutil
     stable = BUILD_DIR / f"{base}{ext}"
+    if not built and stable.exists():
+        return
     shutil.copy2(out, stable)
     print(f"    → {stable.name}")
 
 
-def build_pdf_a4(meta, combined, vs, vtag, lang_suffix=""):
+def build_pdf_a4(meta, combined, vs, vtag, lang_suffix="", cache=None, log=None):
     out = BUILD_DIR / f"Coding_the_Impossible_{vs}{lang_suffix}.pdf"
-    run_pandoc([
+    built = run_pandoc([
         str(meta), str(combined),
         "-o", str(out),
         "--pdf-engine=lualatex",
         "-V", "fontsize=11pt",
         "-V", "geometry=a4paper, margin=1in",
-    ] + _mermaid_filter(), f"A4 PDF → {out.name}")
-    _copy_stable(out, f"book-a4-{vtag}{lang_suffix}", ".pdf")
-    return out
+    ] + _mermaid_filter(), f"A4 PDF → {out.name}",
+                       cache, f"a4{lang_suffix}", log)
+    _copy_stable(out, f"book-a4-{vtag}{lang_suffix}", ".pdf", built)
+    return out, built
 
 
-def build_pdf_a5(meta, combined, vs, vtag, lang_suffix=""):
+def build_pdf_a5(meta, combined, vs, vtag, lang_suffix="", cache=None, log=None):
     out = BUILD_DIR / f"Coding_the_Impossible_{vs}{lang_suffix}_A5.pdf"
-    run_pandoc([
+    built = run_pandoc([
         str(meta), str(combined),
         "-o", str(out),
         "--pdf-engine=lualatex",
         "-V", "fontsize=10pt",
         "-V", "geometry=a5paper, top=15mm, bottom=15mm, left=18mm, right=15mm",
-    ] + _mermaid_filter(), f"A5 PDF → {out.name}")
-    _copy_stable(out, f"book-a5-{vtag}{lang_suffix}", ".pdf")
-    return out
+    ] + _mermaid_filter(), f"A5 PDF → {out.name}",
+                       cache, f"a5{lang_suffix}", log)
+    _copy_stable(out, f"book-a5-{vtag}{lang_suffix}", ".pdf", built)
+    return out, built
 
 
-def build_epub(meta, combined, vs, vtag, lang_suffix=""):
+def build_epub(meta, combined, vs, vtag, lang_suffix="", cache=None, log=None):
     out = BUILD_DIR / f"Coding_the_Impossible_{vs}{lang_suffix}.epub"
-    run_pandoc([
+    built = run_pandoc([
         str(meta), str(combined),
         "-o", str(out),
         "--from", "markdown-tex_math_dollars",
         "--epub-chapter-level=1",
-    ] + _mermaid_filter(), f"EPUB → {out.name}")
-    _copy_stable(out, f"book-{vtag}{lang_suffix}", ".epub")
-    return out
+    ] + _mermaid_filter(), f"EPUB → {out.name}",
+                       cache, f"epub{lang_suffix}", log)
+    _copy_stable(out, f"book-{vtag}{lang_suffix}", ".epub", built)
+    return out, built
 
 
 CHANGELOG_FILE = ROOT / "CHANGELOG.md"
 
+# Format name → (label, builder). PDFs first: lualatex runs are the long
+# poles, so they start before the EPUBs when jobs are scheduled.
+FORMATS = {
+    "a4": ("A4 PDF", build_pdf_a4),
+    "a5": ("A5 PDF", build_pdf_a5),
+    "epub": ("EPUB", build_epub),
+}
+
+
+def edition_settings(lang):
+    """Title, globs and filename suffix for one language edition."""
+    if lang != "en":
+        tr = TRANSLATIONS[lang]
+        return {**tr, "suffix": f"_{lang.upper()}"}
+    return {
+        "title": TITLE,
+        "subtitle": SUBTITLE,
+        "lang": LANG,
+        "chapter_glob": CHAPTER_GLOB,
+        "appendix_glob": APPENDIX_GLOB,
+        "extra_files": EXTRA_FILES,
+        "suffix": "",
+    }
+
+
+def prepare_edition(lang, ed, vs, vtag, cache, no_changelog=False):
+    """Write (or reuse) one edition's combined markdown and metadata.
+    Returns (metadata path, combined markdown path)."""
+    print(f"Building: {ed['title']} [{vtag}] ({lang.upper()})")
+    lang_suffix = ed["suffix"]
+
+    # Reuse the combined markdown if none of its inputs changed
+    with_changelog = (lang == "en" and not no_changelog
+                      and CHANGELOG_FILE.exists())
+    inputs = book_inputs(ed["chapter_glob"], ed["extra_files"],
+                         ed["appendix_glob"], with_changelog)
+    inputs_key = hash_files(inputs + [Path(__file__)])
+    versioned, combined = combined_paths(vs, lang_suffix)
+    if (cache["combined"].get(lang) == inputs_key
+            and versioned.exists() and combined.exists()):
+        print(f"  Up to date: {combined.name}")
+    else:
+        text = combine_chapters(ed["chapter_glob"], ed["extra_files"], ed["appendix_glob"])
+
+        # Resolve src:-tagged code blocks with fresh source content
+        text = preprocess_listings(text)
+
+        # Strip custom fence tags (id:, src:, lines:) so pandoc sees clean fences
+        text = strip_fence_tags(text)
+
+        # Fix image paths: chapters use ../../build/ which breaks in combined.md
+        text = text.replace('../../build/', 'build/')
+
+        # Append changelog appendix (EN only, manually maintained CHANGELOG.md)
+        if with_changelog:
+            print("  Including CHANGELOG.md")
+            text += "\n\\newpage\n"
+            text += "\n" + CHANGELOG_FILE.read_text(encoding="utf-8")
+
+        combined = write_combined(text, vs, lang_suffix)
+        cache["combined"][lang] = inputs_key
+        save_cache(cache)
+    meta = write_metadata(vs, vtag=vtag, title=ed["title"], subtitle=ed["subtitle"],
+                          lang=ed["lang"], lang_suffix=lang_suffix)
+    return meta, combined
+
+
+def _run_job(job, vs, vtag, cache):
+    """Build one (language, format) artefact; never raises BuildError."""
+    lang, fmt, meta, combined, lang_suffix = job
+    builder = FORMATS[fmt][1]
+    log = LOG_DIR / f"{lang}-{fmt}.log"
+    t0 = time.monotonic()
+    try:
+        out, built = builder(meta, combined, vs, vtag, lang_suffix, cache, log)
+        status = "built" if built else "cached"
+    except BuildError as e:
+        out, status = None, "FAILED"
+        lines = str(e).rstrip().split("\n")
+        tail = "".join(f"\n    {line}" for line in lines[1:][-6:])
+        print(f"  [{lang}/{fmt}] {lines[0].rstrip(':')} "
+              f"(log: {log.relative_to(ROOT)}){tail}", file=sys.stderr)
+    return lang, fmt, out, status, time.monotonic() - t0, log
+
+
+def run_jobs(jobs, workers, vs, vtag, cache):
+    """Run build jobs on a pool of worker threads; each job's pandoc is
+    its own process. Results come back in job order."""
+    if workers <= 1:
+        return [_run_job(job, vs, vtag, cache) for job in jobs]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_run_job, job, vs, vtag, cache): i
+                   for i, job in enumerate(jobs)}
+        results = [None] * len(jobs)
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+
+def _format_size(path):
+    size = path.stat().st_size
+    if size > 1024 * 1024:
+        return f"{size / 1024 / 1024:.1f} MB"
+    return f"{size / 1024:.0f} KB"
+
+
+def print_summary(results, workers, wall):
+    """Per-artefact status and wall time, then totals."""
+    print(f"\nDone. {len(results)} artefact(s), {workers} worker(s):")
+    print(f"  {'Edition':<8}{'Format':<8}{'Status':<8}{'Wall':>9}  {'Size':>8}  File")
+    for lang, fmt, out, status, seconds, log in results:
+        name = out.name if out is not None else str(log.relative_to(ROOT))
+        size = _format_size(out) if out is not None else ""
+        print(f"  {lang.upper():<8}{fmt:<8}{status:<8}{seconds:>8.1f}s  {size:>8}  {name}")
+    serial = sum(r[4] for r in results)
+    print(f"  Wall time {wall:.1f}s (jobs total {serial:.1f}s)")
+
 
 def main():
     parser = argparse.ArgumentParser(description="Build Coding the Impossible book")
@@ -366,11 +650,15 @@ def main():
     parser.add_argument("--pdf-a5", action="store_true", help="Build A5 PDF")
     parser.add_argument("--epub", action="store_true", help="Build EPUB")
     parser.add_argument("--all", action="store_true", help="Build all formats")
-    parser.add_argument("--lang", default="en", choices=["en", "es", "ru", "uk"],
-                        help="Language edition to build (default: en)")
+    parser.add_argument("--lang", default="en", choices=LANGUAGES + ["all"],
+                        help="Language edition to build, or all (default: en)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                        help="Parallel pandoc jobs (default: 1, 0 = all CPUs)")
     parser.add_argument("--bump", action="store_true", help="Bump version (v9 → v10)")
     parser.add_argument("--no-increment", action="store_true", help="Don't update last_build timestamp")
     parser.add_argument("--no-changelog", action="store_true", help="Skip changelog appendix")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Rebuild the selected editions even if their inputs are unchanged")
     args = parser.parse_args()
 
     # Default to --all if nothing specified
@@ -393,66 +681,36 @@ def main():
         v["last_build"] = datetime.now().isoformat(timespec="seconds")
         save_version(v)
 
-    # Resolve language settings
-    if args.lang != "en":
-        tr = TRANSLATIONS[args.lang]
-        build_title = tr["title"]
-        build_subtitle = tr["subtitle"]
-        build_lang = tr["lang"]
-        build_chapter_glob = tr["chapter_glob"]
-        build_appendix_glob = tr["appendix_glob"]
-        build_extra_files = tr["extra_files"]
-        lang_suffix = f"_{args.lang.upper()}"
-    else:
-        build_title = TITLE
-        build_subtitle = SUBTITLE
-        build_lang = LANG
-        build_chapter_glob = CHAPTER_GLOB
-        build_appendix_glob = APPENDIX_GLOB
-        build_extra_files = EXTRA_FILES
-        lang_suffix = ""
-
+    langs = LANGUAGES if args.lang == "all" else [args.lang]
+    formats = [fmt for fmt, wanted in (("a4", args.pdf), ("a5", args.pdf_a5),
+                                       ("epub", args.epub)) if wanted]
     vtag = version_tag(v)
     vs = version_string(v)
-    print(f"Building: {build_title} [{vtag}] ({args.lang.upper()})")
 
-    # Prepare
+    # Prepare every edition first (cheap), then schedule the pandoc runs
     BUILD_DIR.mkdir(exist_ok=True)
-    text = combine_chapters(build_chapter_glob, build_extra_files, build_appendix_glob)
-
-    # Resolve src:-tagged code blocks with fresh source content
-    text = preprocess_listings(text)
-
-    # Strip custom fence tags (id:, src:, lines:) so pandoc sees clean fences
-    text = strip_fence_tags(text)
-
-    # Fix image paths: chapters use ../../build/ which breaks in combined.md
-    text = text.replace('../../build/', 'build/')
-
-    # Append changelog appendix (EN only, manually maintained CHANGELOG.md)
-    if args.lang == "en" and not args.no_changelog and CHANGELOG_FILE.exists():
-        print("  Including CHANGELOG.md")
-        text += "\n\\newpage\n"
-        text += "\n" + CHANGELOG_FILE.read_text(encoding="utf-8")
-
-    combined = write_combined(text, vs)
-    meta = write_metadata(vs, vtag=vtag, title=build_title, subtitle=build_subtitle, lang=build_lang)
-
-    outputs = []
-    if args.pdf:
-        outputs.append(build_pdf_a4(meta, combined, vs, vtag, lang_suffix))
-    if args.pdf_a5:
-        outputs.append(build_pdf_a5(meta, combined, vs, vtag, lang_suffix))
-    if args.epub:
-        outputs.append(build_epub(meta, combined, vs, vtag, lang_suffix))
-
-    print(f"\nDone. {len(outputs)} file(s) built:")
-    for o in outputs:
-        size = o.stat().st_size
-        if size > 1024 * 1024:
-            print(f"  {o.name}  ({size / 1024 / 1024:.1f} MB)")
-        else:
-            print(f"  {o.name}  ({size / 1024:.0f} KB)")
+    cache = load_cache()
+    jobs = []
+    for lang in langs:
+        ed = edition_settings(lang)
+        if args.no_cache:
+            cache["combined"].pop(lang, None)
+            for fmt in FORMATS:
+                cache["artefacts"].pop(f"{fmt}{ed['suffix']}", None)
+        meta, combined = prepare_edition(lang, ed, vs, vtag, cache, args.no_changelog)
+        jobs += [(lang, fmt, meta, combined, ed["suffix"]) for fmt in formats]
+    jobs.sort(key=lambda job: list(FORMATS).index(job[1]))
+
+    workers = max(1, min(len(jobs), args.jobs or os.cpu_count() or 1))
+    t0 = time.monotonic()
+    results = run_jobs(jobs, workers, vs, vtag, cache)
+    print_summary(results, workers, time.monotonic() - t0)
+
+    failed = [r for r in results if r[3] == "FAILED"]
+    if failed:
+        print(f"\n{len(failed)} artefact(s) failed; logs in {LOG_DIR.relative_to(ROOT)}/",
+              file=sys.stderr)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -14,17 +14,29 @@ Usage:
   python autodiver.py photo.png -s 64                # scan scales 0..64
   python autodiver.py photo.png -s 64 -ss 4          # scale step 4
   python autodiver.py photo.png --palette zx -n 16   # ZX quantize, top 16
+  python autodiver.py photo.png --palette zx --lut zx.lut   # reuse saved LUT
   python autodiver.py photo.png -m -p 3              # use significance mask
+  python autodiver.py photo.png -s 64 -j 0           # all CPU cores
+  python autodiver.py photo.png -s 64 --search coarse  # coarse-to-fine, pruned
+  python autodiver.py photo.png --palette zx --scr   # also write .scr screens
+  python autodiver.py anim.gif -s 16 -j 0            # one shift/scale for all frames
+  python autodiver.py frames/ -s 16                  # directory of PNG frames
+
+Install NumPy (spectools[fast]) for the vectorised penalty backend; without
+it the per-pixel reference implementation is used.
 """
 
 from __future__ import annotations
 
 import argparse
 import csv
+import heapq
+import math
 import os
 import sys
 import time
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Sequence
 
@@ -38,6 +50,16 @@ except ImportError:
     )
     sys.exit(1)
 
+try:
+    import numpy as np
+except ImportError:  # optional: falls back to the pure-Python evaluator
+    np = None
+
+try:
+    from .scrview import pixel_offset_table
+except ImportError:  # run as a script from this directory
+    from scrview import pixel_offset_table
+
 # ── Constants ─────────────────────────────────────────────────────────
 
 # Target resolution: ZX Spectrum screen
@@ -48,6 +70,16 @@ CELLS_X = ZX_WIDTH // CELL_SIZE   # 32
 CELLS_Y = ZX_HEIGHT // CELL_SIZE  # 24
 TOTAL_CELLS = CELLS_X * CELLS_Y   # 768
 
+# Cell rows evaluated between branch-and-bound checks
+PRUNE_ROWS = 4
+
+# One evaluated variant: (penalty, shift_x, shift_y, scale, pruned,
+# per-frame penalties). penalty is the sum over all frames.
+Result = tuple[int, int, int, int, bool, tuple[int, ...]]
+
+# File extensions picked up when a directory is given as input
+IMAGE_EXTENSIONS = {".png", ".gif", ".bmp", ".jpg", ".jpeg", ".tif", ".tiff", ".webp"}
+
 # ZX Spectrum palette — 15 unique colours (black shared between normal/bright)
 ZX_PALETTE: list[tuple[int, int, int]] = [
     # Normal intensity
@@ -72,10 +104,71 @@ ZX_PALETTE: list[tuple[int, int, int]] = [
 
 # ── ZX Palette Quantization ──────────────────────────────────────────
 
-def _build_palette_lut() -> dict[tuple[int, int, int], tuple[int, int, int]]:
-    """Pre-build a lookup table is not practical for 16M colours.
-    Instead we cache on the fly during quantization."""
-    return {}
+# Colours are looked up by their 15-bit (5:5:5) value: 32768 entries,
+# each the index of the nearest ZX_PALETTE colour.
+LUT_BITS = 5
+LUT_SIZE = 1 << (3 * LUT_BITS)  # 32768
+# Saved LUT files start with this tag; bump the version whenever the
+# table's contents change so older files get rebuilt rather than reused.
+# 2: buckets scored at their midpoint
+LUT_HEADER = b"ZXLUT\x02"
+
+_palette_lut: bytes | None = None
+
+
+def _lut_index(r: int, g: int, b: int) -> int:
+    """15-bit LUT index for an 8-bit RGB triple."""
+    return ((r >> 3) << 10) | ((g >> 3) << 5) | (b >> 3)
+
+
+def _build_palette_lut() -> bytes:
+    """Build the 15-bit RGB -> ZX palette index table.
+
+    Each 5-bit channel value v stands for the 8-bit bucket 8v..8v+7 and is
+    scored at its midpoint 8v + 3.5, so the table is unbiased. Pure palette
+    colours still map to themselves. A pixel is at most 3.5*sqrt(3) from
+    its bucket's centre, so the colour picked is at most 7*sqrt(3) ~ 12.1
+    further away than the true nearest one.
+    """
+    levels = [(v << 3) + 3.5 for v in range(1 << LUT_BITS)]
+    if np is not None:
+        lv = np.array(levels, dtype=np.float64)
+        r, g, b = np.meshgrid(lv, lv, lv, indexing="ij")
+        rgb = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1)
+        pal = np.array(ZX_PALETTE, dtype=np.float64)
+        dist = ((rgb[:, None, :] - pal[None, :, :]) ** 2).sum(axis=2)
+        return dist.argmin(axis=1).astype(np.uint8).tobytes()
+
+    cache: dict[tuple[int, int, int], tuple[int, int, int]] = {}
+    index = {c: i for i, c in enumerate(ZX_PALETTE)}
+    return bytes(index[_nearest_zx((r, g, b), cache)]
+                 for r in levels for g in levels for b in levels)
+
+
+def get_palette_lut(path: Path | None = None) -> bytes:
+    """Return the palette LUT, building it once per process.
+
+    If path is given, the table is loaded from that file when present and
+    valid (LUT_HEADER followed by the table), otherwise built and written
+    there for later runs.
+    """
+    global _palette_lut
+    if _palette_lut is not None:
+        return _palette_lut
+    if path is not None and path.exists():
+        data = path.read_bytes()
+        if data.startswith(LUT_HEADER) and len(data) == len(LUT_HEADER) + LUT_SIZE:
+            _palette_lut = data[len(LUT_HEADER):]
+            return _palette_lut
+        reason = "outdated" if len(data) == LUT_SIZE else "invalid"
+        print(f"Warning: rebuilding {reason} palette LUT {path}", file=sys.stderr)
+    _palette_lut = _build_palette_lut()
+    if path is not None:
+        try:
+            path.write_bytes(LUT_HEADER + _palette_lut)
+        except OSError as e:
+            print(f"Warning: could not save palette LUT {path}: {e}", file=sys.stderr)
+    return _palette_lut
 
 
 def _nearest_zx(rgb: tuple[int, int, int],
@@ -98,16 +191,27 @@ def _nearest_zx(rgb: tuple[int, int, int],
     return best_colour
 
 
+def quantize_indices(rgb: "np.ndarray") -> "np.ndarray":
+    """Map an (..., 3) uint8 RGB array to ZX palette indices via the LUT."""
+    lut = np.frombuffer(get_palette_lut(), dtype=np.uint8)
+    rgb = rgb.astype(np.uint16)
+    idx = ((rgb[..., 0] >> 3) << 10) | ((rgb[..., 1] >> 3) << 5) | (rgb[..., 2] >> 3)
+    return lut[idx]
+
+
 def quantize_image(img: Image.Image) -> Image.Image:
-    """Quantize an RGB image to the ZX Spectrum palette in-place (returns new image)."""
-    img = img.copy()
-    pixels = img.load()
-    w, h = img.size
-    cache: dict[tuple[int, int, int], tuple[int, int, int]] = {}
-    for y in range(h):
-        for x in range(w):
-            pixels[x, y] = _nearest_zx(pixels[x, y], cache)
-    return img
+    """Quantize an RGB image to the ZX Spectrum palette (returns new image)."""
+    if np is not None:
+        idx = quantize_indices(np.asarray(img.convert("RGB")))
+        return Image.fromarray(np.array(ZX_PALETTE, dtype=np.uint8)[idx], "RGB")
+
+    lut = get_palette_lut()
+    img = img.convert("RGB")
+    raw = img.tobytes()
+    colours = [bytes(c) for c in ZX_PALETTE]
+    out = b"".join(colours[lut[_lut_index(raw[i], raw[i + 1], raw[i + 2])]]
+                   for i in range(0, len(raw), 3))
+    return Image.frombytes("RGB", img.size, out)
 
 
 # ── Cell Penalty ──────────────────────────────────────────────────────
@@ -134,6 +238,166 @@ def cell_penalty(img_pixels, cx: int, cy: int) -> int:
     return CELL_SIZE * CELL_SIZE - top2_total
 
 
+def colour_keys(img: Image.Image, use_palette: bool = False) -> "np.ndarray":
+    """Convert an RGB image of any size into an (h, w) array of colour keys.
+
+    Each pixel becomes a single integer so that colours can be compared
+    and counted without tuples: its ZX palette index when use_palette is
+    set, otherwise its packed 0xRRGGBB value.
+    """
+    rgb = np.asarray(img.convert("RGB"))
+    if use_palette:
+        return quantize_indices(rgb)
+    rgb = rgb.astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def window_cells(keys: "np.ndarray", sx: int = 0, sy: int = 0) -> "np.ndarray":
+    """View the 256x192 window at (sx, sy) of a key array as cells.
+
+    Returns a (24, 32, 8, 8) view (no copy): the last two axes hold the
+    pixels of one 8x8 cell.
+    """
+    win = keys[sy:sy + ZX_HEIGHT, sx:sx + ZX_WIDTH]
+    return (win.reshape(CELLS_Y, CELL_SIZE, CELLS_X, CELL_SIZE)
+               .transpose(0, 2, 1, 3))
+
+
+def colour_key_cells(img: Image.Image) -> "np.ndarray":
+    """Convert a 256x192 RGB image into a (24, 32, 64) array of colour keys,
+    the last axis holding the 64 pixels of one cell in row-major order."""
+    return window_cells(colour_keys(img)).reshape(CELLS_Y, CELLS_X, -1)
+
+
+def cell_penalty_grid(cells: "np.ndarray") -> "np.ndarray":
+    """Vectorised cell_penalty() for every cell at once.
+
+    cells is a (24, 32, 64) or (24, 32, 8, 8) array of colour keys
+    (any integer dtype). ZX palette indices (uint8, see quantize_indices)
+    are counted directly with palette_cell_counts; any other keys are
+    sorted per cell so that equal colours form runs whose lengths are the
+    per-colour counts. The two largest counts are summed per cell.
+    Returns a (24, 32) int array of penalties.
+    """
+    pix = CELL_SIZE * CELL_SIZE
+    if cells.dtype == np.uint8:
+        counts = palette_cell_counts(cells)
+        top2 = np.partition(counts, len(ZX_PALETTE) - 2, axis=-1)[..., -2:]
+        return pix - top2.sum(axis=-1)
+
+    flat = np.sort(cells.reshape(-1, pix), axis=1)
+    n = flat.shape[0]
+
+    # Run id within each cell: increments whenever the colour changes
+    new_run = np.empty(flat.shape, dtype=bool)
+    new_run[:, 0] = True
+    new_run[:, 1:] = flat[:, 1:] != flat[:, :-1]
+    run_id = np.cumsum(new_run, axis=1) - 1
+
+    slots = run_id + (np.arange(n)[:, None] * pix)
+    counts = np.bincount(slots.ravel(), minlength=n * pix).reshape(n, pix)
+    top2 = np.partition(counts, pix - 2, axis=1)[:, -2:].sum(axis=1)
+    return (pix - top2).reshape(cells.shape[:2])
+
+
+def palette_cell_counts(cells: "np.ndarray") -> "np.ndarray":
+    """Per-cell histogram of ZX palette indices.
+
+    cells is a (rows, 32, 64) or (rows, 32, 8, 8) array of indices into
+    ZX_PALETTE; returns a (rows, 32, 15) array of pixel counts.
+    """
+    rows, cols = cells.shape[:2]
+    n_pal = len(ZX_PALETTE)
+    flat = cells.reshape(rows * cols, -1).astype(np.intp)
+    slots = flat + (np.arange(rows * cols)[:, None] * n_pal)
+    counts = np.bincount(slots.ravel(), minlength=rows * cols * n_pal)
+    return counts.reshape(rows, cols, n_pal)
+
+
+# ── .scr Export ───────────────────────────────────────────────────────
+
+def _palette_index(colour: "np.ndarray", bright: "np.ndarray") -> "np.ndarray":
+    """ZX_PALETTE index of attribute colour 0-7 at the given brightness."""
+    return np.where(colour == 0, 0, colour + 7 * bright)
+
+
+def solve_attributes(cells: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+    """Pick ink/paper/bright per cell and the resulting pixel bits.
+
+    cells is a (24, 32, 8, 8) array of ZX palette indices. Ink and paper
+    must share one BRIGHT bit, so the top-2 colours are taken separately
+    from the normal and the bright half of the per-cell counts (black
+    belongs to both) and the half covering more pixels wins. Paper is the
+    most frequent colour. Pixels in neither colour become whichever of
+    the two is nearer in RGB.
+
+    Returns (attrs, bits): a (24, 32) uint8 attribute array and a
+    (24, 32, 8, 8) bool array, True for ink.
+    """
+    counts = palette_cell_counts(cells)
+    halves = []
+    for bright in (0, 1):
+        idx = _palette_index(np.arange(8), np.full(8, bright))
+        group = counts[..., idx]
+        order = np.argsort(-group, axis=-1, kind="stable")[..., :2]
+        score = np.take_along_axis(group, order, axis=-1).sum(axis=-1)
+        halves.append((order, score))
+    use_bright = halves[1][1] > halves[0][1]
+    order = np.where(use_bright[..., None], halves[1][0], halves[0][0])
+    paper, ink = order[..., 0], order[..., 1]
+    bright = use_bright.astype(np.intp)
+
+    pal = np.array(ZX_PALETTE, dtype=np.int32)
+    dist = ((pal[:, None, :] - pal[None, :, :]) ** 2).sum(axis=2)
+    ink_idx = _palette_index(ink, bright)[..., None, None]
+    paper_idx = _palette_index(paper, bright)[..., None, None]
+    pix = cells.astype(np.intp)
+    bits = dist[pix, ink_idx] < dist[pix, paper_idx]
+
+    attrs = (bright << 6) | (paper << 3) | ink
+    return attrs.astype(np.uint8), bits
+
+
+def encode_scr(indices: "np.ndarray") -> bytes:
+    """Convert a (192, 256) array of ZX palette indices to a 6912-byte
+    .scr image with solved attributes."""
+    attrs, bits = solve_attributes(window_cells(indices))
+    bitmap = bits.transpose(0, 2, 1, 3).reshape(ZX_HEIGHT, ZX_WIDTH)
+    scr = np.zeros(ZX_HEIGHT * ZX_WIDTH // 8 + TOTAL_CELLS, dtype=np.uint8)
+    scr[pixel_offset_table()] = np.packbits(bitmap, axis=1)
+    scr[ZX_HEIGHT * ZX_WIDTH // 8:] = attrs.ravel()
+    return scr.tobytes()
+
+
+# ── Frame Loading ─────────────────────────────────────────────────────
+
+def load_frames(paths: Sequence[Path]) -> list[tuple[str, Image.Image]]:
+    """Load every input frame as (name, RGB image).
+
+    Each path may be a still image, a multi-frame GIF/PNG (every frame is
+    used), or a directory whose image files are taken in name order.
+    """
+    frames: list[tuple[str, Image.Image]] = []
+    for path in paths:
+        if path.is_dir():
+            files = sorted(f for f in path.iterdir()
+                           if f.suffix.lower() in IMAGE_EXTENSIONS
+                           and not f.name.startswith("mask_"))
+            frames.extend(load_frames(files))
+            continue
+        try:
+            img = Image.open(path)
+            n_frames = getattr(img, "n_frames", 1)
+            for i in range(n_frames):
+                img.seek(i)
+                name = path.stem if n_frames == 1 else f"{path.stem}_{i:04d}"
+                frames.append((name, img.convert("RGB")))
+        except Exception as e:
+            print(f"Error: cannot open image '{path}': {e}", file=sys.stderr)
+            sys.exit(1)
+    return frames
+
+
 # ── Significance Mask ─────────────────────────────────────────────────
 
 def load_mask(input_path: Path) -> Image.Image | None:
@@ -180,6 +444,35 @@ def build_cell_mask(mask_img: Image.Image, shift_x: int, shift_y: int,
     return significant
 
 
+def mask_summed_area(mask_img: Image.Image, scaled_w: int,
+                     scaled_h: int) -> "np.ndarray":
+    """Summed-area table of the resized, thresholded mask.
+
+    Entry [y, x] counts the significant pixels above and left of (x, y);
+    the table is (h + 1, w + 1) so that any rectangle sum needs four
+    lookups and no edge cases.
+    """
+    resized = mask_img.resize((scaled_w, scaled_h), Image.NEAREST)
+    significant = np.asarray(resized) > 127
+    sat = np.zeros((scaled_h + 1, scaled_w + 1), dtype=np.int32)
+    sat[1:, 1:] = significant.cumsum(axis=0).cumsum(axis=1)
+    return sat
+
+
+def cell_mask_grid(sat: "np.ndarray", shift_x: int,
+                   shift_y: int) -> "np.ndarray":
+    """Vectorised build_cell_mask() from a summed-area table.
+
+    Returns a (24, 32) bool array: True where the cell at the given shift
+    contains any significant mask pixel.
+    """
+    ys = shift_y + CELL_SIZE * np.arange(CELLS_Y + 1)
+    xs = shift_x + CELL_SIZE * np.arange(CELLS_X + 1)
+    corners = sat[np.ix_(ys, xs)]
+    counts = corners[1:, 1:] - corners[:-1, 1:] - corners[1:, :-1] + corners[:-1, :-1]
+    return counts > 0
+
+
 # ── Progress Bar ──────────────────────────────────────────────────────
 
 def progress_bar(current: int, total: int, bar_width: int = 40,
@@ -208,15 +501,23 @@ def progress_bar(current: int, total: int, bar_width: int = 40,
           end="", file=sys.stderr)
 
 
-# ── Main Algorithm ────────────────────────────────────────────────────
+# ── Variant Evaluation ────────────────────────────────────────────────
 
 def evaluate_variant(img: Image.Image, use_palette: bool,
                      cell_mask: list[list[bool]] | None,
                      extra_penalty: int) -> int:
-    """Evaluate total penalty for a 256x192 image variant."""
+    """Evaluate total penalty for a 256x192 image variant.
+
+    Uses the NumPy backend when available, otherwise the per-pixel
+    reference implementation below.
+    """
     if use_palette:
         img = quantize_image(img)
 
+    if np is not None:
+        return evaluate_window(colour_keys(img), 0, 0, cell_mask,
+                               extra_penalty)[0]
+
     pixels = img.load()
     total = 0
     for cy in range(CELLS_Y):
@@ -228,8 +529,205 @@ def evaluate_variant(img: Image.Image, use_palette: bool,
     return total
 
 
+def evaluate_window(keys: "np.ndarray", sx: int, sy: int,
+                    cell_mask: "list[list[bool]] | np.ndarray | None",
+                    extra_penalty: int,
+                    bound: float | None = None) -> tuple[int, bool]:
+    """Evaluate the 256x192 window at (sx, sy) of a colour key array
+    (see colour_keys) without cropping or copying the source.
+
+    Returns (penalty, complete). With a bound the screen is evaluated in
+    bands of PRUNE_ROWS cell rows and abandoned as soon as the running
+    total exceeds it; penalty is then only a lower bound and complete is
+    False.
+    """
+    cells = window_cells(keys, sx, sy)
+    mask = np.asarray(cell_mask, dtype=bool) if cell_mask is not None else None
+    step = CELLS_Y if bound is None else PRUNE_ROWS
+    total = 0
+    for row in range(0, CELLS_Y, step):
+        grid = cell_penalty_grid(cells[row:row + step])
+        if mask is not None:
+            grid = np.where(mask[row:row + step], grid * extra_penalty, grid)
+        total += int(grid.sum())
+        if bound is not None and total > bound and row + step < CELLS_Y:
+            return total, False
+    return total, True
+
+
+def scaled_size(scale: int, src_w: int, src_h: int) -> tuple[int, int] | None:
+    """Return the (width, height) the source is resized to for a scale
+    value, or None if the image is too small to cover 256x192."""
+    target_w = ZX_WIDTH + scale
+    # Compute corresponding height maintaining aspect ratio
+    target_h = int(target_w * src_h / src_w)
+    # Need at least 192 pixels of height to crop
+    if target_h < ZX_HEIGHT:
+        # Scale height to minimum 192, recompute width
+        target_h = ZX_HEIGHT
+        target_w = int(target_h * src_w / src_h)
+        if target_w < ZX_WIDTH:
+            return None  # image too small even after scaling
+    return target_w, target_h
+
+
+def scale_shifts(target_w: int, target_h: int) -> list[tuple[int, int]]:
+    """All (shift_x, shift_y) offsets tested for one resized image."""
+    max_sx = min(7, target_w - ZX_WIDTH)
+    max_sy = min(7, target_h - ZX_HEIGHT)
+    return [(sx, sy) for sy in range(max_sy + 1) for sx in range(max_sx + 1)]
+
+
+def scan_scale(resized: Image.Image | Sequence[Image.Image], scale: int,
+               use_palette: bool, mask_img: Image.Image | None,
+               extra_penalty: int, on_variant=None, top_n: int = 0,
+               bound: float = math.inf,
+               mask_cache: dict | None = None) -> list[Result]:
+    """Evaluate every shift of one resized image, or of a sequence of
+    equally sized frames scored together.
+
+    Returns (penalty, sx, sy, scale, pruned, frame_penalties) tuples in
+    shift order; penalty is the sum over frames. on_variant, if given, is
+    called once per evaluated variant (for progress).
+
+    With top_n > 0 variants are pruned (branch-and-bound) once their
+    partial penalty exceeds the N-th best seen so far, starting from the
+    given global bound and tightened by this scale's own results.
+
+    With NumPy each resized frame is converted to colour keys (quantized
+    to the ZX palette if requested) once, and every shift is evaluated as
+    a window into that buffer. Likewise the mask becomes one summed-area
+    table per scale; the per-shift cell grids are stored in mask_cache,
+    keyed by (scale, sx, sy), when one is given.
+    """
+    frames = [resized] if isinstance(resized, Image.Image) else list(resized)
+    rw, rh = frames[0].size
+    keys = ([colour_keys(f, use_palette) for f in frames]
+            if np is not None else None)
+    sat = None
+    if mask_img is not None and np is not None:
+        sat = mask_summed_area(mask_img, rw, rh)
+    if mask_cache is None:
+        mask_cache = {}
+    results: list[Result] = []
+    best: list[int] = []  # max-heap (negated) of the top_n complete penalties
+    for sx, sy in scale_shifts(rw, rh):
+        # Build cell mask for this variant if using significance mask
+        cell_mask = None
+        if sat is not None:
+            cell_mask = mask_cache.get((scale, sx, sy))
+            if cell_mask is None:
+                cell_mask = mask_cache[scale, sx, sy] = cell_mask_grid(sat, sx, sy)
+        elif mask_img is not None:
+            cell_mask = build_cell_mask(mask_img, sx, sy, rw, rh)
+
+        limit = bound
+        if top_n > 0 and len(best) == top_n:
+            limit = min(limit, -best[0])
+
+        penalty = 0
+        per_frame: list[int] = []
+        complete = True
+        for i, frame in enumerate(frames):
+            if keys is not None:
+                remaining = None if math.isinf(limit) else limit - penalty
+                p, complete = evaluate_window(keys[i], sx, sy, cell_mask,
+                                              extra_penalty, remaining)
+            else:
+                # Crop 256x192 region
+                cropped = frame.crop((sx, sy, sx + ZX_WIDTH, sy + ZX_HEIGHT))
+                p = evaluate_variant(cropped, use_palette, cell_mask,
+                                     extra_penalty)
+            penalty += p
+            per_frame.append(p)
+            if penalty > limit and i + 1 < len(frames):
+                complete = False
+            if not complete:
+                break
+        results.append((penalty, sx, sy, scale, not complete, tuple(per_frame)))
+
+        if top_n > 0 and complete:
+            if len(best) < top_n:
+                heapq.heappush(best, -penalty)
+            elif penalty < -best[0]:
+                heapq.heapreplace(best, -penalty)
+        if on_variant is not None:
+            on_variant()
+    return results
+
+
+# ── Parallel Workers ──────────────────────────────────────────────────
+
+# Per-process state installed once by _init_worker, so that each task
+# only carries a scale value instead of pickled frames.
+_worker_state: dict = {}
+
+
+def _init_worker(src_frames: list[Image.Image], mask_img: Image.Image | None,
+                 use_palette: bool, extra_penalty: int,
+                 palette_lut: bytes | None) -> None:
+    global _palette_lut
+    if palette_lut is not None:
+        _palette_lut = palette_lut
+    _worker_state.update(
+        mask_cache={},
+        src_frames=src_frames,
+        mask_img=mask_img,
+        use_palette=use_palette,
+        extra_penalty=extra_penalty,
+    )
+
+
+def _scan_scale_worker(scale: int, top_n: int,
+                       bound: float) -> list[Result]:
+    src_frames = _worker_state["src_frames"]
+    size = scaled_size(scale, *src_frames[0].size)
+    resized = [f.resize(size, Image.LANCZOS) for f in src_frames]
+    return scan_scale(resized, scale, _worker_state["use_palette"],
+                      _worker_state["mask_img"], _worker_state["extra_penalty"],
+                      top_n=top_n, bound=bound,
+                      mask_cache=_worker_state["mask_cache"])
+
+
+# ── Search Strategy ───────────────────────────────────────────────────
+
+def nth_best(results: list[Result], n: int) -> float:
+    """Penalty of the N-th best complete (unpruned) result, or inf."""
+    complete = heapq.nsmallest(n, (r[0] for r in results if not r[4]))
+    return complete[-1] if n > 0 and len(complete) == n else math.inf
+
+
+def coarse_scales(scales: list[int], coarse_step: int) -> list[int]:
+    """Every coarse_step-th scale, always including the last one."""
+    grid = scales[::coarse_step]
+    if scales and grid[-1] != scales[-1]:
+        grid.append(scales[-1])
+    return grid
+
+
+def refine_scales(scales: list[int], evaluated: dict[int, list[Result]],
+                  coarse_step: int, refine: int) -> list[int]:
+    """Scales to evaluate around the `refine` best coarse scales.
+
+    Each chosen coarse scale is widened to its neighbours in `scales` up
+    to (but excluding) the adjacent coarse grid points.
+    """
+    def scale_best(scale: int) -> float:
+        return min((r[0] for r in evaluated[scale] if not r[4]), default=math.inf)
+
+    ranked = sorted(evaluated, key=lambda s: (scale_best(s), s))[:refine]
+    wanted: set[int] = set()
+    for scale in ranked:
+        i = scales.index(scale)
+        lo = max(0, i - coarse_step + 1)
+        wanted.update(scales[lo:i + coarse_step])
+    return [s for s in scales if s in wanted and s not in evaluated]
+
+
+# ── Main Algorithm ────────────────────────────────────────────────────
+
 def run_scan(
-    input_path: Path,
+    input_path: Path | Sequence[Path],
     max_scale: int,
     scale_step: int,
     use_mask: bool,
@@ -238,137 +736,232 @@ def run_scan(
     top_n: int,
     palette: str | None,
     show_progress: bool,
+    jobs: int = 1,
+    lut_path: Path | None = None,
+    search: str = "exhaustive",
+    coarse_step: int = 4,
+    refine: int = 3,
+    write_scr: bool = False,
 ) -> None:
-    """Run the full attribute grid scan."""
-    # Load input image
-    try:
-        src_img = Image.open(input_path).convert("RGB")
-    except Exception as e:
-        print(f"Error: cannot open image '{input_path}': {e}", file=sys.stderr)
+    """Run the attribute grid scan.
+
+    search="exhaustive" (the default) evaluates every shift of every
+    scale. "coarse" evaluates every coarse_step-th scale first, then the
+    scales around the `refine` best of those, and prunes variants whose
+    partial penalty already exceeds the current N-th best. Pruned variants
+    keep the partial penalty they were cut at, a lower bound: the ratings
+    then gain a `pruned` column and list them after the complete ones.
+
+    With jobs > 1 the scales are distributed over a process pool; each
+    worker receives the source frames once and resizes per scale itself.
+    Results are reassembled in scale order, so the rating is identical
+    to a sequential run.
+
+    input_path may name several images, a directory or an animated GIF:
+    all frames are then scored together (aggregate penalty per variant),
+    rating.csv holds the aggregate and rating_<frame>.csv each frame's
+    share, and each saved variant becomes a directory of frames.
+
+    With write_scr every saved PNG is accompanied by a .scr screen with
+    ink/paper/bright solved per cell (requires NumPy).
+    """
+    input_paths = [input_path] if isinstance(input_path, Path) else list(input_path)
+    frames = load_frames(input_paths)
+    if not frames:
+        print("Error: no input images found.", file=sys.stderr)
         sys.exit(1)
-
-    src_w, src_h = src_img.size
+    frame_names = [name for name, _ in frames]
+    src_frames = [img for _, img in frames]
+    src_w, src_h = src_frames[0].size
+    for name, img in frames:
+        if img.size != (src_w, src_h):
+            print(f"Error: frame '{name}' is {img.size[0]}x{img.size[1]}, "
+                  f"expected {src_w}x{src_h} like the first frame.",
+                  file=sys.stderr)
+            sys.exit(1)
+    batch = len(src_frames) > 1
     use_palette = palette in ("zx", "zx15")
+    # Build (or load) the palette LUT once; workers inherit it
+    palette_lut = get_palette_lut(lut_path) if use_palette else None
 
     # Load significance mask if requested
     mask_img: Image.Image | None = None
     if use_mask:
-        mask_img = load_mask(input_path)
+        # One mask applies to every frame; looked up next to the first input
+        mask_ref = input_paths[0]
+        if mask_ref.is_dir():
+            mask_ref = min((f for f in mask_ref.iterdir()
+                            if f.suffix.lower() in IMAGE_EXTENSIONS
+                            and not f.name.startswith("mask_")), default=mask_ref)
+        mask_img = load_mask(mask_ref)
         if mask_img is None:
-            print(f"Warning: -m specified but mask file 'mask_{input_path.name}' "
-                  f"not found in {input_path.parent}. Proceeding without mask.",
+            print(f"Warning: -m specified but mask file 'mask_{mask_ref.name}' "
+                  f"not found in {mask_ref.parent}. Proceeding without mask.",
                   file=sys.stderr)
             use_mask = False
 
-    # Build list of scale values to test
-    scales = list(range(0, max_scale + 1, max(1, scale_step)))
-
-    # Build list of all variants
-    variants: list[tuple[int, int, int]] = []  # (shift_x, shift_y, scale)
-    for scale in scales:
-        target_w = ZX_WIDTH + scale
-        # Compute corresponding height maintaining aspect ratio
-        target_h = int(target_w * src_h / src_w)
-        # Need at least 192 pixels of height to crop
-        if target_h < ZX_HEIGHT:
-            # Scale height to minimum 192, recompute width
-            target_h = ZX_HEIGHT
-            target_w = int(target_h * src_w / src_h)
-            if target_w < ZX_WIDTH:
-                continue  # image too small even after scaling
-
-        max_sx = min(7, target_w - ZX_WIDTH)
-        max_sy = min(7, target_h - ZX_HEIGHT)
-
-        for sy in range(max_sy + 1):
-            for sx in range(max_sx + 1):
-                variants.append((sx, sy, scale))
-
-    total_variants = len(variants)
-    if total_variants == 0:
+    # Build list of scale values to test, with the variant count of each
+    scale_sizes: dict[int, tuple[int, int]] = {}
+    for scale in range(0, max_scale + 1, max(1, scale_step)):
+        size = scaled_size(scale, src_w, src_h)
+        if size is not None:
+            scale_sizes[scale] = size
+    scales = list(scale_sizes)
+
+    def variant_count(batch: list[int]) -> int:
+        return sum(len(scale_shifts(*scale_sizes[s])) for s in batch)
+
+    if variant_count(scales) == 0:
         print("Error: no valid variants to test. Image may be too small.", file=sys.stderr)
         sys.exit(1)
 
-    if show_progress:
-        print(f"Testing {total_variants} variants...", file=sys.stderr)
-
-    # Evaluate all variants
-    results: list[tuple[int, int, int, int]] = []  # (penalty, sx, sy, scale)
+    exhaustive = search == "exhaustive"
+    prune_n = 0 if exhaustive else top_n
+    jobs = max(1, min(jobs, len(scales)))
+    pool: ProcessPoolExecutor | None = None
+    if jobs > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(src_frames, mask_img, use_palette, extra_penalty,
+                      palette_lut),
+        )
+
+    # Evaluated results per scale
+    per_scale: dict[int, list[Result]] = {}
     start_time = time.monotonic()
 
-    # Cache resized images per scale to avoid redundant resizing
-    resized_cache: dict[int, Image.Image] = {}
+    # Cache resized frames per scale to avoid redundant resizing
+    resized_cache: dict[int, list[Image.Image]] = {}
+    # Significance grids per (scale, sx, sy)
+    mask_cache: dict[tuple[int, int, int], "np.ndarray"] = {}
 
-    for idx, (sx, sy, scale) in enumerate(variants):
-        if show_progress and (idx % 10 == 0 or idx == total_variants - 1):
-            progress_bar(idx + 1, total_variants, start_time=start_time)
-
-        # Get or create resized image for this scale
+    def resized_frames(scale: int) -> list[Image.Image]:
         if scale not in resized_cache:
-            target_w = ZX_WIDTH + scale
-            target_h = int(target_w * src_h / src_w)
-            if target_h < ZX_HEIGHT:
-                target_h = ZX_HEIGHT
-                target_w = int(target_h * src_w / src_h)
-            resized = src_img.resize((target_w, target_h), Image.LANCZOS)
-            resized_cache[scale] = resized
-
-        resized = resized_cache[scale]
-
-        # Crop 256x192 region
-        cropped = resized.crop((sx, sy, sx + ZX_WIDTH, sy + ZX_HEIGHT))
-
-        # Build cell mask for this variant if using significance mask
-        cell_mask: list[list[bool]] | None = None
-        if use_mask and mask_img is not None:
-            rw, rh = resized.size
-            cell_mask = build_cell_mask(mask_img, sx, sy, rw, rh)
+            resized_cache[scale] = [f.resize(scale_sizes[scale], Image.LANCZOS)
+                                    for f in src_frames]
+        return resized_cache[scale]
+
+    def evaluate_scales(scales_batch: list[int], label: str) -> None:
+        total = variant_count(scales_batch)
+        if show_progress:
+            workers = f" on {jobs} workers" if jobs > 1 else ""
+            over = f" x {len(src_frames)} frames" if batch else ""
+            print(f"{label} {total} variants{over}{workers}...", file=sys.stderr)
+        phase_start = time.monotonic()
+        done = 0
+        bound = nth_best([r for rs in per_scale.values() for r in rs], prune_n)
+
+        if pool is None:
+            def tick() -> None:
+                nonlocal done
+                done += 1
+                if show_progress and (done % 10 == 0 or done == total):
+                    progress_bar(done, total, start_time=phase_start)
+
+            for scale in scales_batch:
+                per_scale[scale] = scan_scale(resized_frames(scale), scale,
+                                              use_palette,
+                                              mask_img, extra_penalty,
+                                              on_variant=tick, top_n=prune_n,
+                                              bound=bound, mask_cache=mask_cache)
+                bound = min(bound, nth_best(per_scale[scale], prune_n))
+        else:
+            futures = {pool.submit(_scan_scale_worker, s, prune_n, bound): s
+                       for s in scales_batch}
+            for fut in as_completed(futures):
+                per_scale[futures[fut]] = fut.result()
+                done += len(per_scale[futures[fut]])
+                if show_progress:
+                    progress_bar(done, total, start_time=phase_start)
+
+        if show_progress:
+            progress_bar(total, total, start_time=phase_start)
+            print(file=sys.stderr)
 
-        penalty = evaluate_variant(cropped, use_palette, cell_mask, extra_penalty)
-        results.append((penalty, sx, sy, scale))
+    try:
+        if exhaustive or len(scales) <= coarse_step:
+            evaluate_scales(scales, "Testing")
+        else:
+            evaluate_scales(coarse_scales(scales, coarse_step),
+                            "Coarse pass: testing")
+            fine = refine_scales(scales, per_scale, coarse_step, refine)
+            if fine:
+                evaluate_scales(fine, "Refining: testing")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # Deterministic order: scales ascending, shifts in scan order
+    results: list[Result] = []
+    for scale in sorted(per_scale):
+        results.extend(per_scale[scale])
 
     if show_progress:
-        progress_bar(total_variants, total_variants, start_time=start_time)
         elapsed = time.monotonic() - start_time
-        print(f"\nDone in {elapsed:.1f}s.", file=sys.stderr)
+        pruned = sum(1 for r in results if r[4])
+        skipped = len(scales) - len(per_scale)
+        print(f"Done in {elapsed:.1f}s.", file=sys.stderr)
+        if not exhaustive:
+            print(f"Pruned {pruned} of {len(results)} variants; "
+                  f"skipped {skipped} of {len(scales)} scales.", file=sys.stderr)
 
-    # Sort by penalty ascending
-    results.sort(key=lambda r: r[0])
+    # Sort by penalty ascending; pruned variants (lower bounds) go last
+    results.sort(key=lambda r: (r[4], r[0]))
 
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Save top N variant images
-    saved = min(top_n, len(results))
+    # Only complete variants have a score to rank by
+    saved = min(top_n, sum(1 for r in results if not r[4]))
     if show_progress:
         print(f"Saving top {saved} variants to {output_dir}/", file=sys.stderr)
 
-    for rank, (penalty, sx, sy, scale) in enumerate(results[:saved], start=1):
-        # Reconstruct the cropped image
-        if scale not in resized_cache:
-            target_w = ZX_WIDTH + scale
-            target_h = int(target_w * src_h / src_w)
-            if target_h < ZX_HEIGHT:
-                target_h = ZX_HEIGHT
-                target_w = int(target_h * src_w / src_h)
-            resized_cache[scale] = src_img.resize((target_w, target_h), Image.LANCZOS)
-
-        resized = resized_cache[scale]
-        cropped = resized.crop((sx, sy, sx + ZX_WIDTH, sy + ZX_HEIGHT))
-
-        if use_palette:
-            cropped = quantize_image(cropped)
-
-        filename = f"{rank:03d}_penalty_{penalty:04d}_sx_{sx}_sy_{sy}_sc_{scale}.png"
-        cropped.save(output_dir / filename)
-
-    # Write rating CSV
+    for rank, (penalty, sx, sy, scale, _, _) in enumerate(results[:saved], start=1):
+        name = f"{rank:03d}_penalty_{penalty:04d}_sx_{sx}_sy_{sy}_sc_{scale}"
+        if batch:
+            (output_dir / name).mkdir(exist_ok=True)
+
+        # Reconstruct the cropped frames
+        for frame_name, resized in zip(frame_names, resized_frames(scale)):
+            cropped = resized.crop((sx, sy, sx + ZX_WIDTH, sy + ZX_HEIGHT))
+            if use_palette:
+                cropped = quantize_image(cropped)
+            base = f"{name}/{frame_name}" if batch else name
+            cropped.save(output_dir / f"{base}.png")
+            if write_scr:
+                indices = quantize_indices(np.asarray(cropped))
+                (output_dir / f"{base}.scr").write_bytes(encode_scr(indices))
+
+    def write_rating(path: Path, frame: int | None) -> None:
+        """Write the rating table; frame selects one frame's penalties."""
+        rows = results
+        if frame is not None:
+            rows = [r for r in results if len(r[5]) > frame]
+            rows = sorted(rows, key=lambda r: (r[4], r[5][frame]))
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            header = ["penalty", "shift_x", "shift_y", "scale"]
+            if not exhaustive:
+                # Pruned rows hold the partial penalty at which they were
+                # cut: a lower bound, not a score
+                header.append("pruned")
+            writer.writerow(header)
+            for penalty, sx, sy, scale, pruned, per_frame in rows:
+                if frame is not None:
+                    penalty = per_frame[frame]
+                row = [penalty, sx, sy, scale]
+                if not exhaustive:
+                    row.append(int(pruned))
+                writer.writerow(row)
+
+    # Write rating CSVs: aggregate, then one per frame in batch mode
     csv_path = output_dir / "rating.csv"
-    with open(csv_path, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["penalty", "shift_x", "shift_y", "scale"])
-        for penalty, sx, sy, scale in results:
-            writer.writerow([penalty, sx, sy, scale])
+    write_rating(csv_path, None)
+    if batch:
+        for i, frame_name in enumerate(frame_names):
+            write_rating(output_dir / f"rating_{frame_name}.csv", i)
 
     if show_progress:
         best = results[0]
@@ -394,13 +987,17 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
             "  %(prog)s photo.png -s 64 -ss 4           # scale up to +64px, step 4\n"
             "  %(prog)s photo.png --palette zx -n 16    # quantize to ZX, save top 16\n"
             "  %(prog)s photo.png -m -p 3               # significance mask, 3x penalty\n"
+            "  %(prog)s photo.png -s 64 -j 0            # use all CPU cores\n"
+            "  %(prog)s anim.gif -s 16                  # score all GIF frames together\n"
         ),
     )
 
     parser.add_argument(
         "input",
         type=Path,
-        help="Input image file (PNG, BMP, JPG)",
+        nargs="+",
+        help="Input image file (PNG, BMP, JPG). Several files, a directory "
+             "or an animated GIF are scored together as frames",
     )
     parser.add_argument(
         "-s",
@@ -448,11 +1045,60 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         default=None,
         help="Quantize to ZX palette before evaluation",
     )
+    parser.add_argument(
+        "--lut",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="Cache the 32K-entry palette LUT in FILE (built on first use)",
+    )
+    parser.add_argument(
+        "--search",
+        choices=["coarse", "exhaustive"],
+        default="exhaustive",
+        help="Search strategy: every variant, or coarse-to-fine scales with "
+             "branch-and-bound pruning (default: exhaustive)",
+    )
+    parser.add_argument(
+        "--exhaustive",
+        dest="search",
+        action="store_const",
+        const="exhaustive",
+        help="Shorthand for --search exhaustive (reference results)",
+    )
+    parser.add_argument(
+        "--coarse-step",
+        type=int,
+        default=4,
+        metavar="N",
+        help="Coarse pass tests every Nth scale (default: 4)",
+    )
+    parser.add_argument(
+        "--refine",
+        type=int,
+        default=3,
+        metavar="N",
+        help="Refine around the N best coarse scales (default: 3)",
+    )
+    parser.add_argument(
+        "--scr",
+        action="store_true",
+        help="Also write a 6912-byte .scr with solved attributes for each "
+             "saved variant (requires NumPy)",
+    )
     parser.add_argument(
         "--no-progress",
         action="store_true",
         help="Suppress progress bar output",
     )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Worker processes; scales are split between them "
+             "(default: 1, 0 = all CPUs)",
+    )
 
     return parser.parse_args(argv)
 
@@ -460,10 +1106,15 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
 def main(argv: Sequence[str] | None = None) -> None:
     args = parse_args(argv)
 
-    if not args.input.exists():
-        print(f"Error: input file '{args.input}' not found.", file=sys.stderr)
+    if args.scr and np is None:
+        print("Error: --scr requires NumPy (pip install numpy).", file=sys.stderr)
         sys.exit(1)
 
+    for path in args.input:
+        if not path.exists():
+            print(f"Error: input file '{path}' not found.", file=sys.stderr)
+            sys.exit(1)
+
     run_scan(
         input_path=args.input,
         max_scale=args.s,
@@ -474,6 +1125,12 @@ def main(argv: Sequence[str] | None = None) -> None:
         top_n=args.n,
         palette=args.palette,
         show_progress=not args.no_progress,
+        jobs=args.jobs or os.cpu_count() or 1,
+        lut_path=args.lut,
+        search=args.search,
+        coarse_step=max(1, args.coarse_step),
+        refine=max(1, args.refine),
+        write_scr=args.scr,
     )
 
 
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""AY Music Cycle-Budget Profiler for ZX Spectrum.
+
+Estimates, frame by frame, what the music player costs in T-states and
+writes the curve as CSV (frame,music_tstates,...) for packbench's
+[music] profile and the frame budgets in tstate. A flat 5000 T per
+frame hides the spikes that drop frames: row ticks, note-ons, special
+commands and pattern changes all land on the same interrupt.
+
+Inputs:
+  PT3 module   The pattern stream is walked the way the Vortex Tracker II
+               player walks it (tempo, per-channel row skips, position
+               list) and each frame is priced with a cost model of the
+               PT3 player routine.
+  PSG dump     Priced as a register-stream player: a fixed cost per frame
+               plus a cost per register written.
+
+The default model constants are estimates for the stock PT3 player;
+calibrate them for your player build with --model (a TOML [cost] table).
+
+Usage:
+  python musicprof.py song.pt3 -o build/music.csv
+  python musicprof.py song.pt3 --summary --render 55000 --machine 128k
+  python musicprof.py intro.psg --summary
+  python musicprof.py song.pt3 --frames 3000 --model player_costs.toml
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import NamedTuple, TextIO
+
+try:
+    import tomllib
+except ModuleNotFoundError:
+    # Python < 3.11
+    try:
+        import tomli as tomllib  # type: ignore[no-redef]
+    except ModuleNotFoundError:
+        tomllib = None  # type: ignore[assignment]
+
+try:
+    from .pt3tune import PT3_MAGIC, Pt3Module, parse_pt3
+    from .tstate import FRAME_BUDGETS
+except ImportError:  # run as a script from this directory
+    from pt3tune import PT3_MAGIC, Pt3Module, parse_pt3
+    from tstate import FRAME_BUDGETS
+
+# ── Cost model ────────────────────────────────────────────────────────
+
+# T-states per event. PT3 entries model the stock Vortex Tracker II player
+# (PLAY + CHREGS + PTDECOD + register write-out); psg_* model a plain
+# register-stream player. Override any key with --model.
+DEFAULT_COSTS: dict[str, int] = {
+    "frame": 1250,         # PLAY entry, noise/envelope mix, AY write-out
+    "channel": 780,        # sample + ornament step, tone and volume lookup
+    "channel_off": 110,    # disabled channel
+    "envelope": 90,        # channel mixing in the envelope
+    "slide": 160,          # glissando / portamento / vibrato in progress
+    "row": 230,            # per channel decoded on a row tick
+    "byte": 45,            # per pattern byte read
+    "note": 260,           # note-on: reset sample, ornament, slide state
+    "special": 110,        # per special command parameter block
+    "position": 420,       # pattern end: next position, channel pointers
+    "psg_frame": 300,      # register-stream player, per frame
+    "psg_register": 38,    # register-stream player, per register written
+}
+
+SLIDE_COMMANDS = frozenset({1, 2, 5, 8})  # gliss, portamento, vibrato, env slide
+
+PSG_MAGIC = b"PSG\x1a"
+PSG_HEADER_SIZE = 16
+
+
+class Frame(NamedTuple):
+    """Player cost for one interrupt."""
+    frame: int
+    tstates: int
+    position: int    # -1 for register dumps
+    row: int         # -1 when no row was decoded this frame
+
+
+# ── PT3 profile ───────────────────────────────────────────────────────
+
+def profile_pt3(module: Pt3Module, costs: dict[str, int],
+                frames: int | None = None) -> list[Frame]:
+    """Walk the song one interrupt at a time and price each frame.
+
+    Without a frame count the song is played once through its position
+    list; with one, playback wraps to the loop position as the player does."""
+    out: list[Frame] = []
+    if not module.positions:  # nothing to play, nor to loop back to
+        return out
+    tempo = module.tempo or 1
+    active = [False, False, False]
+    envelope = [False, False, False]
+    sliding = [False, False, False]
+    order = list(range(len(module.positions)))
+    if frames is not None:
+        loop = min(module.loop, len(order) - 1)
+        while len(order) < frames:  # every row lasts at least one frame
+            order.extend(range(loop, len(module.positions)))
+
+    for position in order:
+        pattern = module.positions[position]
+        channels = module.patterns[pattern]
+        cursor = [0, 0, 0]
+        for row in range(module.pattern_rows[pattern]):
+            tick = costs["position"] if row == 0 else 0
+            for ch, rows in enumerate(channels):
+                if cursor[ch] >= len(rows) or rows[cursor[ch]].row != row:
+                    continue
+                r = rows[cursor[ch]]
+                cursor[ch] += 1
+                tick += (costs["row"] + costs["byte"] * r.size
+                         + costs["special"] * len(r.commands))
+                if r.tempo:
+                    tempo = r.tempo
+                if r.envelope is not None:
+                    envelope[ch] = r.envelope
+                if r.note is not None:
+                    active[ch] = r.note >= 0
+                    sliding[ch] = False
+                    if r.note >= 0:
+                        tick += costs["note"]
+                if SLIDE_COMMANDS.intersection(r.commands):
+                    sliding[ch] = True
+            steady = costs["frame"]
+            for ch in range(3):
+                if not active[ch]:
+                    steady += costs["channel_off"]
+                    continue
+                steady += costs["channel"]
+                if envelope[ch]:
+                    steady += costs["envelope"]
+                if sliding[ch]:
+                    steady += costs["slide"]
+            # The row is decoded on the first interrupt of its tempo span
+            for t in range(tempo):
+                out.append(Frame(len(out), steady + (tick if t == 0 else 0),
+                                 position, row if t == 0 else -1))
+                if frames is not None and len(out) >= frames:
+                    return out
+    return out
+
+
+# ── PSG profile ───────────────────────────────────────────────────────
+
+def profile_psg(raw: bytes, costs: dict[str, int],
+                frames: int | None = None) -> list[Frame]:
+    """Price a PSG register dump for a register-stream player.
+
+    $FF ends a frame, $FE n skips 4*n frames, $FD ends the stream and
+    0..15 is a register followed by its value."""
+    data = memoryview(raw)
+    if bytes(data[:len(PSG_MAGIC)]) != PSG_MAGIC:
+        raise ValueError("not a PSG register dump")
+    out: list[Frame] = []
+    writes = 0
+    at = PSG_HEADER_SIZE
+
+    def end_frame(count: int = 1) -> None:
+        nonlocal writes
+        for _ in range(count):
+            out.append(Frame(len(out), costs["psg_frame"]
+                             + costs["psg_register"] * writes, -1, -1))
+            writes = 0
+
+    while at < len(data) and (frames is None or len(out) < frames):
+        cmd = data[at]
+        at += 1
+        if cmd == 0xFF:
+            end_frame()
+        elif cmd == 0xFE:
+            if at >= len(data):
+                break
+            end_frame(4 * data[at])
+            at += 1
+        elif cmd == 0xFD:
+            break
+        elif cmd < 16:
+            writes += 1
+            at += 1
+        else:
+            raise ValueError(f"bad PSG command ${cmd:02X} at offset {at - 1}")
+    if writes:
+        end_frame()
+    return out[:frames] if frames is not None else out
+
+
+# ── Output formatters ─────────────────────────────────────────────────
+
+def write_csv(profile: list[Frame], out: TextIO) -> None:
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["frame", "music_tstates", "position", "row"])
+    for f in profile:
+        writer.writerow([f.frame, f.tstates, f.position, f.row])
+
+
+def percentile(values: list[int], pct: float) -> int:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+
+def summarise(profile: list[Frame], render: int, budget: int) -> dict:
+    costs = [f.tstates for f in profile]
+    peak = max(profile, key=lambda f: f.tstates)
+    over = [f.frame for f in profile if render + f.tstates > budget]
+    return {
+        "frames": len(profile),
+        "mean": round(sum(costs) / len(costs), 1),
+        "p95": percentile(costs, 95),
+        "peak": peak.tstates,
+        "peak_frame": peak.frame,
+        "budget": budget,
+        "render": render,
+        "frames_over_budget": len(over),
+        "first_over_budget": over[:10],
+    }
+
+
+def format_summary(name: str, stats: dict, profile: list[Frame],
+                   top: int, out: TextIO) -> None:
+    out.write(f"Music player cost — {name}\n")
+    out.write(f"  frames: {stats['frames']}  ({stats['frames'] / 50:.1f}s)\n")
+    out.write(f"  mean {stats['mean']:,.0f} T   p95 {stats['p95']:,d} T   "
+              f"peak {stats['peak']:,d} T (frame {stats['peak_frame']})\n")
+    if stats["render"]:
+        spare = stats["budget"] - stats["render"]
+        out.write(f"  budget {stats['budget']:,d} T - render "
+                  f"{stats['render']:,d} T = {spare:,d} T for music\n")
+        if stats["frames_over_budget"]:
+            frames = ", ".join(map(str, stats["first_over_budget"]))
+            out.write(f"  WARNING: {stats['frames_over_budget']} frames over "
+                      f"budget (first: {frames})\n")
+        else:
+            out.write(f"  all frames fit ({spare - stats['peak']:,d} T "
+                      f"headroom at peak)\n")
+    if top:
+        out.write(f"  top {top} spikes:\n")
+        for f in sorted(profile, key=lambda f: (-f.tstates, f.frame))[:top]:
+            where = (f"  position {f.position} row {f.row}"
+                     if f.position >= 0 else "")
+            out.write(f"    frame {f.frame:6d}  {f.tstates:6,d} T{where}\n")
+
+
+# ── CLI ───────────────────────────────────────────────────────────────
+
+def load_costs(path: str | None) -> dict[str, int]:
+    """DEFAULT_COSTS, with any keys from a TOML [cost] table applied."""
+    costs = dict(DEFAULT_COSTS)
+    if path is None:
+        return costs
+    if tomllib is None:
+        print("Error: Python 3.11+ or 'tomli' package required for --model",
+              file=sys.stderr)
+        sys.exit(1)
+    try:
+        with open(path, "rb") as f:
+            table = tomllib.load(f).get("cost", {})
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        print(f"Error: cannot read cost model {path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    for key, value in table.items():
+        if key not in costs:
+            print(f"Error: unknown cost '{key}' in {path} "
+                  f"(known: {', '.join(costs)})", file=sys.stderr)
+            sys.exit(1)
+        if not isinstance(value, int) or value < 0:
+            print(f"Error: cost '{key}' must be a non-negative integer",
+                  file=sys.stderr)
+            sys.exit(1)
+        costs[key] = value
+    return costs
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="musicprof",
+        description=(
+            "AY Music Cycle-Budget Profiler.\n"
+            "Per-frame music player T-states for a PT3 module or PSG dump,\n"
+            "as CSV for packbench or as a spike/budget summary."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            "examples:\n"
+            "  %(prog)s song.pt3 -o build/music.csv       CSV for packbench\n"
+            "  %(prog)s song.pt3 --summary --render 55000 budget check\n"
+            "  %(prog)s intro.psg --summary                register dump\n"
+        ),
+    )
+    parser.add_argument("input", help="PT3 module or PSG register dump")
+    parser.add_argument("-o", "--output", metavar="FILE",
+                        help="Write the CSV here (default: stdout)")
+    parser.add_argument(
+        "--frames", type=int, metavar="N",
+        help="Profile exactly N frames, following the song loop "
+             "(default: one play-through)",
+    )
+    parser.add_argument("--model", metavar="FILE",
+                        help="TOML file whose [cost] table overrides the "
+                             "default T-state costs")
+    parser.add_argument("--summary", action="store_true",
+                        help="Print mean / p95 / peak and spikes, not CSV")
+    parser.add_argument("--json", action="store_true",
+                        help="Print the summary as JSON")
+    parser.add_argument("--top", type=int, default=5, metavar="N",
+                        help="Spikes to list in the summary (default 5)")
+    parser.add_argument("--render", type=int, default=0, metavar="T",
+                        help="Effect render T-states per frame, for the "
+                             "budget check")
+    parser.add_argument("--machine", choices=list(FRAME_BUDGETS), default="128k",
+                        help="Frame budget for the check (default 128k)")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    path = Path(args.input)
+    if not path.is_file():
+        print(f"Error: file not found: {path}", file=sys.stderr)
+        sys.exit(1)
+    if args.frames is not None and args.frames < 1:
+        print("Error: --frames must be positive", file=sys.stderr)
+        sys.exit(1)
+    costs = load_costs(args.model)
+
+    raw = path.read_bytes()
+    try:
+        if raw.startswith(PT3_MAGIC):
+            profile = profile_pt3(parse_pt3(raw, str(path)), costs, args.frames)
+        elif raw.startswith(PSG_MAGIC):
+            profile = profile_psg(raw, costs, args.frames)
+        else:
+            print(f"Error: {path} is neither a PT3 module nor a PSG dump",
+                  file=sys.stderr)
+            sys.exit(1)
+    except ValueError as e:  # Pt3Error included
+        print(f"Error: {path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not profile:
+        print(f"Error: {path} plays no frames", file=sys.stderr)
+        sys.exit(1)
+
+    if args.summary or args.json:
+        stats = summarise(profile, args.render, FRAME_BUDGETS[args.machine])
+        if args.json:
+            json.dump(stats, sys.stdout, indent=2)
+            print()
+        else:
+            format_summary(path.name, stats, profile, args.top, sys.stdout)
+        return
+
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            write_csv(profile, f)
+        print(f"Wrote {len(profile)} frames to {args.output}", file=sys.stderr)
+    else:
+        write_csv(profile, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,8 @@ Usage:
   python notetable.py --pythagorean --format c  # Pythagorean, C output
   python notetable.py --custom ratios.txt       # Custom ratio file
   python notetable.py --check-envelope          # Show envelope alignment info
+  python notetable.py --search --search-clocks 1773400,1520640
+                                                # Pareto search over A4 and clock
 """
 
 from __future__ import annotations
@@ -26,7 +28,17 @@ import math
 import sys
 from fractions import Fraction
 from pathlib import Path
-from typing import TextIO
+from typing import NamedTuple, TextIO
+
+try:
+    import numpy as np
+except ImportError:  # optional: only the --search mode needs it
+    np = None
+
+try:
+    from .tablegen import pareto_indices
+except ImportError:  # run as a script from this directory
+    from tablegen import pareto_indices
 
 # ── Constants ──────────────────────────────────────────────────────────
 
@@ -42,6 +54,12 @@ DEFAULT_CLOCK = CLOCK_ZX128K
 DEFAULT_BASE_FREQ = 440.0
 DEFAULT_OCTAVES = 8
 
+# --search defaults: A4 swept across +-50 cents of 440 Hz in 0.01 Hz steps
+DEFAULT_SEARCH_MIN = 427.5
+DEFAULT_SEARCH_MAX = 452.9
+DEFAULT_SEARCH_STEP = 0.01
+SEARCH_CHUNK = 4096  # base frequencies evaluated per NumPy block
+
 # Note names: 12 semitones, using flats for minor intervals
 NOTE_NAMES = ["C-", "C#", "D-", "Eb", "E-", "F-", "F#", "G-", "Ab", "A-", "Bb", "B-"]
 
@@ -282,6 +300,156 @@ def format_envelope_check(notes: list[Note], out: TextIO) -> None:
             out.write(f"; {note.name}: {note.period} / 16 = {quotient:.1f}  {mark}\n")
 
 
+# ── Tuning search ─────────────────────────────────────────────────────
+
+class Candidate(NamedTuple):
+    """Quality of one (clock, A4) pairing over the whole table."""
+    clock: int
+    base_freq: float
+    total_cents: float   # sum of |cents| over in-range notes
+    max_cents: float
+    aligned: int         # in-range notes with period % 16 == 0
+    clamped: int         # notes pinned to the 12-bit period limits
+
+
+def table_frequencies(tuning: str, base_freqs, octaves: int,
+                      ratios: list[Fraction] | None = None):
+    """Target frequencies, shape (len(base_freqs), octaves * 12).
+
+    Mirrors freq_12tet / freq_ratio_based operation for operation so a
+    row is bit-identical to what generate_table computes for that A4."""
+    base = np.asarray(base_freqs, dtype=np.float64)[:, None]
+    idx = np.arange(octaves * 12)
+    octave, semitone = idx // 12, idx % 12
+    # Scalar powers: np.power may differ from float.__pow__ in the last ulp
+    if tuning == "12tet":
+        step = np.array([2.0 ** ((12 + i - 69) / 12.0) for i in idx.tolist()])
+        return base * step
+    assert ratios is not None
+    octave_scale = np.array([2.0 ** (o - 4) for o in octave.tolist()])
+    ratio_note = np.array([float(r) for r in ratios])[semitone]
+    c4_freq = base / float(ratios[9])
+    return c4_freq * octave_scale * ratio_note
+
+
+def period_grid(tuning: str, clock: int, base_freqs, octaves: int,
+                ratios: list[Fraction] | None = None):
+    """Per-note quality of each A4 at one clock, arrays shaped
+    (len(base_freqs), octaves * 12): |cents| error (0 where clamped),
+    period%16==0 mask and clamped mask. Periods round half-to-even
+    exactly like ay_period."""
+    raw = clock / (16.0 * table_frequencies(tuning, base_freqs, octaves, ratios))
+    rounded = np.rint(raw)
+    in_range = (rounded >= AY_PERIOD_MIN) & (rounded <= AY_PERIOD_MAX)
+    period = np.clip(rounded, AY_PERIOD_MIN, AY_PERIOD_MAX)
+    cents = np.where(in_range, np.abs(1200.0 * np.log2(raw / period)), 0.0)
+    return cents, in_range & (period % 16 == 0), ~in_range
+
+
+def search_tuning(tuning: str, clocks: list[int], base_freqs,
+                  octaves: int,
+                  ratios: list[Fraction] | None = None) -> list[Candidate]:
+    """Score every (clock, A4) pair; returns candidates in clock-major
+    order."""
+    base_freqs = np.asarray(base_freqs, dtype=np.float64)
+    candidates: list[Candidate] = []
+    for clock in clocks:
+        for start in range(0, len(base_freqs), SEARCH_CHUNK):
+            chunk = base_freqs[start:start + SEARCH_CHUNK]
+            cents, aligned, clamped = period_grid(tuning, clock, chunk,
+                                                  octaves, ratios)
+            total, worst = cents.sum(axis=1), cents.max(axis=1)
+            aligned, clamped = aligned.sum(axis=1), clamped.sum(axis=1)
+            for j, base in enumerate(chunk.tolist()):
+                candidates.append(Candidate(
+                    clock=clock,
+                    base_freq=base,
+                    total_cents=float(total[j]),
+                    max_cents=float(worst[j]),
+                    aligned=int(aligned[j]),
+                    clamped=int(clamped[j]),
+                ))
+    return candidates
+
+
+def search_front(candidates: list[Candidate]) -> list[Candidate]:
+    """Pareto set: least total cents error, most envelope-aligned notes,
+    fewest clamped notes. Sorted by aligned count, best tuned first."""
+    # Only the best-tuned candidate per (aligned, clamped) cell can be on
+    # the front, which keeps the O(n^2) dominance check small.
+    best: dict[tuple[int, int], Candidate] = {}
+    for c in candidates:
+        cell = (c.aligned, c.clamped)
+        if cell not in best or c.total_cents < best[cell].total_cents:
+            best[cell] = c
+    pool = list(best.values())
+    keys = [(round(c.total_cents, 6), -c.aligned, c.clamped) for c in pool]
+    front = [pool[i] for i in pareto_indices(keys)]
+    return sorted(front, key=lambda c: (-c.aligned, c.total_cents))
+
+
+def format_search(front: list[Candidate], tuning: str, octaves: int,
+                  n_bases: int, clocks: list[int], fmt: str,
+                  out: TextIO) -> None:
+    """Report the Pareto set as a commented table or JSON."""
+    if fmt == "json":
+        data = {
+            "tuning": tuning,
+            "octaves": octaves,
+            "base_freqs": n_bases,
+            "clocks": clocks,
+            "front": [
+                {
+                    "clock": c.clock,
+                    "base_freq": c.base_freq,
+                    "total_cents": round(c.total_cents, 2),
+                    "max_cents": round(c.max_cents, 2),
+                    "aligned": c.aligned,
+                    "clamped": c.clamped,
+                }
+                for c in front
+            ],
+        }
+        json.dump(data, out, indent=2)
+        out.write("\n")
+        return
+
+    prefix = "// " if fmt == "c" else "; "
+    notes = octaves * 12
+    lines = [
+        f"AY-3-8910 tuning search — {tuning_label(tuning)}, {notes} notes, "
+        f"{n_bases} A4 values x {len(clocks)} clock(s)",
+        "Pareto set: min total cents error, max period%16==0 notes, "
+        "min clamped notes",
+        "",
+        f"{'clock':>8}  {'A4 (Hz)':>9}  {'total ct':>9}  {'mean ct':>7}  "
+        f"{'max ct':>6}  {'div16':>5}  {'clamped':>7}",
+    ]
+    for c in front:
+        mean = c.total_cents / max(1, notes - c.clamped)
+        lines.append(
+            f"{c.clock:8d}  {c.base_freq!s:>9}  {c.total_cents:9.1f}  "
+            f"{mean:7.2f}  {c.max_cents:6.2f}  {c.aligned:5d}  {c.clamped:7d}"
+        )
+    for line in lines:
+        out.write(f"{prefix}{line}".rstrip() + "\n")
+
+
+def parse_clock_list(text: str) -> list[int]:
+    """Comma-separated clock frequencies in Hz."""
+    try:
+        clocks = [int(item) for item in text.split(",") if item.strip()]
+    except ValueError:
+        print(f"Error: --search-clocks expects integers, got '{text}'",
+              file=sys.stderr)
+        sys.exit(1)
+    if not clocks or any(c <= 0 for c in clocks):
+        print("Error: --search-clocks needs at least one positive clock",
+              file=sys.stderr)
+        sys.exit(1)
+    return clocks
+
+
 # ── CLI ───────────────────────────────────────────────────────────────
 
 def build_parser() -> argparse.ArgumentParser:
@@ -300,6 +468,8 @@ def build_parser() -> argparse.ArgumentParser:
             "  %(prog)s --pythagorean --format c       Pythagorean, C array\n"
             "  %(prog)s --12tet --check-envelope       12-TET with envelope check\n"
             "  %(prog)s --custom ratios.txt            Custom tuning ratios\n"
+            "  %(prog)s --search --search-clocks 1773400,1520640\n"
+            "                                          Pareto search over A4 x clock\n"
         ),
     )
 
@@ -344,9 +514,57 @@ def build_parser() -> argparse.ArgumentParser:
         help=f"Number of octaves starting from octave 0 (default {DEFAULT_OCTAVES})",
     )
 
+    search = parser.add_argument_group(
+        "tuning search",
+        "Sweep A4 (and optionally several clocks) and report the Pareto set "
+        "of total cents error vs. envelope-aligned notes. Requires NumPy.",
+    )
+    search.add_argument(
+        "--search", action="store_true",
+        help="Search A4 x clock instead of printing a table",
+    )
+    search.add_argument(
+        "--search-min", type=float, default=DEFAULT_SEARCH_MIN, metavar="HZ",
+        help=f"Lowest A4 to try (default {DEFAULT_SEARCH_MIN})",
+    )
+    search.add_argument(
+        "--search-max", type=float, default=DEFAULT_SEARCH_MAX, metavar="HZ",
+        help=f"Highest A4 to try (default {DEFAULT_SEARCH_MAX})",
+    )
+    search.add_argument(
+        "--search-step", type=float, default=DEFAULT_SEARCH_STEP, metavar="HZ",
+        help=f"A4 step (default {DEFAULT_SEARCH_STEP})",
+    )
+    search.add_argument(
+        "--search-clocks", metavar="LIST",
+        help="Comma-separated clocks to try (default: --clock)",
+    )
+
     return parser
 
 
+def run_search(args: argparse.Namespace, tuning: str,
+               ratios: list[Fraction] | None) -> None:
+    """--search: sweep A4 across the requested clocks and print the front."""
+    if np is None:
+        print("Error: --search requires NumPy", file=sys.stderr)
+        sys.exit(1)
+    if args.search_step <= 0 or args.search_min <= 0 \
+            or args.search_max < args.search_min:
+        print("Error: --search needs 0 < --search-min <= --search-max "
+              "and a positive --search-step", file=sys.stderr)
+        sys.exit(1)
+    clocks = (parse_clock_list(args.search_clocks) if args.search_clocks
+              else [args.clock])
+    count = int(math.floor((args.search_max - args.search_min)
+                           / args.search_step + 1e-9)) + 1
+    # Rounded so each printed A4 feeds back through --base-freq unchanged
+    base_freqs = np.round(args.search_min + args.search_step * np.arange(count), 6)
+    candidates = search_tuning(tuning, clocks, base_freqs, args.octaves, ratios)
+    format_search(search_front(candidates), tuning, args.octaves,
+                  count, clocks, args.output_format, sys.stdout)
+
+
 def main(argv: list[str] | None = None) -> None:
     parser = build_parser()
     args = parser.parse_args(argv)
@@ -372,6 +590,10 @@ def main(argv: list[str] | None = None) -> None:
         print("Error: --octaves must be between 1 and 10", file=sys.stderr)
         sys.exit(1)
 
+    if args.search:
+        run_search(args, tuning, ratios)
+        return
+
     # Generate table
     notes = generate_table(
         tuning=tuning,
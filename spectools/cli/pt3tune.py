@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+"""PT3 Tuning Analyser for ZX Spectrum.
+
+Reads Vortex Tracker II / ProTracker 3 modules, collects the notes each
+song actually plays (ornaments expanded, envelope use tracked per
+channel) and re-scores the notetable tunings weighted by that usage:
+mean cents error over the notes heard, and the share of buzz-bass
+(envelope) notes whose period divides by 16. Suggests the tuning, AY
+clock and A4 that suit each song best.
+
+Usage:
+  python pt3tune.py song.pt3                     # one module
+  python pt3tune.py music/                       # every *.pt3 under a folder
+  python pt3tune.py music/ --clocks 1773400,1520640 --format json
+  python pt3tune.py song.pt3 --tunings 12tet,just --slack 0.5
+
+PT3 note n (C-1 .. B-8 in tracker naming, C-1 ~ 32.7 Hz in the stock
+tone tables) is scored against notetable entry n + 12: notetable counts
+from C0 (16.35 Hz), so PT3 C-1 is its C1 and the song needs --octaves 9.
+Sample tone offsets and slides are not modelled; ornaments are.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import struct
+import sys
+from fractions import Fraction
+from pathlib import Path
+from typing import NamedTuple, TextIO
+
+try:
+    import numpy as np
+except ImportError:  # reported in main(); the tuning maths needs it
+    np = None
+
+try:
+    from . import notetable
+except ImportError:  # run as a script from this directory
+    import notetable
+
+# ── PT3 layout ────────────────────────────────────────────────────────
+
+PT3_MAGIC = b"ProTracker 3."
+PT3_NOTES = 96
+PT3_NOTE_OFFSET = 12  # PT3 C-1 is notetable entry 12 (C1, 32.7 Hz)
+PT3_HEADER = struct.Struct("<BBBBH32H16H")  # table, tempo, length, loop, ptrs
+PT3_HEADER_AT = 99
+PT3_POSITIONS_AT = 201
+PT3_MAX_ROWS = 256
+
+# Parameter bytes of the special commands $01-$0F. The player pushes each
+# command while reading the row and pops them after the note, so the
+# parameters follow the row in reverse order of the commands.
+PT3_SPECIAL_PARAMS = {
+    1: 3,   # glissando: delay, step (word)
+    2: 5,   # portamento: delay, 2 unused bytes, step (word)
+    3: 1,   # sample position
+    4: 1,   # ornament position
+    5: 2,   # vibrato: on/off time
+    8: 3,   # envelope slide: delay, step (word)
+    9: 1,   # tempo
+}
+
+TUNINGS = ("12tet", "just", "pythagorean")
+TUNING_RATIOS = {
+    "12tet": None,
+    "just": notetable.JUST_RATIOS,
+    "pythagorean": notetable.PYTHAGOREAN_RATIOS,
+}
+EVALUATE_CHUNK = 64  # songs scored per matrix product
+DEFAULT_SLACK = 1.0  # cents a suggestion may give up for buzz-bass alignment
+
+
+class Row(NamedTuple):
+    """One decoded channel row. note/ornament/envelope/tempo are None
+    when the row leaves them alone."""
+    row: int
+    note: int | None         # 0..95, or -1 for note off ($C0)
+    ornament: int | None
+    envelope: bool | None
+    tempo: int | None
+    size: int = 0            # pattern bytes read, parameters included
+    commands: tuple[int, ...] = ()  # special commands $01-$0F, in order
+
+
+class Pt3Module(NamedTuple):
+    """A parsed module: header fields plus per-pattern channel rows."""
+    path: str
+    version: int
+    title: str
+    author: str
+    tone_table: int
+    tempo: int
+    positions: list[int]                    # pattern numbers, play order
+    loop: int
+    patterns: dict[int, tuple[list[Row], list[Row], list[Row]]]
+    pattern_rows: dict[int, int]            # rows per pattern
+    ornaments: dict[int, list[int]]         # number -> semitone offsets
+
+
+class Pt3Error(ValueError):
+    """The file is not a PT3 module or is truncated."""
+
+
+# ── PT3 parsing ───────────────────────────────────────────────────────
+
+def _text(data: memoryview, start: int, size: int) -> str:
+    return bytes(data[start:start + size]).decode("latin-1").strip()
+
+
+def _channel_row(data: memoryview, ptr: int, row: int,
+                 skip: int) -> tuple[int, int, Row]:
+    """Decode one channel row at ptr. Returns (next ptr, skip, Row)."""
+    start = ptr
+    note = ornament = envelope = tempo = None
+    specials: list[int] = []
+    while True:
+        cmd = data[ptr]
+        ptr += 1
+        if cmd >= 0xF0:                       # ornament + sample, env off
+            ornament, envelope = cmd - 0xF0, False
+            ptr += 1
+        elif cmd >= 0xD1:                     # sample
+            pass
+        elif cmd == 0xD0:                     # empty row
+            break
+        elif cmd >= 0xC1:                     # volume
+            pass
+        elif cmd == 0xC0:                     # note off
+            note = -1
+            break
+        elif cmd >= 0xB2:                     # envelope type + period
+            envelope = True
+            ptr += 2
+        elif cmd == 0xB1:                     # rows per step
+            skip = data[ptr] or 256
+            ptr += 1
+        elif cmd == 0xB0:                     # envelope off
+            envelope = False
+        elif cmd >= 0x50:                     # note, ends the row
+            note = cmd - 0x50
+            break
+        elif cmd >= 0x40:                     # ornament
+            ornament = cmd - 0x40
+        elif cmd >= 0x20:                     # noise base
+            pass
+        elif cmd >= 0x11:                     # envelope + sample
+            envelope = True
+            ptr += 3
+        elif cmd == 0x10:                     # envelope off + sample
+            envelope = False
+            ptr += 1
+        elif cmd:                             # special command, params later
+            specials.append(cmd)
+        else:
+            raise Pt3Error("channel data ends inside a pattern")
+    for cmd in reversed(specials):
+        if cmd == 9:
+            tempo = data[ptr]
+        ptr += PT3_SPECIAL_PARAMS.get(cmd, 0)
+    return ptr, skip, Row(row, note, ornament, envelope, tempo,
+                          ptr - start, tuple(specials))
+
+
+def _decode_pattern(data: memoryview, channels: tuple[int, int, int]
+                    ) -> tuple[tuple[list[Row], list[Row], list[Row]], int]:
+    """Walk one pattern's three channel streams in lockstep, honouring
+    each channel's row skip. Channel A reading $00 ends the pattern."""
+    ptrs = list(channels)
+    skip = [1, 1, 1]
+    wait = [1, 1, 1]
+    rows: tuple[list[Row], list[Row], list[Row]] = ([], [], [])
+    for row in range(PT3_MAX_ROWS + 1):
+        for ch in range(3):
+            wait[ch] -= 1
+            if wait[ch]:
+                continue
+            if ch == 0 and data[ptrs[0]] == 0:
+                return rows, row
+            ptrs[ch], skip[ch], decoded = _channel_row(data, ptrs[ch], row, skip[ch])
+            wait[ch] = skip[ch]
+            rows[ch].append(decoded)
+    raise Pt3Error(f"pattern longer than {PT3_MAX_ROWS} rows")
+
+
+def parse_pt3(raw: bytes, path: str = "") -> Pt3Module:
+    """Parse a PT3 module in a single pass over a memoryview.
+
+    Every pattern referenced by the position list is decoded once, however
+    often it is played; ornaments are read only if a pattern selects them."""
+    data = memoryview(raw)
+    if bytes(data[:len(PT3_MAGIC)]) != PT3_MAGIC or len(data) < PT3_POSITIONS_AT + 1:
+        raise Pt3Error("not a ProTracker 3 module")
+    try:
+        fields = PT3_HEADER.unpack_from(data, PT3_HEADER_AT)
+        tone_table, tempo, _length, loop, pattern_ptr = fields[:5]
+        ornament_ptrs = fields[37:53]
+        version = data[13] - 0x30 if 0x30 <= data[13] <= 0x39 else 6
+
+        positions: list[int] = []
+        at = PT3_POSITIONS_AT
+        while data[at] != 0xFF:
+            positions.append(data[at] // 3)
+            at += 1
+
+        patterns = {}
+        pattern_rows = {}
+        used_ornaments = {0}
+        for pattern in positions:
+            if pattern in patterns:
+                continue
+            channels = struct.unpack_from("<3H", data, pattern_ptr + 6 * pattern)
+            patterns[pattern], pattern_rows[pattern] = _decode_pattern(data, channels)
+            used_ornaments.update(r.ornament for ch in patterns[pattern]
+                                  for r in ch if r.ornament is not None)
+
+        ornaments = {}
+        for number in sorted(used_ornaments):
+            start = ornament_ptrs[number]
+            length = data[start + 1]
+            ornaments[number] = [b - 256 if b > 127 else b
+                                 for b in data[start + 2:start + 2 + length]] or [0]
+    except (IndexError, struct.error) as e:
+        raise Pt3Error(f"truncated module ({e})") from None
+
+    return Pt3Module(
+        path=path,
+        version=version,
+        title=_text(data, 30, 32),
+        author=_text(data, 66, 32),
+        tone_table=tone_table,
+        tempo=tempo,
+        positions=positions,
+        loop=loop,
+        patterns=patterns,
+        pattern_rows=pattern_rows,
+        ornaments=ornaments,
+    )
+
+
+# ── Note usage ────────────────────────────────────────────────────────
+
+class NoteUse(NamedTuple):
+    """How often each of the 96 notes sounds over one play-through."""
+    events: int               # note-on events
+    plain: list[float]        # per-note weight, ornament steps spread evenly
+    enveloped: list[float]    # the subset played with the envelope on
+    ornaments: list[int]      # ornaments actually applied to a note
+
+
+def note_use(module: Pt3Module) -> NoteUse:
+    """Play the position list once, carrying each channel's ornament and
+    envelope state across patterns the way the player does."""
+    plain = [0.0] * PT3_NOTES
+    enveloped = [0.0] * PT3_NOTES
+    ornament = [0, 0, 0]
+    envelope = [False, False, False]
+    applied: set[int] = set()
+    events = 0
+    for pattern in module.positions:
+        for ch, rows in enumerate(module.patterns[pattern]):
+            for r in rows:
+                if r.ornament is not None:
+                    ornament[ch] = r.ornament
+                if r.envelope is not None:
+                    envelope[ch] = r.envelope
+                if r.note is None or r.note < 0:
+                    continue
+                events += 1
+                applied.add(ornament[ch])
+                steps = module.ornaments[ornament[ch]]
+                share = 1.0 / len(steps)
+                target = enveloped if envelope[ch] else None
+                for offset in steps:
+                    n = min(PT3_NOTES - 1, max(0, r.note + offset))
+                    plain[n] += share
+                    if target is not None:
+                        target[n] += share
+    return NoteUse(events, plain, enveloped, sorted(applied))
+
+
+# ── Tuning evaluation ─────────────────────────────────────────────────
+
+class Choice(NamedTuple):
+    """A (tuning, clock, A4) table scored against one song's note use."""
+    tuning: str
+    clock: int
+    base_freq: float
+    mean_cents: float         # usage-weighted mean |cents|
+    env_aligned: float        # share of envelope notes with period%16==0
+    clamped: float            # share of played notes clamped to 12 bits
+
+
+class Report(NamedTuple):
+    module: Pt3Module
+    use: NoteUse
+    current: Choice
+    suggestion: Choice
+    front: list[Choice]
+
+
+def pt3_grid(tuning: str, clock: int, base_freqs,
+             ratios: list[Fraction] | None):
+    """notetable.period_grid over the PT3 note range (entries 12..107)."""
+    octaves = (PT3_NOTE_OFFSET + PT3_NOTES) // 12
+    return tuple(g[:, PT3_NOTE_OFFSET:] for g in notetable.period_grid(
+        tuning, clock, base_freqs, octaves, ratios))
+
+
+def evaluate(uses: list[NoteUse], tunings: dict[str, list[Fraction] | None],
+             clocks: list[int], base_freqs, reference: tuple[str, int, float],
+             slack: float) -> list[tuple[Choice, Choice, list[Choice]]]:
+    """Score every candidate table against every song.
+
+    The per-note grids come from notetable.period_grid and are built once
+    for all songs; each block of songs is then three matrix products.
+    Returns (current, suggestion, front) per song, where current is the
+    reference (tuning, clock, A4)."""
+    base_freqs = np.asarray(base_freqs, dtype=np.float64)
+    labels: list[tuple[str, int, float]] = []
+    grids = []  # per (tuning, clock): cents, aligned, clamped
+    for tuning, ratios in tunings.items():
+        for clock in clocks:
+            grids.append(pt3_grid(tuning, clock, base_freqs, ratios))
+            labels.extend((tuning, clock, b) for b in base_freqs.tolist())
+    cents_all, aligned_all, clamped_all = (np.concatenate(g).T
+                                           for g in zip(*grids))
+    ref_tuning, ref_clock, ref_base = reference
+    ref_cents, ref_aligned, ref_clamped = (g[0] for g in pt3_grid(
+        ref_tuning, ref_clock, [ref_base], TUNING_RATIOS[ref_tuning]))
+
+    results = []
+    for start in range(0, len(uses), EVALUATE_CHUNK):
+        chunk = uses[start:start + EVALUATE_CHUNK]
+        plain = np.array([u.plain for u in chunk])
+        env = np.array([u.enveloped for u in chunk])
+        plain /= np.maximum(plain.sum(axis=1, keepdims=True), 1e-12)
+        env /= np.maximum(env.sum(axis=1, keepdims=True), 1e-12)
+        scores = (plain @ cents_all, env @ aligned_all, plain @ clamped_all)
+        current = zip((plain @ ref_cents).tolist(), (env @ ref_aligned).tolist(),
+                      (plain @ ref_clamped).tolist())
+        for song, ref in enumerate(current):
+            suggestion, front = _choose(song, labels, *scores, slack)
+            results.append((Choice(ref_tuning, ref_clock, ref_base, *ref),
+                            suggestion, front))
+    return results
+
+
+def _choose(song: int, labels: list[tuple[str, int, float]], mean_cents,
+            env_aligned, clamped, slack: float) -> tuple[Choice, list[Choice]]:
+    """One song's Pareto front and the suggestion picked from it."""
+    def choice(j: int) -> Choice:
+        tuning, clock, base = labels[j]
+        return Choice(tuning, clock, base, float(mean_cents[song, j]),
+                      float(env_aligned[song, j]), float(clamped[song, j]))
+
+    # Candidates that clamp as few of the song's notes as possible
+    pool = np.flatnonzero(clamped[song] <= clamped[song].min() + 1e-9)
+    cents, aligned = mean_cents[song, pool], env_aligned[song, pool]
+    # Two objectives: walk by rising error, keep each new best alignment
+    order = np.lexsort((-aligned, cents))
+    best_before = np.maximum.accumulate(np.r_[-1.0, aligned[order][:-1]])
+    front = [choice(int(pool[j])) for j in order[aligned[order] > best_before + 1e-9]]
+    # Best tuned, unless buzz-bass alignment is available within slack
+    limit = front[0].mean_cents + slack
+    suggestion = max((c for c in front if c.mean_cents <= limit),
+                     key=lambda c: (c.env_aligned, -c.mean_cents))
+    return suggestion, front
+
+
+# ── Output formatters ─────────────────────────────────────────────────
+
+def notetable_args(c: Choice) -> str:
+    flag = {"12tet": "--12tet", "just": "--just",
+            "pythagorean": "--pythagorean"}.get(c.tuning, "--custom FILE")
+    octaves = (PT3_NOTE_OFFSET + PT3_NOTES) // 12
+    return (f"notetable {flag} --clock {c.clock} --base-freq {c.base_freq} "
+            f"--octaves {octaves}")
+
+
+def format_choice(label: str, c: Choice) -> str:
+    line = (f"  {label:<8} {notetable.tuning_label(c.tuning):<16} "
+            f"{c.clock:8d}  A4={c.base_freq!s:<7}  mean {c.mean_cents:5.2f} ct  "
+            f"env/16 {100 * c.env_aligned:5.1f}%")
+    if c.clamped:
+        line += f"  clamped {100 * c.clamped:.1f}%"
+    return line
+
+
+def format_text(reports: list[Report], show_front: bool, out: TextIO) -> None:
+    for r in reports:
+        m, u = r.module, r.use
+        title = f'"{m.title}"' if m.title else "(untitled)"
+        by = f" by {m.author}" if m.author else ""
+        out.write(f"{m.path}  {title}{by}  "
+                  f"(PT3.{m.version}, table {m.tone_table}, "
+                  f"{len(m.positions)} positions)\n")
+        distinct = sum(1 for w in u.plain if w)
+        env_notes = sum(1 for w in u.enveloped if w)
+        out.write(f"  notes: {u.events} played, {distinct} distinct, "
+                  f"{env_notes} with envelope; ornaments "
+                  f"{','.join(map(str, u.ornaments)) or '-'}\n")
+        if not u.events:
+            out.write("  no notes played\n\n")
+            continue
+        out.write(format_choice("current", r.current) + "\n")
+        out.write(format_choice("suggest", r.suggestion) + "\n")
+        out.write(f"           {notetable_args(r.suggestion)}  "
+                  f"# PT3 C-1 = entry {PT3_NOTE_OFFSET} (C1)\n")
+        if show_front:
+            for c in r.front:
+                out.write(format_choice("front", c) + "\n")
+        out.write("\n")
+
+
+def format_json(reports: list[Report], show_front: bool, out: TextIO) -> None:
+    def as_dict(c: Choice) -> dict:
+        return {
+            "tuning": c.tuning,
+            "clock": c.clock,
+            "base_freq": c.base_freq,
+            "mean_cents": round(c.mean_cents, 3),
+            "env_aligned": round(c.env_aligned, 4),
+            "clamped": round(c.clamped, 4),
+        }
+
+    songs = []
+    for r in reports:
+        m, u = r.module, r.use
+        song = {
+            "path": m.path,
+            "title": m.title,
+            "author": m.author,
+            "version": m.version,
+            "tone_table": m.tone_table,
+            "positions": len(m.positions),
+            "notes_played": u.events,
+            "ornaments": u.ornaments,
+            "note_use": {i: round(w, 3) for i, w in enumerate(u.plain) if w},
+            "envelope_use": {i: round(w, 3) for i, w in enumerate(u.enveloped) if w},
+        }
+        if u.events:
+            song["current"] = as_dict(r.current)
+            song["suggestion"] = as_dict(r.suggestion)
+            if show_front:
+                song["front"] = [as_dict(c) for c in r.front]
+        songs.append(song)
+    json.dump({"songs": songs}, out, indent=2)
+    out.write("\n")
+
+
+# ── CLI ───────────────────────────────────────────────────────────────
+
+def collect_paths(paths: list[str]) -> list[Path]:
+    """Expand folders to the *.pt3 files beneath them, sorted."""
+    found: list[Path] = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            found.extend(sorted(q for q in p.rglob("*")
+                                if q.suffix.lower() == ".pt3" and q.is_file()))
+        elif p.is_file():
+            found.append(p)
+        else:
+            print(f"Error: not found: {p}", file=sys.stderr)
+            sys.exit(1)
+    return found
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pt3tune",
+        description=(
+            "PT3 Tuning Analyser.\n"
+            "Scores notetable tunings against the notes a Vortex Tracker\n"
+            "module actually plays and suggests a tuning, clock and A4."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            "examples:\n"
+            "  %(prog)s song.pt3                        one module\n"
+            "  %(prog)s music/ --format json            every .pt3 in a folder\n"
+            "  %(prog)s song.pt3 --clocks 1773400,1520640 --front\n"
+        ),
+    )
+    parser.add_argument("paths", nargs="+", metavar="PATH",
+                        help="PT3 files or folders to scan")
+    parser.add_argument(
+        "--tunings", default=",".join(TUNINGS),
+        help=f"Comma-separated tunings to try (default {','.join(TUNINGS)})",
+    )
+    parser.add_argument(
+        "--custom", dest="custom_file", metavar="FILE",
+        help="Also try a custom ratio file (see notetable --custom)",
+    )
+    parser.add_argument(
+        "--clocks", default=str(notetable.DEFAULT_CLOCK), metavar="LIST",
+        help=f"Comma-separated AY clocks to try (default {notetable.DEFAULT_CLOCK})",
+    )
+    parser.add_argument(
+        "--search-min", type=float, default=notetable.DEFAULT_SEARCH_MIN,
+        metavar="HZ", help=f"Lowest A4 (default {notetable.DEFAULT_SEARCH_MIN})",
+    )
+    parser.add_argument(
+        "--search-max", type=float, default=notetable.DEFAULT_SEARCH_MAX,
+        metavar="HZ", help=f"Highest A4 (default {notetable.DEFAULT_SEARCH_MAX})",
+    )
+    parser.add_argument(
+        "--search-step", type=float, default=notetable.DEFAULT_SEARCH_STEP,
+        metavar="HZ", help=f"A4 step (default {notetable.DEFAULT_SEARCH_STEP})",
+    )
+    parser.add_argument(
+        "--slack", type=float, default=DEFAULT_SLACK, metavar="CENTS",
+        help="Mean cents the suggestion may trade for envelope alignment "
+             f"(default {DEFAULT_SLACK})",
+    )
+    parser.add_argument(
+        "--front", action="store_true",
+        help="Also list each song's Pareto set (mean cents vs. env alignment)",
+    )
+    parser.add_argument(
+        "--format", choices=["text", "json"], default="text",
+        dest="output_format", help="Output format (default: text)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("Error: pt3tune requires NumPy", file=sys.stderr)
+        sys.exit(1)
+
+    tunings: dict[str, list[Fraction] | None] = {}
+    for name in filter(None, (t.strip() for t in args.tunings.split(","))):
+        if name not in TUNING_RATIOS:
+            print(f"Error: unknown tuning '{name}' "
+                  f"(choose from {', '.join(TUNINGS)})", file=sys.stderr)
+            sys.exit(1)
+        tunings[name] = TUNING_RATIOS[name]
+    if args.custom_file:
+        tunings["custom"] = notetable.parse_custom_ratios(args.custom_file)
+    if not tunings:
+        print("Error: no tunings to try", file=sys.stderr)
+        sys.exit(1)
+    clocks = notetable.parse_clock_list(args.clocks)
+    if args.search_step <= 0 or args.search_min <= 0 \
+            or args.search_max < args.search_min:
+        print("Error: need 0 < --search-min <= --search-max "
+              "and a positive --search-step", file=sys.stderr)
+        sys.exit(1)
+    count = int((args.search_max - args.search_min) / args.search_step + 1e-9) + 1
+    base_freqs = np.round(args.search_min + args.search_step * np.arange(count), 6)
+
+    modules: list[Pt3Module] = []
+    for path in collect_paths(args.paths):
+        try:
+            modules.append(parse_pt3(path.read_bytes(), str(path)))
+        except Pt3Error as e:
+            print(f"Warning: skipping {path}: {e}", file=sys.stderr)
+    if not modules:
+        print("Error: no PT3 modules to analyse", file=sys.stderr)
+        sys.exit(1)
+
+    uses = [note_use(m) for m in modules]
+    reference = ("12tet", notetable.DEFAULT_CLOCK, notetable.DEFAULT_BASE_FREQ)
+    results = evaluate(uses, tunings, clocks, base_freqs, reference, args.slack)
+    reports = [Report(m, u, *res) for m, u, res in zip(modules, uses, results)]
+
+    if args.output_format == "json":
+        format_json(reports, args.front, sys.stdout)
+    else:
+        format_text(reports, args.front, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,24 @@ Supports the full ZX Spectrum screen layout:
 
 Usage:
   python scrview.py screen.scr                     # ANSI terminal output
+  python scrview.py screen.scr --depth 256         # 256-colour terminals
   python scrview.py screen.scr --html out.html     # HTML file
+  python scrview.py screen.scr --png out.png       # PNG image
   python scrview.py screen.scr --info              # Screen statistics
+  python scrview.py screens/ --info                # one line per .scr file
   python scrview.py screen.scr --grid              # Show 8x8 attr grid
   python scrview.py screen.scr --clash             # Highlight colour clash
   python scrview.py screen.scr --attr-only         # Attrs without pixels
+  python scrview.py frames/ --play                 # play a .scr sequence
+  python scrview.py dump.bin --play --loop         # concatenated 6912-byte frames
+  python scrview.py diff old.scr new.scr           # changed 8x8 cells
+  python scrview.py diff golden/ build/ --png d/   # batch regression compare
+  python scrview.py game.z80                       # screen from a snapshot
+  python scrview.py game.sna --bank 7              # 128K shadow screen
+  python scrview.py game.sna --peek 0x8000:64      # hex dump memory
+
+With NumPy installed the screen is decoded once into a (192, 256, 3) RGB
+array that every renderer reads; without it a per-pixel path is used.
 """
 
 from __future__ import annotations
@@ -22,8 +35,18 @@ from __future__ import annotations
 import argparse
 import html as html_mod
 import io
+import math
+import mmap
 import sys
+import time
+import zlib
 from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: per-pixel decode and render fallback
+    np = None
 
 # ── ZX Spectrum colour palette ────────────────────────────────────────
 
@@ -150,6 +173,142 @@ def pixel_colour_attr_only(
         return ZX_PALETTE[bright][paper]
 
 
+# ── Vectorised decode ────────────────────────────────────────────────
+
+# Overlay colours
+GRID_RGB = (128, 128, 128)
+CLASH_RGB = (255, 0, 0)
+
+_offset_table = None
+
+
+def pixel_offset_table():
+    """Return a (192, 32) array of pixel-data offsets, one per scan line
+    and byte column (the 6144-entry screen permutation), built once."""
+    global _offset_table
+    if _offset_table is None:
+        _offset_table = np.array(
+            [[scr_pixel_offset(x_byte, y) for x_byte in range(SCR_COLS)]
+             for y in range(SCR_HEIGHT_PX)], dtype=np.intp)
+    return _offset_table
+
+
+def decode_bitmap(pixel_data: bytes):
+    """Vectorised decode_pixels(): a (192, 256) uint8 array of 0/1."""
+    raw = np.frombuffer(pixel_data, dtype=np.uint8, count=PIXEL_SIZE)
+    return np.unpackbits(raw[pixel_offset_table()], axis=1)
+
+
+def _cell_overlay_mask(cells) -> "np.ndarray":
+    """Expand a (24, 32) bool array to a (192, 256) mask of the outer
+    ring of pixels of each selected cell."""
+    edge = np.zeros((8, 8), dtype=bool)
+    edge[[0, -1], :] = True
+    edge[:, [0, -1]] = True
+    mask = cells[:, None, :, None] & edge[None, :, None, :]
+    return mask.reshape(SCR_HEIGHT_PX, SCR_WIDTH_PX)
+
+
+def screen_rgb(
+    pixels,
+    attr_data: bytes,
+    *,
+    attr_only: bool = False,
+    grid: bool = False,
+    clash_cells: set[tuple[int, int]] | None = None,
+    flash_phase: bool = False,
+):
+    """Resolve every pixel to its RGB colour, with overlays applied.
+
+    pixels is the decoded bitmap (decode_bitmap or decode_pixels). With
+    NumPy the result is a (192, 256, 3) uint8 array built by broadcasting
+    each cell's ink/paper colour over its 8x8 pixels; otherwise a list of
+    rows of (r, g, b) tuples. All renderers take this as their input.
+
+    flash_phase selects the inverted half of the FLASH cycle: cells with
+    the FLASH bit set are drawn with ink and paper swapped.
+    """
+    if flash_phase:
+        attr_data = flash_swap(attr_data)
+    if np is None:
+        return _screen_rgb_lists(pixels, attr_data, attr_only=attr_only,
+                                 grid=grid, clash_cells=clash_cells)
+
+    table = np.array(ZX_PALETTE, dtype=np.uint8).reshape(16, 3)
+    attrs = np.frombuffer(attr_data, dtype=np.uint8, count=ATTR_SIZE)
+    attrs = attrs.reshape(SCR_ROWS, SCR_COLS)
+    bright = (attrs >> 6) & 1
+    ink_rgb = table[bright * 8 + (attrs & 7)]
+    paper_rgb = table[bright * 8 + ((attrs >> 3) & 7)]
+
+    if attr_only:
+        bits = np.zeros((SCR_HEIGHT_PX, SCR_WIDTH_PX), dtype=bool)
+        bits[:, (np.arange(SCR_WIDTH_PX) % 8) < 4] = True
+    else:
+        bits = np.asarray(pixels, dtype=bool)
+    cells = bits.reshape(SCR_ROWS, 8, SCR_COLS, 8, 1)
+    rgb = np.where(cells, ink_rgb[:, None, :, None, :],
+                   paper_rgb[:, None, :, None, :])
+    rgb = rgb.reshape(SCR_HEIGHT_PX, SCR_WIDTH_PX, 3)
+
+    if grid:
+        rgb[::8, :] = GRID_RGB
+        rgb[:, ::8] = GRID_RGB
+    if clash_cells:
+        selected = np.zeros((SCR_ROWS, SCR_COLS), dtype=bool)
+        rows, cols = zip(*clash_cells)
+        selected[list(rows), list(cols)] = True
+        rgb[_cell_overlay_mask(selected)] = CLASH_RGB
+    return rgb
+
+
+def flash_swap(attr_data: bytes) -> bytes:
+    """Return attributes with ink and paper swapped in FLASH cells, as
+    the ULA displays them every other 16 frames."""
+    out = bytearray(attr_data)
+    for i, a in enumerate(out):
+        if a & 0x80:
+            out[i] = (a & 0xC0) | ((a & 0x07) << 3) | ((a >> 3) & 0x07)
+    return bytes(out)
+
+
+def _screen_rgb_lists(
+    pixels: list[list[int]],
+    attr_data: bytes,
+    *,
+    attr_only: bool,
+    grid: bool,
+    clash_cells: set[tuple[int, int]] | None,
+) -> list[list[tuple[int, int, int]]]:
+    """Per-pixel screen_rgb() used when NumPy is not installed."""
+    rows: list[list[tuple[int, int, int]]] = []
+    for y in range(SCR_HEIGHT_PX):
+        row: list[tuple[int, int, int]] = []
+        for x in range(SCR_WIDTH_PX):
+            if attr_only:
+                c = pixel_colour_attr_only(attr_data, x, y)
+            else:
+                c = pixel_colour(pixels, attr_data, x, y)
+
+            if grid and (x % 8 == 0 or y % 8 == 0):
+                c = GRID_RGB
+
+            if clash_cells and (y // 8, x // 8) in clash_cells:
+                if x % 8 == 0 or x % 8 == 7 or y % 8 == 0 or y % 8 == 7:
+                    c = CLASH_RGB
+
+            row.append(c)
+        rows.append(row)
+    return rows
+
+
+def _rgb_rows(rgb) -> list[list[tuple[int, int, int]]]:
+    """Screen colours as rows of (r, g, b) tuples for per-pixel writers."""
+    if np is not None and isinstance(rgb, np.ndarray):
+        return [list(map(tuple, row)) for row in rgb.tolist()]
+    return rgb
+
+
 # ── ANSI terminal output ─────────────────────────────────────────────
 
 def ansi_fg_bg(fg: tuple[int, int, int], bg: tuple[int, int, int]) -> str:
@@ -168,147 +327,332 @@ def ansi_bg(colour: tuple[int, int, int]) -> str:
 ANSI_RESET = "\033[0m"
 UPPER_HALF = "\u2580"  # upper half block
 
+ANSI_DEPTHS = (24, 256)
+CUBE_LEVELS = (0, 95, 135, 175, 215, 255)  # xterm 6x6x6 colour cube
+
+FG = 38
+BG = 48
+
+# (colour key, FG/BG, depth) -> escape string. The ZX palette has only
+# 15 distinct colours, so this fills up after the first few rows.
+_sgr_cache: dict[tuple[int, int, int], str] = {}
+
+
+def xterm256_index(r: int, g: int, b: int) -> int:
+    """Nearest xterm 256-colour index (colour cube or grey ramp).
+
+    Every ZX palette level (0, 215, 255) sits exactly on the cube.
+    """
+    def level(v: int) -> int:
+        return min(range(6), key=lambda i: abs(CUBE_LEVELS[i] - v))
+
+    ri, gi, bi = level(r), level(g), level(b)
+    cube = (CUBE_LEVELS[ri], CUBE_LEVELS[gi], CUBE_LEVELS[bi])
+    grey_i = min(23, max(0, (r + g + b) // 3 - 3) // 10)
+    grey = 8 + grey_i * 10
+
+    def dist(c: tuple[int, int, int]) -> int:
+        return (c[0] - r) ** 2 + (c[1] - g) ** 2 + (c[2] - b) ** 2
+
+    if dist((grey, grey, grey)) < dist(cube):
+        return 232 + grey_i
+    return 16 + 36 * ri + 6 * gi + bi
+
+
+def ansi_sgr(key: int, layer: int, depth: int = 24) -> str:
+    """Cached escape selecting colour key (0xRRGGBB) as FG or BG."""
+    sgr = _sgr_cache.get((key, layer, depth))
+    if sgr is None:
+        r, g, b = key >> 16, (key >> 8) & 0xFF, key & 0xFF
+        if depth == 256:
+            sgr = f"\033[{layer};5;{xterm256_index(r, g, b)}m"
+        else:
+            sgr = f"\033[{layer};2;{r};{g};{b}m"
+        _sgr_cache[key, layer, depth] = sgr
+    return sgr
+
+
+def _colour_key(colour: tuple[int, int, int]) -> int:
+    return (colour[0] << 16) | (colour[1] << 8) | colour[2]
+
+
+def ansi_runs(rgb) -> list[list[tuple[int, int, int]]]:
+    """Split screen colours into half-block runs, one list per terminal row.
+
+    Each run is (fg_key, bg_key, length): length adjacent columns whose
+    upper pixel is fg and lower pixel is bg, as 0xRRGGBB keys. Works on
+    any even-height block, not just the full screen.
+    """
+    if np is not None and isinstance(rgb, np.ndarray):
+        keys = ((rgb[..., 0].astype(np.int32) << 16)
+                | (rgb[..., 1].astype(np.int32) << 8) | rgb[..., 2])
+        top, bot = keys[0::2], keys[1::2]
+        height, width = top.shape
+        starts = np.ones(top.shape, dtype=bool)
+        starts[:, 1:] = (top[:, 1:] != top[:, :-1]) | (bot[:, 1:] != bot[:, :-1])
+        rows, cols = np.nonzero(starts)
+        ends = np.append(cols[1:], width)
+        ends[np.append(rows[1:] != rows[:-1], True)] = width
+        runs = zip(top[rows, cols].tolist(), bot[rows, cols].tolist(),
+                   (ends - cols).tolist())
+        counts = np.bincount(rows, minlength=height).tolist()
+        return [[next(runs) for _ in range(n)] for n in counts]
+
+    out: list[list[tuple[int, int, int]]] = []
+    for y in range(0, len(rgb), 2):
+        row: list[tuple[int, int, int]] = []
+        prev = None
+        for fg, bg in zip(rgb[y], rgb[y + 1]):
+            if (fg, bg) == prev:
+                fg_key, bg_key, n = row[-1]
+                row[-1] = (fg_key, bg_key, n + 1)
+            else:
+                row.append((_colour_key(fg), _colour_key(bg), 1))
+                prev = (fg, bg)
+        out.append(row)
+    return out
+
+
+def ansi_row(runs: list[tuple[int, int, int]], depth: int = 24) -> str:
+    """Encode one row of runs, emitting an escape only when the colour
+    actually changes.
+
+    Solid runs (fg == bg) are drawn as spaces so they only need the
+    background, which often lets the foreground carry across them.
+    """
+    parts: list[str] = []
+    cur_fg = cur_bg = None
+    for fg, bg, n in runs:
+        bg_sgr = ansi_sgr(bg, BG, depth)
+        if bg_sgr != cur_bg:
+            parts.append(bg_sgr)
+            cur_bg = bg_sgr
+        if fg == bg:
+            parts.append(" " * n)
+            continue
+        fg_sgr = ansi_sgr(fg, FG, depth)
+        if fg_sgr != cur_fg:
+            parts.append(fg_sgr)
+            cur_fg = fg_sgr
+        parts.append(UPPER_HALF * n)
+    return "".join(parts)
+
 
 def render_ansi(
-    pixels: list[list[int]],
-    attr_data: bytes,
+    rgb,
     *,
-    attr_only: bool = False,
-    grid: bool = False,
-    clash_cells: set[tuple[int, int]] | None = None,
     border: int = 0,
+    depth: int = 24,
 ) -> str:
-    """Render screen to ANSI string using half-block characters.
+    """Render screen colours (see screen_rgb) to an ANSI string using
+    half-block characters.
 
     Each terminal character cell represents 2 vertical pixels:
       - Upper pixel colour as foreground (via UPPER_HALF char)
       - Lower pixel colour as background
 
+    Runs of identical columns share one escape; depth=256 selects the
+    xterm 256-colour palette for terminals without true colour.
+
     Output: 256 chars wide, 96 rows tall (plus optional border).
     """
     lines: list[str] = []
-    border_rgb = ZX_PALETTE[0][border & 7]
+    border_sgr = ansi_sgr(_colour_key(ZX_PALETTE[0][border & 7]), BG, depth)
 
     # Optional top border (2 rows = 1 terminal line)
     if border:
-        border_line = ansi_bg(border_rgb) + " " * (SCR_WIDTH_PX + 4) + ANSI_RESET
+        border_line = border_sgr + " " * (SCR_WIDTH_PX + 4) + ANSI_RESET
         lines.append(border_line)
 
-    for term_row in range(SCR_HEIGHT_PX // 2):
-        y_top = term_row * 2
-        y_bot = y_top + 1
-        parts: list[str] = []
-
+    for runs in ansi_runs(rgb):
+        row = ansi_row(runs, depth) + ANSI_RESET
         if border:
-            parts.append(ansi_bg(border_rgb) + "  ")
+            row = border_sgr + "  " + row + border_sgr + "  " + ANSI_RESET
+        lines.append(row)
 
-        prev_fg: tuple[int, int, int] | None = None
-        prev_bg: tuple[int, int, int] | None = None
+    # Optional bottom border
+    if border:
+        lines.append(border_line)
 
-        for x in range(SCR_WIDTH_PX):
-            if attr_only:
-                fg = pixel_colour_attr_only(attr_data, x, y_top)
-                bg = pixel_colour_attr_only(attr_data, x, y_bot)
-            else:
-                fg = pixel_colour(pixels, attr_data, x, y_top)
-                bg = pixel_colour(pixels, attr_data, x, y_bot)
-
-            # Grid overlay: draw white lines on cell boundaries
-            if grid:
-                if x % 8 == 0 or y_top % 8 == 0:
-                    fg = (128, 128, 128)
-                if x % 8 == 0 or y_bot % 8 == 0:
-                    bg = (128, 128, 128)
-
-            # Clash overlay: red border on clashing cells
-            if clash_cells:
-                char_row = y_top // 8
-                char_col = x // 8
-                if (char_row, char_col) in clash_cells:
-                    on_edge = (
-                        x % 8 == 0 or x % 8 == 7
-                        or y_top % 8 == 0 or y_bot % 8 == 7
-                    )
-                    if on_edge:
-                        fg = (255, 0, 0)
-                        bg = (255, 0, 0)
-
-            # Only emit escape if colour changed
-            if fg != prev_fg or bg != prev_bg:
-                parts.append(ansi_fg_bg(fg, bg))
-                prev_fg = fg
-                prev_bg = bg
-
-            parts.append(UPPER_HALF)
+    return "\n".join(lines)
 
-        parts.append(ANSI_RESET)
 
-        if border:
-            parts.append(ansi_bg(border_rgb) + "  " + ANSI_RESET)
+# ── Animated playback ─────────────────────────────────────────────────
 
-        lines.append("".join(parts))
+FLASH_FRAMES = 16  # ULA toggles the FLASH phase every 16 frames
+FRAME_RATE = 50    # PAL frames per second
 
-    # Optional bottom border
-    if border:
-        border_line = ansi_bg(border_rgb) + " " * (SCR_WIDTH_PX + 4) + ANSI_RESET
-        lines.append(border_line)
+CURSOR_HIDE = "\033[?25l"
+CURSOR_SHOW = "\033[?25h"
+CLEAR_SCREEN = "\033[2J"
 
-    return "\n".join(lines)
+
+def load_scr_frames(path: str) -> list[tuple[bytes, bytes]]:
+    """Load a sequence of screens as (pixel_data, attr_data) pairs.
+
+    path may be a directory of .scr files (taken in name order) or one
+    file holding one or more concatenated 6912-byte screens, such as a
+    ring-buffer dump.
+    """
+    filepath = Path(path)
+    if filepath.is_dir():
+        files = sorted(filepath.glob("*.scr"))
+        if not files:
+            print(f"Error: no .scr files in {path}", file=sys.stderr)
+            sys.exit(1)
+        return [load_scr(str(f)) for f in files]
+
+    if not filepath.exists():
+        print(f"Error: file not found: {path}", file=sys.stderr)
+        sys.exit(1)
+    data = memoryview(filepath.read_bytes())
+    if len(data) == PIXEL_SIZE:
+        return [load_scr(path)]
+    if not data or len(data) % SCR_SIZE:
+        print(
+            f"Error: invalid stream size {len(data)} bytes. "
+            f"Expected a multiple of {SCR_SIZE}.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    return [
+        (bytes(data[i:i + PIXEL_SIZE]), bytes(data[i + PIXEL_SIZE:i + SCR_SIZE]))
+        for i in range(0, len(data), SCR_SIZE)
+    ]
+
+
+def _changed_cells(prev, cur) -> list[tuple[int, int]]:
+    """(char_row, char_col) of every 8x8 cell whose colours differ."""
+    if np is not None and isinstance(cur, np.ndarray):
+        diff = (prev != cur).reshape(SCR_ROWS, 8, SCR_COLS, 8, 3)
+        rows, cols = np.nonzero(diff.any(axis=(1, 3, 4)))
+        return list(zip(rows.tolist(), cols.tolist()))
+    changed: list[tuple[int, int]] = []
+    for char_row in range(SCR_ROWS):
+        y0 = char_row * 8
+        for char_col in range(SCR_COLS):
+            x0 = char_col * 8
+            if any(prev[y][x0:x0 + 8] != cur[y][x0:x0 + 8]
+                   for y in range(y0, y0 + 8)):
+                changed.append((char_row, char_col))
+    return changed
+
+
+def render_ansi_cells(
+    rgb,
+    cells: list[tuple[int, int]],
+    *,
+    border: int = 0,
+    depth: int = 24,
+) -> str:
+    """Redraw only the given character cells of a screen already shown by
+    render_ansi at the top-left of the terminal, using cursor-positioning
+    escapes. Each cell covers 8 columns and 4 terminal rows."""
+    top = 2 if border else 1
+    left = 3 if border else 1
+    parts: list[str] = []
+    for char_row, char_col in cells:
+        y0 = char_row * 8
+        x0 = char_col * 8
+        if np is not None and isinstance(rgb, np.ndarray):
+            block = rgb[y0:y0 + 8, x0:x0 + 8]
+        else:
+            block = [row[x0:x0 + 8] for row in rgb[y0:y0 + 8]]
+        for term, runs in enumerate(ansi_runs(block)):
+            parts.append(f"\033[{top + char_row * 4 + term};{left + x0}H")
+            parts.append(ansi_row(runs, depth))
+    if parts:
+        parts.append(ANSI_RESET)
+    return "".join(parts)
+
+
+def play_ansi(
+    frames: list[tuple[bytes, bytes]],
+    *,
+    fps: float = FRAME_RATE,
+    loop: bool = False,
+    border: int = 0,
+    attr_only: bool = False,
+    depth: int = 24,
+    out=None,
+) -> None:
+    """Play a screen sequence in the terminal.
+
+    The first frame is drawn in full; after that only cells whose colours
+    changed (new data or a FLASH phase flip) are redrawn. Frames are paced
+    against the monotonic clock, so slow terminals drop time, not sync.
+    """
+    out = out or sys.stdout
+    decode = decode_bitmap if np is not None else decode_pixels
+    frame_time = 1.0 / fps if fps > 0 else 0.0
+    prev = None
+    tick = 0
+    out.write(CURSOR_HIDE + CLEAR_SCREEN)
+    try:
+        deadline = time.monotonic()
+        while True:
+            for pixel_data, attr_data in frames:
+                flash_phase = (tick // FLASH_FRAMES) % 2 == 1
+                rgb = screen_rgb(decode(pixel_data), attr_data,
+                                 attr_only=attr_only, flash_phase=flash_phase)
+                if prev is None:
+                    out.write("\033[H" + render_ansi(rgb, border=border,
+                                                      depth=depth))
+                else:
+                    out.write(render_ansi_cells(rgb, _changed_cells(prev, rgb),
+                                                border=border, depth=depth))
+                out.flush()
+                prev = rgb
+                tick += 1
+
+                deadline += frame_time
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            if not loop:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        rows = SCR_HEIGHT_PX // 2 + (3 if border else 1)
+        out.write(f"{ANSI_RESET}\033[{rows};1H{CURSOR_SHOW}\n")
+        out.flush()
 
 
 # ── HTML / SVG output ─────────────────────────────────────────────────
 
-def _try_png_html(
-    pixels: list[list[int]],
-    attr_data: bytes,
+def render_png(
+    rgb,
     *,
-    attr_only: bool,
-    grid: bool,
-    clash_cells: set[tuple[int, int]] | None,
-    border: int,
-    scale: int,
-) -> str | None:
-    """Try to generate HTML with embedded PNG using PIL. Returns None if unavailable."""
+    border: int = 0,
+    scale: int = 1,
+) -> bytes | None:
+    """Encode screen colours (see screen_rgb) as PNG bytes using PIL.
+
+    The screen is handed to PIL as one RGB buffer, pasted onto a border
+    fill and scaled with a single resize. Returns None if PIL is not
+    installed.
+    """
     try:
         from PIL import Image  # type: ignore[import-untyped]
     except ImportError:
         return None
 
-    import base64
+    if np is not None and isinstance(rgb, np.ndarray):
+        raw = np.ascontiguousarray(rgb, dtype=np.uint8).tobytes()
+    else:
+        raw = b"".join(bytes(c) for row in rgb for c in row)
+    screen = Image.frombuffer("RGB", (SCR_WIDTH_PX, SCR_HEIGHT_PX), raw,
+                              "raw", "RGB", 0, 1)
 
     border_px = 16 if border else 0
     img_w = SCR_WIDTH_PX + 2 * border_px
     img_h = SCR_HEIGHT_PX + 2 * border_px
-    img = Image.new("RGB", (img_w, img_h))
-    put = img.putpixel
-
-    border_rgb = ZX_PALETTE[0][border & 7]
-
-    # Fill border
     if border_px:
-        for y in range(img_h):
-            for x in range(img_w):
-                put((x, y), border_rgb)
-
-    # Draw pixels
-    for y in range(SCR_HEIGHT_PX):
-        for x in range(SCR_WIDTH_PX):
-            if attr_only:
-                c = pixel_colour_attr_only(attr_data, x, y)
-            else:
-                c = pixel_colour(pixels, attr_data, x, y)
-
-            if grid and (x % 8 == 0 or y % 8 == 0):
-                c = (128, 128, 128)
-
-            if clash_cells:
-                char_row = y // 8
-                char_col = x // 8
-                if (char_row, char_col) in clash_cells:
-                    if x % 8 == 0 or x % 8 == 7 or y % 8 == 0 or y % 8 == 7:
-                        c = (255, 0, 0)
-
-            put((border_px + x, border_px + y), c)
+        img = Image.new("RGB", (img_w, img_h), ZX_PALETTE[0][border & 7])
+        img.paste(screen, (border_px, border_px))
+    else:
+        img = screen
 
     # Scale up
     if scale > 1:
@@ -316,7 +660,26 @@ def _try_png_html(
 
     buf = io.BytesIO()
     img.save(buf, format="PNG")
-    b64 = base64.b64encode(buf.getvalue()).decode("ascii")
+    return buf.getvalue()
+
+
+def _try_png_html(
+    rgb,
+    *,
+    border: int,
+    scale: int,
+) -> str | None:
+    """Try to generate HTML with embedded PNG using PIL. Returns None if unavailable."""
+    import base64
+
+    png = render_png(rgb, border=border, scale=scale)
+    if png is None:
+        return None
+
+    border_px = 16 if border else 0
+    img_w = SCR_WIDTH_PX + 2 * border_px
+    img_h = SCR_HEIGHT_PX + 2 * border_px
+    b64 = base64.b64encode(png).decode("ascii")
 
     return _html_wrapper(
         f'<img src="data:image/png;base64,{b64}" '
@@ -326,12 +689,8 @@ def _try_png_html(
 
 
 def _svg_html(
-    pixels: list[list[int]],
-    attr_data: bytes,
+    rgb,
     *,
-    attr_only: bool,
-    grid: bool,
-    clash_cells: set[tuple[int, int]] | None,
     border: int,
     scale: int,
 ) -> str:
@@ -360,45 +719,15 @@ def _svg_html(
 
     # Build colour map: group adjacent same-colour pixels into runs
     # This reduces SVG size dramatically compared to one rect per pixel
-    for y in range(SCR_HEIGHT_PX):
+    for y, row in enumerate(_rgb_rows(rgb)):
         x = 0
         while x < SCR_WIDTH_PX:
-            if attr_only:
-                c = pixel_colour_attr_only(attr_data, x, y)
-            else:
-                c = pixel_colour(pixels, attr_data, x, y)
-
-            if grid and (x % 8 == 0 or y % 8 == 0):
-                c = (128, 128, 128)
-
-            if clash_cells:
-                char_row = y // 8
-                char_col = x // 8
-                if (char_row, char_col) in clash_cells:
-                    if x % 8 == 0 or x % 8 == 7 or y % 8 == 0 or y % 8 == 7:
-                        c = (255, 0, 0)
+            c = row[x]
 
             # Run-length: find consecutive pixels with the same colour
             run_start = x
             x += 1
-            while x < SCR_WIDTH_PX:
-                if attr_only:
-                    nc = pixel_colour_attr_only(attr_data, x, y)
-                else:
-                    nc = pixel_colour(pixels, attr_data, x, y)
-
-                if grid and (x % 8 == 0 or y % 8 == 0):
-                    nc = (128, 128, 128)
-
-                if clash_cells:
-                    cr2 = y // 8
-                    cc2 = x // 8
-                    if (cr2, cc2) in clash_cells:
-                        if x % 8 == 0 or x % 8 == 7 or y % 8 == 0 or y % 8 == 7:
-                            nc = (255, 0, 0)
-
-                if nc != c:
-                    break
+            while x < SCR_WIDTH_PX and row[x] == c:
                 x += 1
 
             run_len = x - run_start
@@ -434,125 +763,215 @@ def _html_wrapper(body_content: str) -> str:
 
 
 def render_html(
-    pixels: list[list[int]],
-    attr_data: bytes,
+    rgb,
     *,
-    attr_only: bool = False,
-    grid: bool = False,
-    clash_cells: set[tuple[int, int]] | None = None,
     border: int = 0,
     scale: int = 3,
 ) -> str:
-    """Render screen as HTML. Uses PIL/PNG if available, SVG otherwise."""
-    result = _try_png_html(
-        pixels, attr_data,
-        attr_only=attr_only, grid=grid, clash_cells=clash_cells,
-        border=border, scale=scale,
-    )
+    """Render screen colours (see screen_rgb) as HTML.
+    Uses PIL/PNG if available, SVG otherwise."""
+    result = _try_png_html(rgb, border=border, scale=scale)
     if result is not None:
         return result
 
-    return _svg_html(
-        pixels, attr_data,
-        attr_only=attr_only, grid=grid, clash_cells=clash_cells,
-        border=border, scale=scale,
-    )
+    return _svg_html(rgb, border=border, scale=scale)
 
 
 # ── Analysis ──────────────────────────────────────────────────────────
 
-def find_clash_cells(
-    pixels: list[list[int]],
-    attr_data: bytes,
-) -> set[tuple[int, int]]:
-    """Find character cells that have 3+ distinct foreground pixel patterns.
-
-    In a normal ZX Spectrum cell, there are exactly 2 colours (ink + paper).
-    A 'clash' cell has pixels set with ink colour but the attr allows only one
-    ink. The practical definition: count unique non-zero pixel byte values
-    per cell; if a cell has ink pixels that would need different colours, it
-    is 'clashing'. However, .scr doesn't store intended colours per pixel --
-    all ink pixels share one colour. So true clash detection is about checking
-    if the original artist used more than the available 2 colours.
-
-    Simplified approach: count unique pixel byte patterns per 8x8 cell.
-    If a cell has more than 2 distinct row-byte values (excluding all-0 and
-    all-1 which are just paper/ink fills), mark it as complex/potentially
-    clashing. This is a heuristic.
-
-    More practical: mark cells where ink == paper (invisible pixels) as a
-    different kind of issue, or cells that look like they might have needed
-    more colours.
-
-    Actually, the most useful 'clash' in practice: mark cells where the
-    attribute's ink == paper (content invisible), or where flash is set.
-
-    Let's use a definition that's most useful for artists: cells with high
-    pixel complexity (many distinct byte patterns) that would be hard to
-    draw within the 2-colour-per-cell limit.
+POPCOUNT = bytes(bin(i).count("1") for i in range(256))
+
+# Ink pixels per cell, bucketed for the coverage histogram
+COVERAGE_BUCKETS = (
+    ("empty", 0, 0), ("1-16", 1, 16), ("17-32", 17, 32),
+    ("33-48", 33, 48), ("49-63", 49, 63), ("full", 64, 64),
+)
+
+
+def cell_bytes(pixel_data: bytes):
+    """The 8 pixel bytes of each character cell, top to bottom.
+
+    With NumPy this is a (24, 32, 8) uint8 view gathered through the
+    screen permutation; otherwise a 24x32 grid of 8-byte bytes objects.
     """
-    clash: set[tuple[int, int]] = set()
-    for char_row in range(SCR_ROWS):
-        for char_col in range(SCR_COLS):
-            # Collect the 8 pixel bytes for this cell
-            patterns: set[int] = set()
-            for scan in range(8):
-                y = char_row * 8 + scan
-                offset = scr_pixel_offset(char_col, y)
-                patterns.add(pixels[y][char_col * 8] << 7
-                             | pixels[y][char_col * 8 + 1] << 6
-                             | pixels[y][char_col * 8 + 2] << 5
-                             | pixels[y][char_col * 8 + 3] << 4
-                             | pixels[y][char_col * 8 + 4] << 3
-                             | pixels[y][char_col * 8 + 5] << 2
-                             | pixels[y][char_col * 8 + 6] << 1
-                             | pixels[y][char_col * 8 + 7])
-            # Remove trivial patterns (all ink or all paper)
-            patterns.discard(0x00)
-            patterns.discard(0xFF)
-            # If 3+ distinct non-trivial patterns, mark as complex
-            if len(patterns) >= 6:
-                clash.add((char_row, char_col))
-    return clash
+    if np is not None:
+        raw = np.frombuffer(pixel_data, dtype=np.uint8, count=PIXEL_SIZE)
+        rows = raw[pixel_offset_table()].reshape(SCR_ROWS, 8, SCR_COLS)
+        return rows.transpose(0, 2, 1)
+    return [
+        [bytes(pixel_data[scr_pixel_offset(col, row * 8 + scan)]
+               for scan in range(8))
+         for col in range(SCR_COLS)]
+        for row in range(SCR_ROWS)
+    ]
+
+
+def cell_ink_counts(cells):
+    """Set (ink) pixels per cell, 0-64, as a (24, 32) grid."""
+    if np is not None and isinstance(cells, np.ndarray):
+        return np.unpackbits(cells, axis=2).sum(axis=2, dtype=np.int32)
+    return [[sum(POPCOUNT[b] for b in cell) for cell in row] for row in cells]
+
+
+def cell_pattern_counts(cells):
+    """Distinct row bytes per cell, not counting all-paper (0x00) and
+    all-ink (0xFF) rows, as a (24, 32) grid."""
+    if np is not None and isinstance(cells, np.ndarray):
+        ordered = np.sort(cells, axis=2)
+        distinct = 1 + np.count_nonzero(ordered[..., 1:] != ordered[..., :-1],
+                                        axis=2)
+        distinct -= ordered[..., 0] == 0x00
+        distinct -= ordered[..., -1] == 0xFF
+        return distinct
+    return [[len(set(cell) - {0x00, 0xFF}) for cell in row] for row in cells]
+
+
+def find_clash_cells(cells) -> set[tuple[int, int]]:
+    """Find character cells with high pixel complexity.
+
+    A .scr can't show clash directly -- every ink pixel in a cell shares
+    one colour -- so this flags the cells an artist is most likely to be
+    fighting the 2-colour limit in: those with 6+ distinct non-trivial
+    row bytes. cells is the cell_bytes() view.
+    """
+    counts = cell_pattern_counts(cells)
+    if np is not None and isinstance(counts, np.ndarray):
+        rows, cols = np.nonzero(counts >= 6)
+        return set(zip(rows.tolist(), cols.tolist()))
+    return {(r, c) for r, row in enumerate(counts)
+            for c, n in enumerate(row) if n >= 6}
+
+
+class ScreenStats(NamedTuple):
+    """Attribute and pixel statistics for one screen (see screen_stats)."""
+    unique_attrs: int
+    attr_entropy: float          # bits per attribute byte
+    flash: int
+    bright: int
+    ink_usage: list[int]         # cells per ink colour 0-7
+    paper_usage: list[int]       # cells per paper colour 0-7
+    ink_pixels: int
+    third_pixels: list[int]      # set pixels in each screen third
+    coverage: list[int]          # cells per COVERAGE_BUCKETS entry
+    complex_cells: int
+    empty_cells: int             # no ink pixels
+    full_cells: int              # every pixel ink
+    same_colour_cells: int       # ink == paper, pixels invisible
+    solid_cells: int             # one visible colour: any of the above
+    solid_dirty: int             # ...whose pixel bytes are not all zero
+
+
+def _entropy(counts) -> float:
+    total = sum(counts)
+    return -sum(n / total * math.log2(n / total) for n in counts if n)
+
+
+def screen_stats(pixel_data: bytes, attr_data: bytes) -> ScreenStats:
+    """Compute ScreenStats from raw screen data.
+
+    Solid cells show a single colour, so they can be stored as an
+    attribute with zero pixel bytes (paper set to the visible colour);
+    solid_dirty counts those a compressor would gain from rewriting.
+    """
+    cells = cell_bytes(pixel_data)
+    ink_counts = cell_ink_counts(cells)
+    complex_cells = len(find_clash_cells(cells))
+
+    if np is not None:
+        attrs = np.frombuffer(attr_data, dtype=np.uint8,
+                              count=ATTR_SIZE).reshape(SCR_ROWS, SCR_COLS)
+        ink, paper = attrs & 7, (attrs >> 3) & 7
+        empty = ink_counts == 0
+        full = ink_counts == 64
+        same = ink == paper
+        solid = empty | full | same
+        dirty = solid & cells.any(axis=2)
+        buckets = np.digitize(ink_counts, [lo for _, lo, _ in COVERAGE_BUCKETS[1:]])
+        return ScreenStats(
+            unique_attrs=len(np.unique(attrs)),
+            attr_entropy=_entropy(np.bincount(attrs.ravel()).tolist()),
+            flash=int(np.count_nonzero(attrs & 0x80)),
+            bright=int(np.count_nonzero(attrs & 0x40)),
+            ink_usage=np.bincount(ink.ravel(), minlength=8).tolist(),
+            paper_usage=np.bincount(paper.ravel(), minlength=8).tolist(),
+            ink_pixels=int(ink_counts.sum()),
+            third_pixels=ink_counts.reshape(3, -1).sum(axis=1).tolist(),
+            coverage=np.bincount(buckets.ravel(),
+                                 minlength=len(COVERAGE_BUCKETS)).tolist(),
+            complex_cells=complex_cells,
+            empty_cells=int(np.count_nonzero(empty)),
+            full_cells=int(np.count_nonzero(full)),
+            same_colour_cells=int(np.count_nonzero(same)),
+            solid_cells=int(np.count_nonzero(solid)),
+            solid_dirty=int(np.count_nonzero(dirty)),
+        )
+
+    attr_counts = [0] * 256
+    ink_usage = [0] * 8
+    paper_usage = [0] * 8
+    coverage = [0] * len(COVERAGE_BUCKETS)
+    third_pixels = [0, 0, 0]
+    flash = bright = empty = full = same = solid = dirty = 0
+    for row in range(SCR_ROWS):
+        for col in range(SCR_COLS):
+            attr_byte = attr_data[row * SCR_COLS + col]
+            ink, paper, is_bright, is_flash = decode_attr(attr_byte)
+            attr_counts[attr_byte] += 1
+            ink_usage[ink] += 1
+            paper_usage[paper] += 1
+            flash += is_flash
+            bright += is_bright
+            n = ink_counts[row][col]
+            third_pixels[row // 8] += n
+            for i, (_, lo, hi) in enumerate(COVERAGE_BUCKETS):
+                if lo <= n <= hi:
+                    coverage[i] += 1
+            empty += n == 0
+            full += n == 64
+            same += ink == paper
+            if n in (0, 64) or ink == paper:
+                solid += 1
+                dirty += any(cells[row][col])
+    return ScreenStats(
+        unique_attrs=sum(1 for n in attr_counts if n),
+        attr_entropy=_entropy(attr_counts),
+        flash=flash,
+        bright=bright,
+        ink_usage=ink_usage,
+        paper_usage=paper_usage,
+        ink_pixels=sum(third_pixels),
+        third_pixels=third_pixels,
+        coverage=coverage,
+        complex_cells=complex_cells,
+        empty_cells=empty,
+        full_cells=full,
+        same_colour_cells=same,
+        solid_cells=solid,
+        solid_dirty=dirty,
+    )
 
 
 def screen_info(
-    pixels: list[list[int]],
+    pixel_data: bytes,
     attr_data: bytes,
 ) -> str:
     """Generate statistics about the screen."""
+    stats = screen_stats(pixel_data, attr_data)
+    total_cells = SCR_ROWS * SCR_COLS
     lines: list[str] = []
     lines.append("Screen Statistics")
     lines.append("=" * 40)
 
-    # Count attribute properties
-    flash_count = 0
-    bright_count = 0
-    ink_usage: dict[int, int] = {}
-    paper_usage: dict[int, int] = {}
-    unique_attrs: set[int] = set()
-
-    for i in range(ATTR_SIZE):
-        attr_byte = attr_data[i]
-        unique_attrs.add(attr_byte)
-        ink, paper, bright, flash = decode_attr(attr_byte)
-
-        ink_usage[ink] = ink_usage.get(ink, 0) + 1
-        paper_usage[paper] = paper_usage.get(paper, 0) + 1
-        if flash:
-            flash_count += 1
-        if bright:
-            bright_count += 1
-
-    lines.append(f"Total cells:         {SCR_ROWS * SCR_COLS} ({SCR_ROWS}x{SCR_COLS})")
-    lines.append(f"Unique attr values:  {len(unique_attrs)}")
-    lines.append(f"Flash cells:         {flash_count}")
-    lines.append(f"Bright cells:        {bright_count}")
+    lines.append(f"Total cells:         {total_cells} ({SCR_ROWS}x{SCR_COLS})")
+    lines.append(f"Unique attr values:  {stats.unique_attrs}")
+    lines.append(f"Attr entropy:        {stats.attr_entropy:.2f} bits/cell")
+    lines.append(f"Flash cells:         {stats.flash}")
+    lines.append(f"Bright cells:        {stats.bright}")
     lines.append("")
 
     lines.append("Ink colour usage:")
     for c in range(8):
-        count = ink_usage.get(c, 0)
+        count = stats.ink_usage[c]
         if count:
             bar = "#" * min(count // 10, 40)
             lines.append(f"  {c} {COLOUR_NAMES[c]:>8s}: {count:4d} {bar}")
@@ -560,50 +979,507 @@ def screen_info(
     lines.append("")
     lines.append("Paper colour usage:")
     for c in range(8):
-        count = paper_usage.get(c, 0)
+        count = stats.paper_usage[c]
         if count:
             bar = "#" * min(count // 10, 40)
             lines.append(f"  {c} {COLOUR_NAMES[c]:>8s}: {count:4d} {bar}")
 
     # Pixel density
-    total_set = sum(sum(row) for row in pixels)
+    total_set = stats.ink_pixels
     total_pixels = SCR_WIDTH_PX * SCR_HEIGHT_PX
     lines.append("")
     lines.append(f"Pixel density:       {total_set}/{total_pixels} "
                  f"({100.0 * total_set / total_pixels:.1f}%)")
 
     # Per-third density
-    for third in range(3):
-        y_start = third * 64
-        y_end = y_start + 64
-        third_set = sum(sum(row) for row in pixels[y_start:y_end])
-        third_total = 64 * SCR_WIDTH_PX
+    third_total = 64 * SCR_WIDTH_PX
+    for third, third_set in enumerate(stats.third_pixels):
         lines.append(f"  Third {third}:           {third_set}/{third_total} "
                      f"({100.0 * third_set / third_total:.1f}%)")
 
+    # Per-cell ink coverage
+    lines.append("")
+    lines.append("Ink coverage (pixels per cell):")
+    for (label, _, _), count in zip(COVERAGE_BUCKETS, stats.coverage):
+        bar = "#" * min(count // 10, 40)
+        lines.append(f"  {label:>8s}: {count:4d} {bar}")
+
     # Clash analysis
-    clash = find_clash_cells(pixels, attr_data)
     lines.append("")
-    lines.append(f"Complex cells:       {len(clash)} "
+    lines.append(f"Complex cells:       {stats.complex_cells} "
                  f"(cells with 6+ distinct pixel patterns)")
 
+    # Cells that need no pixel data
+    lines.append(f"Solid cells:         {stats.solid_cells} "
+                 f"(empty {stats.empty_cells}, full {stats.full_cells}, "
+                 f"ink=paper {stats.same_colour_cells})")
+    lines.append(f"  convertible:       {stats.solid_dirty} "
+                 f"(pixel bytes could be zeroed)")
+
+    return "\n".join(lines)
+
+
+def batch_info(path: str) -> str:
+    """One line of key statistics per .scr file in a directory."""
+    files = sorted(Path(path).glob("*.scr"))
+    if not files:
+        print(f"Error: no .scr files in {path}", file=sys.stderr)
+        sys.exit(1)
+    width = max(12, max(len(f.name) for f in files))
+    lines = [
+        f"{'file':<{width}s} {'attrs':>5s} {'entropy':>7s} {'ink%':>5s} "
+        f"{'complex':>7s} {'solid':>5s} {'convert':>7s}",
+    ]
+    for f in files:
+        stats = screen_stats(*load_scr(str(f)))
+        density = 100.0 * stats.ink_pixels / (SCR_WIDTH_PX * SCR_HEIGHT_PX)
+        lines.append(
+            f"{f.name:<{width}s} {stats.unique_attrs:5d} "
+            f"{stats.attr_entropy:7.2f} {density:5.1f} "
+            f"{stats.complex_cells:7d} {stats.solid_cells:5d} "
+            f"{stats.solid_dirty:7d}"
+        )
+    return "\n".join(lines)
+
+
+# ── Screen diff ───────────────────────────────────────────────────────
+
+def _cell_set(cells) -> set[tuple[int, int]]:
+    """(char_row, char_col) pairs of the True entries of a (24, 32) array."""
+    rows, cols = np.nonzero(cells)
+    return set(zip(rows.tolist(), cols.tolist()))
+
+
+def diff_cells(
+    a_pixels: bytes,
+    a_attrs: bytes,
+    b_pixels: bytes,
+    b_attrs: bytes,
+) -> tuple[set[tuple[int, int]], set[tuple[int, int]]]:
+    """Compare two screens per 8x8 cell.
+
+    Returns (pixel_cells, attr_cells): the (char_row, char_col) cells
+    whose bitmap bytes differ and those whose attribute differs. With
+    NumPy this is one XOR over each raw buffer, folded per cell through
+    the pixel offset table.
+    """
+    if np is not None:
+        a = np.frombuffer(a_pixels, dtype=np.uint8, count=PIXEL_SIZE)
+        b = np.frombuffer(b_pixels, dtype=np.uint8, count=PIXEL_SIZE)
+        lines = (a ^ b)[pixel_offset_table()]  # (192, 32) bytes
+        pix = lines.reshape(SCR_ROWS, 8, SCR_COLS).any(axis=1)
+        a = np.frombuffer(a_attrs, dtype=np.uint8, count=ATTR_SIZE)
+        b = np.frombuffer(b_attrs, dtype=np.uint8, count=ATTR_SIZE)
+        att = (a ^ b).reshape(SCR_ROWS, SCR_COLS) != 0
+        return _cell_set(pix), _cell_set(att)
+
+    pixel_cells: set[tuple[int, int]] = set()
+    for y in range(SCR_HEIGHT_PX):
+        for x_byte in range(SCR_COLS):
+            offset = scr_pixel_offset(x_byte, y)
+            if a_pixels[offset] != b_pixels[offset]:
+                pixel_cells.add((y // 8, x_byte))
+    attr_cells = {
+        (i // SCR_COLS, i % SCR_COLS)
+        for i in range(ATTR_SIZE) if a_attrs[i] != b_attrs[i]
+    }
+    return pixel_cells, attr_cells
+
+
+def diff_report(
+    name: str,
+    pixel_cells: set[tuple[int, int]],
+    attr_cells: set[tuple[int, int]],
+    *,
+    list_cells: bool = True,
+) -> str:
+    """Summarise a diff_cells() result, optionally cell by cell."""
+    changed = pixel_cells | attr_cells
+    if not changed:
+        return f"{name}: identical"
+    lines = [
+        f"{name}: {len(changed)} cells changed "
+        f"({len(pixel_cells)} pixels, {len(attr_cells)} attrs)"
+    ]
+    if list_cells:
+        for cell in sorted(changed):
+            kinds = []
+            if cell in pixel_cells:
+                kinds.append("pixels")
+            if cell in attr_cells:
+                kinds.append("attr")
+            lines.append(f"  row {cell[0]:2d} col {cell[1]:2d}: {'+'.join(kinds)}")
+    return "\n".join(lines)
+
+
+def _diff_overlay(
+    pixel_data: bytes,
+    attr_data: bytes,
+    changed: set[tuple[int, int]],
+):
+    """Screen colours of the new screen with changed cells ringed in red."""
+    pixels = decode_bitmap(pixel_data) if np is not None else decode_pixels(pixel_data)
+    return screen_rgb(pixels, attr_data, clash_cells=changed)
+
+
+def build_diff_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="scrview diff",
+        description=(
+            "Compare two screens (or two directories of .scr files) per\n"
+            "8x8 cell and report changed pixel and attribute cells.\n"
+            "Exit status is 1 if anything differs."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            "examples:\n"
+            "  %(prog)s old.scr new.scr                   list changed cells\n"
+            "  %(prog)s old.scr new.scr --ansi            show overlay in terminal\n"
+            "  %(prog)s old.scr new.scr --png diff.png    write overlay image\n"
+            "  %(prog)s golden/ build/ --png diffs/       batch, one PNG per change\n"
+        ),
+    )
+    parser.add_argument("old", help="reference .scr file or directory")
+    parser.add_argument("new", help=".scr file or directory to compare")
+    parser.add_argument(
+        "--ansi", action="store_true", default=False,
+        help="render the new screen with changed cells highlighted",
+    )
+    parser.add_argument(
+        "--png", metavar="PATH", default=None,
+        help="write the highlighted overlay as PNG (a directory in batch mode)",
+    )
+    parser.add_argument(
+        "--scale", type=int, default=1, metavar="N",
+        help="pixel scale for PNG output (default 1)",
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", default=False,
+        help="only print the summary line per screen",
+    )
+    return parser
+
+
+def diff_main(argv: list[str]) -> int:
+    """Entry point for 'scrview diff'. Returns the exit status."""
+    args = build_diff_parser().parse_args(argv)
+    old_path, new_path = Path(args.old), Path(args.new)
+
+    if old_path.is_dir() and new_path.is_dir():
+        old_names = {f.name for f in old_path.glob("*.scr")}
+        new_names = {f.name for f in new_path.glob("*.scr")}
+        pairs = sorted(old_names & new_names)
+        batch = True
+    elif old_path.is_dir() or new_path.is_dir():
+        print("Error: compare two files or two directories.", file=sys.stderr)
+        return 2
+    else:
+        old_names = new_names = set()
+        pairs = [new_path.name]
+        batch = False
+
+    png_dir: Path | None = None
+    if batch and args.png:
+        png_dir = Path(args.png)
+        png_dir.mkdir(parents=True, exist_ok=True)
+
+    differs = False
+    for name in sorted(old_names - new_names):
+        print(f"{name}: missing in {new_path}")
+        differs = True
+    for name in sorted(new_names - old_names):
+        print(f"{name}: new in {new_path}")
+        differs = True
+
+    for name in pairs:
+        a_file = old_path / name if batch else old_path
+        b_file = new_path / name if batch else new_path
+        a_pixels, a_attrs = load_scr(str(a_file))
+        b_pixels, b_attrs = load_scr(str(b_file))
+        pixel_cells, attr_cells = diff_cells(a_pixels, a_attrs, b_pixels, b_attrs)
+        changed = pixel_cells | attr_cells
+        print(diff_report(name, pixel_cells, attr_cells,
+                          list_cells=not (batch or args.quiet)))
+        if not changed:
+            continue
+        differs = True
+
+        if args.ansi or args.png:
+            rgb = _diff_overlay(b_pixels, b_attrs, changed)
+            if args.ansi:
+                print(render_ansi(rgb))
+            if args.png:
+                png = render_png(rgb, scale=args.scale)
+                if png is None:
+                    print("Error: --png requires Pillow (pip install Pillow).",
+                          file=sys.stderr)
+                    return 2
+                out = png_dir / f"{Path(name).stem}.png" if png_dir else Path(args.png)
+                out.write_bytes(png)
+
+    return 1 if differs else 0
+
+
+# ── Snapshots ─────────────────────────────────────────────────────────
+
+BANK_SIZE = 16384
+SNA_HEADER = 27
+SNAPSHOT_SUFFIXES = {".sna", ".z80", ".szx"}
+
+# Bank seen at $4000/$8000/$C000 on a 48K machine, in 128K bank numbers
+BANKS_48K = (5, 2, 0)
+
+
+class Snapshot(NamedTuple):
+    """Layout of a memory-mapped snapshot.
+
+    pages maps a 128K bank number to (offset, length, encoding) within
+    the file, where encoding is "raw", "z80" (ED ED RLE), "z80-48k" (one
+    RLE stream holding banks 5, 2, 0 in that order) or "zlib". Nothing is
+    decompressed until a bank is asked for.
+    """
+    kind: str                  # "48K" or "128K"
+    port_7ffd: int | None      # last value written to $7FFD (128K only)
+    pages: dict[int, tuple[int, int, str]]
+
+
+def _z80_unrle(data: memoryview, limit: int) -> bytes:
+    """Expand .z80 RLE (ED ED count byte) up to limit output bytes."""
+    out = bytearray()
+    i = 0
+    n = len(data)
+    while i < n and len(out) < limit:
+        if data[i] == 0xED and i + 3 < n and data[i + 1] == 0xED:
+            out += bytes([data[i + 3]]) * data[i + 2]
+            i += 4
+        else:
+            out.append(data[i])
+            i += 1
+    return bytes(out[:limit])
+
+
+def _parse_sna(view: memoryview) -> Snapshot:
+    size = len(view)
+    pages = {bank: (SNA_HEADER + i * BANK_SIZE, BANK_SIZE, "raw")
+             for i, bank in enumerate(BANKS_48K)}
+    if size == SNA_HEADER + 3 * BANK_SIZE:
+        return Snapshot("48K", None, pages)
+    if size < SNA_HEADER + 3 * BANK_SIZE + 4:
+        raise ValueError(f"unexpected .sna size {size}")
+
+    # 128K: PC (2), port $7FFD (1), TR-DOS flag (1), then the remaining
+    # banks in ascending order, skipping the one paged in at $C000
+    port = view[SNA_HEADER + 3 * BANK_SIZE + 2]
+    paged = port & 7
+    pages[paged] = pages.pop(0)
+    offset = SNA_HEADER + 3 * BANK_SIZE + 4
+    for bank in (0, 1, 3, 4, 6, 7):
+        if bank == paged:
+            continue
+        if offset + BANK_SIZE > size:
+            raise ValueError("truncated 128K .sna")
+        pages.setdefault(bank, (offset, BANK_SIZE, "raw"))
+        offset += BANK_SIZE
+    return Snapshot("128K", port, pages)
+
+
+def _parse_z80(view: memoryview) -> Snapshot:
+    if len(view) < 30:
+        raise ValueError("truncated .z80 header")
+    pc = view[6] | (view[7] << 8)
+    if pc != 0:
+        # Version 1: 48K only, one (optionally compressed) 48K block
+        flags = view[12] if view[12] != 0xFF else 1
+        encoding = "z80-48k" if flags & 0x20 else "raw"
+        if encoding == "raw":
+            pages = {bank: (30 + i * BANK_SIZE, BANK_SIZE, "raw")
+                     for i, bank in enumerate(BANKS_48K)}
+        else:
+            pages = {bank: (30, len(view) - 30, encoding) for bank in BANKS_48K}
+        return Snapshot("48K", None, pages)
+
+    extra = view[30] | (view[31] << 8)
+    hardware = view[34]
+    if extra == 23:
+        is_128k = hardware in (3, 4)
+    else:
+        # 8 is the +3 too (written by some emulators in place of 7);
+        # 11 is the Didaktik Kompakt, a 48K machine
+        is_128k = hardware in (4, 5, 6, 7, 8, 9, 10, 12, 13)
+    port = view[35] if is_128k else None
+
+    pages: dict[int, tuple[int, int, str]] = {}
+    offset = 32 + extra
+    while offset + 3 <= len(view):
+        length = view[offset] | (view[offset + 1] << 8)
+        page = view[offset + 2]
+        offset += 3
+        if length == 0xFFFF:
+            length, encoding = BANK_SIZE, "raw"
+        else:
+            encoding = "z80"
+        if is_128k:
+            bank = page - 3
+        else:
+            bank = {8: 5, 4: 2, 5: 0}.get(page, -1)
+        if 0 <= bank <= 7:
+            pages[bank] = (offset, length, encoding)
+        offset += length
+    return Snapshot("128K" if is_128k else "48K", port, pages)
+
+
+def _parse_szx(view: memoryview) -> Snapshot:
+    if bytes(view[:4]) != b"ZXST":
+        raise ValueError("missing ZXST signature")
+    machine = view[6]
+    kind = "48K" if machine in (0, 1) else "128K"
+    port: int | None = None
+    pages: dict[int, tuple[int, int, str]] = {}
+    offset = 8
+    while offset + 8 <= len(view):
+        block_id = bytes(view[offset:offset + 4])
+        size = int.from_bytes(view[offset + 4:offset + 8], "little")
+        body = offset + 8
+        if block_id == b"RAMP":
+            flags = view[body] | (view[body + 1] << 8)
+            pages[view[body + 2]] = (body + 3, size - 3,
+                                     "zlib" if flags & 1 else "raw")
+        elif block_id == b"SPCR" and kind == "128K":
+            port = view[body + 1]
+        offset = body + size
+    return Snapshot(kind, port, pages)
+
+
+def parse_snapshot(view: memoryview, suffix: str) -> Snapshot:
+    """Index a .sna, .z80 or .szx image without copying page data."""
+    parsers = {".sna": _parse_sna, ".z80": _parse_z80, ".szx": _parse_szx}
+    if suffix not in parsers:
+        raise ValueError(f"not a snapshot file ({suffix or 'no extension'})")
+    return parsers[suffix](view)
+
+
+def snapshot_bank(view: memoryview, snap: Snapshot, bank: int,
+                  limit: int = BANK_SIZE) -> bytes:
+    """Return the first limit bytes of a 16K bank from a mapped snapshot.
+
+    Uncompressed banks are sliced straight out of the mapping; compressed
+    ones are expanded only as far as needed.
+    """
+    if bank not in snap.pages:
+        raise ValueError(f"bank {bank} not present in {snap.kind} snapshot")
+    offset, length, encoding = snap.pages[bank]
+    data = view[offset:offset + length]
+    try:
+        if encoding == "raw":
+            return bytes(data[:limit])
+        if encoding == "z80":
+            return _z80_unrle(data, limit)
+        if encoding == "z80-48k":
+            skip = BANKS_48K.index(bank) * BANK_SIZE
+            return _z80_unrle(data, skip + limit)[skip:]
+        return zlib.decompressobj().decompress(data, limit)
+    finally:
+        data.release()
+
+
+def active_screen_bank(snap: Snapshot) -> int:
+    """Bank the ULA was displaying: 7 if bit 3 of $7FFD is set, else 5."""
+    if snap.port_7ffd is not None and snap.port_7ffd & 0x08:
+        return 7
+    return 5
+
+
+def read_snapshot(path: str, bank: int | None = None,
+                  start: int = 0, length: int = SCR_SIZE) -> tuple[Snapshot, bytes]:
+    """Memory-map a snapshot and read length bytes at start within a bank.
+
+    bank defaults to the active screen bank. Only the requested bytes
+    are copied out of the mapping.
+    """
+    filepath = Path(path)
+    with open(filepath, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            snap = parse_snapshot(view, filepath.suffix.lower())
+            if bank is None:
+                bank = active_screen_bank(snap)
+            data = snapshot_bank(view, snap, bank, start + length)[start:]
+        finally:
+            view.release()
+    return snap, data
+
+
+def peek_snapshot(path: str, address: int, length: int) -> bytes:
+    """Read CPU-visible memory ($4000-$FFFF) as paged at snapshot time."""
+    filepath = Path(path)
+    with open(filepath, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            snap = parse_snapshot(view, filepath.suffix.lower())
+            paged = snap.port_7ffd & 7 if snap.port_7ffd is not None else 0
+            slots = (5, 2, paged)
+            out = bytearray()
+            addr = address
+            while len(out) < length:
+                if not 0x4000 <= addr <= 0xFFFF:
+                    raise ValueError(f"address ${addr:04X} is outside RAM")
+                slot, within = divmod(addr - 0x4000, BANK_SIZE)
+                chunk = min(length - len(out), BANK_SIZE - within)
+                out += snapshot_bank(view, snap, slots[slot],
+                                     within + chunk)[within:]
+                addr += chunk
+        finally:
+            view.release()
+    return bytes(out)
+
+
+def hexdump(data: bytes, address: int) -> str:
+    """Format bytes as a 16-per-line hex and ASCII dump."""
+    lines: list[str] = []
+    for i in range(0, len(data), 16):
+        row = data[i:i + 16]
+        hex_part = " ".join(f"{b:02X}" for b in row)
+        text = "".join(chr(b) if 32 <= b < 127 else "." for b in row)
+        lines.append(f"${address + i:04X}  {hex_part:<47s}  {text}")
     return "\n".join(lines)
 
 
+def load_snapshot(path: str, bank: int | None = None) -> tuple[bytes, bytes]:
+    """Load the screen from a .sna/.z80/.szx snapshot.
+    Returns (pixel_data, attr_data)."""
+    try:
+        _, data = read_snapshot(path, bank)
+    except (ValueError, IndexError, zlib.error) as e:
+        print(f"Error: cannot read snapshot {path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    if len(data) < SCR_SIZE:
+        print(f"Error: snapshot {path} has a truncated screen bank",
+              file=sys.stderr)
+        sys.exit(1)
+    return data[:PIXEL_SIZE], data[PIXEL_SIZE:SCR_SIZE]
+
+
 # ── File loading ──────────────────────────────────────────────────────
 
-def load_scr(path: str) -> tuple[bytes, bytes]:
+def load_scr(path: str, bank: int | None = None) -> tuple[bytes, bytes]:
     """Load a .scr file. Returns (pixel_data, attr_data).
 
     Accepts:
       6912 bytes -- standard .scr (pixels + attributes)
       6144 bytes -- pixels only (attributes default to white ink on black paper)
+      .sna/.z80/.szx -- emulator snapshot; the screen is read from bank
+                        (default: the bank being displayed, 5 or 7)
     """
     filepath = Path(path)
     if not filepath.exists():
         print(f"Error: file not found: {path}", file=sys.stderr)
         sys.exit(1)
 
+    if filepath.suffix.lower() in SNAPSHOT_SUFFIXES:
+        return load_snapshot(path, bank)
+
     data = filepath.read_bytes()
     size = len(data)
 
@@ -638,17 +1514,23 @@ def build_parser() -> argparse.ArgumentParser:
             "examples:\n"
             "  %(prog)s screen.scr                       ANSI terminal output\n"
             "  %(prog)s screen.scr --html out.html        export as HTML file\n"
+            "  %(prog)s screen.scr --png out.png --scale 2  export as PNG image\n"
             "  %(prog)s screen.scr --info                 print screen statistics\n"
             "  %(prog)s screen.scr --grid --ansi          show with grid overlay\n"
             "  %(prog)s screen.scr --clash                highlight complex cells\n"
             "  %(prog)s screen.scr --attr-only            show attributes only\n"
             "  %(prog)s screen.scr --border 1             blue border\n"
+            "  %(prog)s frames/ --play --fps 25           animate a screen sequence\n"
+            "  %(prog)s diff old.scr new.scr              compare two screens\n"
+            "  %(prog)s game.sna --bank 7                 128K shadow screen\n"
         ),
     )
 
     parser.add_argument(
         "file",
-        help="ZX Spectrum .scr file (6912 or 6144 bytes)",
+        help="ZX Spectrum .scr file (6912 or 6144 bytes) or .sna/.z80/.szx "
+             "snapshot; with --play also a directory of .scr files or "
+             "concatenated 6912-byte frames",
     )
 
     mode_group = parser.add_mutually_exclusive_group()
@@ -660,6 +1542,14 @@ def build_parser() -> argparse.ArgumentParser:
         "--html", metavar="FILE", default=None,
         help="generate HTML file (uses PNG if PIL available, SVG otherwise)",
     )
+    mode_group.add_argument(
+        "--png", metavar="FILE", default=None,
+        help="write a PNG image directly (requires PIL)",
+    )
+    mode_group.add_argument(
+        "--play", action="store_true", default=False,
+        help="play a screen sequence in the terminal with FLASH emulation",
+    )
 
     parser.add_argument(
         "--grid", action="store_true", default=False,
@@ -675,7 +1565,8 @@ def build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "--info", action="store_true", default=False,
-        help="print screen statistics (colours, flash, bright, density)",
+        help="print screen statistics (colours, density, coverage, solid "
+             "cells); given a directory, one summary line per .scr file",
     )
     parser.add_argument(
         "--border", type=int, default=0, choices=range(8),
@@ -683,57 +1574,122 @@ def build_parser() -> argparse.ArgumentParser:
         help="border colour 0-7 (default 0=black)",
     )
     parser.add_argument(
-        "--scale", type=int, default=3,
+        "--depth", type=int, default=24, choices=ANSI_DEPTHS,
+        help="ANSI colour depth: 24-bit true colour (default) or the "
+             "256-colour palette for older terminals and multiplexers",
+    )
+    parser.add_argument(
+        "--scale", type=int, default=None,
+        metavar="N",
+        help="pixel scale for HTML/PNG output (default 3 for HTML, 1 for PNG)",
+    )
+    parser.add_argument(
+        "--bank", type=int, default=None, choices=range(8),
+        metavar="N",
+        help="snapshot RAM bank to show as the screen (default: the "
+             "displayed one, 5 or shadow 7)",
+    )
+    parser.add_argument(
+        "--peek", metavar="ADDR[:LEN]", default=None,
+        help="hex dump snapshot memory, e.g. --peek 0x8000:256",
+    )
+    parser.add_argument(
+        "--fps", type=float, default=FRAME_RATE,
         metavar="N",
-        help="pixel scale for HTML output (default 3)",
+        help=f"playback frame rate for --play (default {FRAME_RATE})",
+    )
+    parser.add_argument(
+        "--loop", action="store_true", default=False,
+        help="repeat --play until interrupted",
     )
 
     return parser
 
 
 def main(argv: list[str] | None = None) -> None:
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "diff":
+        sys.exit(diff_main(argv[1:]))
+
     parser = build_parser()
     args = parser.parse_args(argv)
+    if (args.bank is not None
+            and Path(args.file).suffix.lower() not in SNAPSHOT_SUFFIXES):
+        parser.error("--bank only applies to .sna/.z80/.szx snapshots")
+
+    if args.play:
+        play_ansi(
+            load_scr_frames(args.file),
+            fps=args.fps,
+            loop=args.loop,
+            border=args.border,
+            attr_only=args.attr_only,
+            depth=args.depth,
+        )
+        return
+
+    if args.peek:
+        addr_text, _, len_text = args.peek.partition(":")
+        try:
+            address = int(addr_text.replace("$", "0x"), 0)
+            length = int(len_text.replace("$", "0x"), 0) if len_text else 128
+            print(hexdump(peek_snapshot(args.file, address, length), address))
+        except (ValueError, OSError, zlib.error) as e:
+            print(f"Error: --peek {args.peek}: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    if args.info and Path(args.file).is_dir():
+        print(batch_info(args.file))
+        return
 
     # Load screen data
-    pixel_data, attr_data = load_scr(args.file)
-
-    # Decode pixel bitmap
-    pixels = decode_pixels(pixel_data)
+    pixel_data, attr_data = load_scr(args.file, args.bank)
 
     # --info: print statistics and exit (unless combined with rendering)
     if args.info:
-        print(screen_info(pixels, attr_data))
-        if not args.html and not args.ansi:
+        print(screen_info(pixel_data, attr_data))
+        if not args.html and not args.png and not args.ansi:
             return
 
     # Clash detection
     clash_cells: set[tuple[int, int]] | None = None
     if args.clash:
-        clash_cells = find_clash_cells(pixels, attr_data)
+        clash_cells = find_clash_cells(cell_bytes(pixel_data))
+
+    # Decode pixel bitmap once for rendering
+    if np is not None:
+        pixels = decode_bitmap(pixel_data)
+    else:
+        pixels = decode_pixels(pixel_data)
+
+    rgb = screen_rgb(
+        pixels, attr_data,
+        attr_only=args.attr_only,
+        grid=args.grid,
+        clash_cells=clash_cells,
+    )
 
     # Render
-    if args.html:
-        html_content = render_html(
-            pixels, attr_data,
-            attr_only=args.attr_only,
-            grid=args.grid,
-            clash_cells=clash_cells,
-            border=args.border,
-            scale=args.scale,
-        )
+    if args.png:
+        png = render_png(rgb, border=args.border, scale=args.scale or 1)
+        if png is None:
+            print("Error: --png requires Pillow (pip install Pillow).",
+                  file=sys.stderr)
+            sys.exit(1)
+        out_path = Path(args.png)
+        out_path.write_bytes(png)
+        print(f"Written: {out_path} ({len(png)} bytes)")
+    elif args.html:
+        html_content = render_html(rgb, border=args.border,
+                                   scale=args.scale or 3)
         out_path = Path(args.html)
         out_path.write_text(html_content, encoding="utf-8")
         print(f"Written: {out_path} ({len(html_content)} bytes)")
     else:
         # Default: ANSI terminal output
-        ansi_output = render_ansi(
-            pixels, attr_data,
-            attr_only=args.attr_only,
-            grid=args.grid,
-            clash_cells=clash_cells,
-            border=args.border,
-        )
+        ansi_output = render_ansi(rgb, border=args.border, depth=args.depth)
         print(ansi_output)
 
 
@@ -10,14 +10,36 @@ Usage:
     python sinetable.py --approach 1 --size 256 --amplitude 127
     python sinetable.py --approach 2 --size 256 --amplitude 127 --format c
     python sinetable.py --compare --size 256 --amplitude 127
+    python sinetable.py --sweep --sizes 64,128,256 -j 0 > front.csv
+    python sinetable.py --optimise bhaskara --size 256 --amplitude 127
+
+Install NumPy (spectools[fast]) to vectorise the reference and error
+computations; the sweep leans on them heavily and --optimise needs them.
 """
 
 import argparse
+import csv
+import io
 import json
 import math
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import NamedTuple
 
+try:
+    import numpy as np
+except ImportError:  # optional: pure-Python reference and error maths
+    np = None
+
+try:
+    from .tablegen import ErrorStats, format_data_line, pareto_indices
+    from .tstate import FRAME_BUDGETS, parse_line
+except ImportError:  # run as a script from this directory
+    from tablegen import ErrorStats, format_data_line, pareto_indices
+    from tstate import FRAME_BUDGETS, parse_line
+
 
 # ---------------------------------------------------------------------------
 # Core sine generation — ideal reference
@@ -25,6 +47,8 @@ from typing import NamedTuple
 
 def ideal_sine(size: int, amplitude: int, unsigned: bool) -> list[float]:
     """Generate ideal sine values as floats for a full period."""
+    if np is not None:
+        return ideal_sine_array(size, amplitude, unsigned).tolist()
     values = []
     for i in range(size):
         angle = i * 2.0 * math.pi / size
@@ -35,11 +59,32 @@ def ideal_sine(size: int, amplitude: int, unsigned: bool) -> list[float]:
     return values
 
 
+def ideal_sine_array(size: int, amplitude: int, unsigned: bool):
+    """ideal_sine() as a float64 NumPy array."""
+    # same operation order as ideal_sine(), so both round identically
+    values = np.sin(np.arange(size) * 2.0 * math.pi / size) * amplitude
+    if unsigned:
+        values += amplitude
+    return values
+
+
 def quantize(values: list[float]) -> list[int]:
     """Round floats to nearest integer."""
     return [int(round(v)) for v in values]
 
 
+@lru_cache(maxsize=None)
+def reference_table(size: int, amplitude: int, unsigned: bool):
+    """Quantised ideal sine, memoised: an int64 array with NumPy, else
+    a tuple. Shared by every error computation at the same point."""
+    if np is not None:
+        ref = np.rint(ideal_sine_array(size, amplitude, unsigned))
+        ref = ref.astype(np.int64)
+        ref.flags.writeable = False
+        return ref
+    return tuple(quantize(ideal_sine(size, amplitude, unsigned)))
+
+
 # ---------------------------------------------------------------------------
 # Approach 1 — Full 256-byte LUT
 # ---------------------------------------------------------------------------
@@ -222,26 +267,36 @@ def approach5_bhaskara(size: int, amplitude: int, unsigned: bool) -> list[int]:
 # Approach 6 — Recursive difference equation
 # ---------------------------------------------------------------------------
 
-def approach6_recursive(size: int, amplitude: int, unsigned: bool) -> list[int]:
+# Default fixed-point formats: 2.14 coefficient, 8.8 value accumulators
+RECURSIVE_COEFF_FRAC = 14
+RECURSIVE_VAL_FRAC = 8
+
+
+def approach6_recursive(size: int, amplitude: int, unsigned: bool,
+                        coeff_frac: int = RECURSIVE_COEFF_FRAC,
+                        val_frac: int = RECURSIVE_VAL_FRAC) -> list[int]:
     """Recursive difference equation:
     sin(n+1) = 2*cos(theta)*sin(n) - sin(n-1)
     where theta = 2*pi/size.
 
     Uses 16-bit (2.14) fixed-point for the coefficient and 16-bit (8.8)
     fixed-point for value accumulators. On a Z80 this requires a 16x16->32
-    multiply followed by >>14 shift, feasible in ~120 T-states.
+    multiply followed by >>14 shift per entry (see cycle_cost).
 
     Total data: 4 bytes (2*cos as 16-bit + sin(1) as 16-bit).
-    Typical max error: ~4-5% for size=256, amplitude=127."""
+    Typical max error: ~4-5% for size=256, amplitude=127.
+
+    coeff_frac and val_frac select other fixed-point formats (the sweep
+    explores them); the defaults are the 2.14 / 8.8 pair above."""
     theta = 2.0 * math.pi / size
     cos_theta = math.cos(theta)
 
     # 2.14 fixed-point for coefficient (16-bit, max ~2.0)
-    COEFF_FRAC = 14
+    COEFF_FRAC = coeff_frac
     COEFF_SCALE = 1 << COEFF_FRAC
 
     # 8.8 fixed-point for value accumulators (16-bit, fits in register pair)
-    VAL_FRAC = 8
+    VAL_FRAC = val_frac
     VAL_SCALE = 1 << VAL_FRAC
 
     # 2*cos(theta) in 2.14
@@ -253,7 +308,9 @@ def approach6_recursive(size: int, amplitude: int, unsigned: bool) -> list[int]:
 
     values = []
     for i in range(size):
-        val = int(round(sin_prev / VAL_SCALE))
+        # Round half up and clamp, as the Z80 loop does
+        val = (sin_prev + (VAL_SCALE >> 1)) >> VAL_FRAC
+        val = max(-amplitude, min(amplitude, val))
         if unsigned:
             val += amplitude
         values.append(val)
@@ -271,7 +328,13 @@ def approach6_recursive(size: int, amplitude: int, unsigned: bool) -> list[int]:
 # Approach 7 — CORDIC-style iterative
 # ---------------------------------------------------------------------------
 
-def approach7_cordic(size: int, amplitude: int, unsigned: bool) -> list[int]:
+CORDIC_ITERATIONS = 14
+CORDIC_COORD_FRAC = 8  # 8.8 coordinates
+
+
+def approach7_cordic(size: int, amplitude: int, unsigned: bool,
+                     iterations: int = CORDIC_ITERATIONS,
+                     coord_frac: int = CORDIC_COORD_FRAC) -> list[int]:
     """CORDIC-style iterative sine computation.
 
     Uses a table of arctangent values for iterative rotation.
@@ -284,8 +347,11 @@ def approach7_cordic(size: int, amplitude: int, unsigned: bool) -> list[int]:
     this range, we pre-rotate by +/-90 degrees (swap x,y and negate).
 
     On Z80: ~14 iterations, each needs 2 shifts + 2 adds + 1 comparison.
-    Total data: ~30 bytes (14 x 16-bit atan values) + initial x value."""
-    ITERATIONS = 14
+    Total data: ~30 bytes (14 x 16-bit atan values) + initial x value.
+
+    iterations and coord_frac override the iteration count and the
+    coordinate fraction bits."""
+    ITERATIONS = iterations
 
     # Atan table as fractions of full circle (0..65536 = 0..2π)
     ANGLE_SCALE = 65536.0 / (2.0 * math.pi)
@@ -298,7 +364,7 @@ def approach7_cordic(size: int, amplitude: int, unsigned: bool) -> list[int]:
         K *= math.cos(atan_table_rad[i])
 
     # Fixed-point coordinate scale (8.8)
-    COORD_FRAC = 8
+    COORD_FRAC = coord_frac
     COORD_SCALE = 1 << COORD_FRAC
 
     # Initial x = K * amplitude (pre-scaled)
@@ -308,11 +374,8 @@ def approach7_cordic(size: int, amplitude: int, unsigned: bool) -> list[int]:
     QUARTER = 16384  # 65536 / 4
 
     def asr(val: int, shift: int) -> int:
-        """Arithmetic shift right (preserves sign)."""
-        if val >= 0:
-            return val >> shift
-        else:
-            return -((-val) >> shift)
+        """Arithmetic shift right, rounding down like SRA/RR."""
+        return val >> shift
 
     values = []
     for idx in range(size):
@@ -354,8 +417,8 @@ def approach7_cordic(size: int, amplitude: int, unsigned: bool) -> list[int]:
             x = new_x
             y = new_y
 
-        # y / COORD_SCALE is the sine value
-        v = int(round(y / COORD_SCALE))
+        # y / COORD_SCALE is the sine value, rounded as the Z80 code does
+        v = (y + (COORD_SCALE >> 1)) >> COORD_FRAC
         # Clamp to valid range
         v = max(-amplitude, min(amplitude, v))
         if unsigned:
@@ -369,30 +432,25 @@ def approach7_cordic(size: int, amplitude: int, unsigned: bool) -> list[int]:
 # Error computation
 # ---------------------------------------------------------------------------
 
-class ErrorStats(NamedTuple):
-    max_err: float      # maximum absolute error vs ideal (in amplitude units)
-    rms_err: float      # RMS error vs ideal
-    max_pct: float      # max error as percentage of amplitude
-    rms_pct: float      # RMS error as percentage of amplitude
-
-
 def compute_errors(approx: list[int], size: int, amplitude: int,
                    unsigned: bool) -> ErrorStats:
-    """Compute error statistics of an approximation vs ideal sine."""
-    ref = quantize(ideal_sine(size, amplitude, unsigned))
-
-    if len(approx) != len(ref):
-        # For quarter-wave, reconstruct full table first
-        # This shouldn't happen if called correctly
-        pass
-
-    max_err = 0.0
-    sum_sq = 0.0
-    for i in range(len(ref)):
-        err = abs(approx[i] - ref[i])
-        max_err = max(max_err, err)
-        sum_sq += err * err
-    rms_err = math.sqrt(sum_sq / len(ref)) if ref else 0.0
+    """Compute error statistics of an approximation vs ideal sine.
+
+    approx must be the full reconstructed table (size entries)."""
+    ref = reference_table(size, amplitude, unsigned)
+
+    if np is not None:
+        err = np.abs(np.asarray(approx, dtype=np.int64) - ref)
+        max_err = max(0.0, int(err.max())) if size else 0.0
+        rms_err = math.sqrt(float(np.dot(err, err)) / size) if size else 0.0
+    else:
+        max_err = 0.0
+        sum_sq = 0.0
+        for i in range(len(ref)):
+            err = abs(approx[i] - ref[i])
+            max_err = max(max_err, err)
+            sum_sq += err * err
+        rms_err = math.sqrt(sum_sq / len(ref)) if ref else 0.0
 
     amp = amplitude if amplitude > 0 else 1
     return ErrorStats(
@@ -403,6 +461,690 @@ def compute_errors(approx: list[int], size: int, amplitude: int,
     )
 
 
+# ---------------------------------------------------------------------------
+# Cycle-cost model
+# ---------------------------------------------------------------------------
+#
+# Each approach's Z80 code is kept as a Routine: blocks of source lines,
+# each with the number of times it runs. Costs come from tstate.py's
+# instruction database. The closing branch of a block is costed as taken
+# on every run except its `exits` final fall-throughs; any other
+# conditional is costed as not taken, so the instructions it guards are
+# counted too (an upper bound for the shift-and-add loops used here).
+# Blocks with runs=0 are listed but not costed, e.g. the mirror path of a
+# symmetric branch. CALLs to helper routines add the helper's cost.
+
+FRAME_TSTATES = FRAME_BUDGETS["48k"]
+CALL_TSTATES = 17
+
+
+class CodeBlock(NamedTuple):
+    lines: tuple[str, ...]
+    runs: int = 1
+    exits: int = 0
+
+
+class Routine(NamedTuple):
+    name: str
+    blocks: tuple[CodeBlock, ...]
+
+
+def routine_listing(routine: Routine) -> list[str]:
+    """Source lines of a routine, in order."""
+    return [line for block in routine.blocks for line in block.lines]
+
+
+def block_tstates(block: CodeBlock, helpers: dict[str, int]) -> int:
+    """T-states for every run of one block."""
+    per_run = 0
+    fallthrough = 0
+    costed = [(line, parse_line(line)) for line in block.lines]
+    costed = [(line, info) for line, info in costed if info.mnemonic]
+    for i, (line, info) in enumerate(costed):
+        cost = info.tstates
+        if cost is None:
+            raise ValueError(f"no T-state timing for: {line.strip()}")
+        if isinstance(cost, tuple):
+            taken, not_taken = cost
+            if i == len(costed) - 1:
+                cost = taken
+                fallthrough = taken - not_taken
+            else:
+                cost = not_taken
+        if info.mnemonic == "call":
+            cost += helpers.get(info.operands[-1], 0)
+        per_run += cost
+    return per_run * block.runs - fallthrough * block.exits
+
+
+def routine_tstates(routine: Routine, helpers: dict[str, int] | None = None
+                    ) -> int:
+    """Total T-states to run a routine once (including any RET)."""
+    return sum(block_tstates(b, helpers or {}) for b in routine.blocks)
+
+
+def _bit(n: int) -> int:
+    """Bit number of a power-of-two angle step, clamped to a byte."""
+    return min(7, max(0, n.bit_length() - 1))
+
+
+def mul_8x8_routine() -> Routine:
+    """HL = C * E, shift-and-add."""
+    return Routine("mul_8x8", (
+        CodeBlock((
+            "mul_8x8:               ; HL = C * E",
+            "  ld hl, 0",
+            "  ld d, h",
+            "  ld a, c",
+            "  ld b, 8",
+        )),
+        CodeBlock((
+            ".mul:",
+            "  add hl, hl",
+            "  rla                   ; next multiplier bit into carry",
+            "  jr nc, .skip",
+            "  add hl, de",
+            ".skip:",
+            "  djnz .mul",
+        ), runs=8, exits=1),
+        CodeBlock(("  ret",)),
+    ))
+
+
+def div_frac_8_routine() -> Routine:
+    """A = 256 * HL / DE for HL < DE, restoring division."""
+    return Routine("div_frac_8", (
+        CodeBlock((
+            "div_frac_8:            ; A = 256 * HL / DE  (HL < DE)",
+            "  ld b, 8",
+        )),
+        CodeBlock((
+            ".div:",
+            "  add hl, hl",
+            "  or a",
+            "  sbc hl, de",
+            "  jr nc, .fits",
+            "  add hl, de            ; restore (sets carry)",
+            ".fits:",
+            "  ccf                   ; carry = quotient bit",
+            "  rl c",
+            "  djnz .div",
+        ), runs=8, exits=1),
+        CodeBlock((
+            "  ld a, c",
+            "  ret",
+        )),
+    ))
+
+
+def mul_16x16_shr_routine(shift: int) -> Routine:
+    """HL = round(DE * BC / 2^shift) for signed DE and BC < 32768, via a
+    32-bit DEHL product (shift >= 8)."""
+    name = f"mul_16x16_shr{shift}"
+    return Routine(name, (
+        CodeBlock((
+            f"{name}:       ; HL = round(DE * BC / 2^{shift})",
+            "  push de               ; keep the sign of DE",
+            "  ld hl, 0",
+            "  ld a, 16",
+        )),
+        CodeBlock((
+            ".mul:",
+            "  add hl, hl",
+            "  rl e",
+            "  rl d                  ; multiplier bit out, product carry in",
+            "  jr nc, .skip",
+            "  add hl, bc",
+            "  jr nc, .skip",
+            "  inc de",
+            ".skip:",
+            "  dec a",
+            "  jr nz, .mul",
+        ), runs=16, exits=1),
+        CodeBlock((
+            "  pop af                ; A = high byte of the multiplicand",
+            "  rla",
+            "  jr nc, .positive",
+            "  ex de, hl",
+            "  or a",
+            "  sbc hl, bc            ; signed DE: high word -= BC",
+            "  ex de, hl",
+            ".positive:",
+            f"  ld bc, {1 << (shift - 1)}",
+            "  add hl, bc            ; round",
+            "  jr nc, .rounded",
+            "  inc de",
+            ".rounded:",
+            "  ld l, h               ; >> 8 by moving bytes",
+            "  ld h, e",
+            "  ld a, d",
+        ) + ("  sra a",
+             "  rr h",
+             "  rr l") * max(0, shift - 8) + (
+            "  ret",
+        )),
+    ))
+
+
+def lut_lookup_routine() -> Routine:
+    """Inline lookup in a page-aligned full table."""
+    return Routine("sine_table", (
+        CodeBlock((
+            "  ld h, high sine_table  ; A = angle -> A = sine",
+            "  ld l, a",
+            "  ld a, (hl)",
+        )),
+    ))
+
+
+def quarter_lookup_routine(size: int) -> Routine:
+    """Lookup via the quarter-wave table and symmetry."""
+    q = size // 4
+    return Routine("sin_quarter", (
+        CodeBlock((
+            "sin_quarter:           ; A = angle -> A = sine",
+            "  ld c, a",
+            f"  and {q - 1}",
+            f"  bit {_bit(q)}, c              ; falling quadrant?",
+            "  jr z, .rising",
+            "  neg",
+            f"  add a, {q}             ; q - position",
+            ".rising:",
+            "  ld l, a",
+            "  ld h, high sine_quarter",
+            "  ld a, (hl)",
+            f"  bit {_bit(2 * q)}, c              ; second half?",
+            "  ret z",
+            "  neg",
+            "  ret",
+        )),
+    ))
+
+
+def _sign_tail(half: int, amplitude: int, unsigned: bool) -> tuple[str, ...]:
+    """Negate the second half-wave (BC pushed on entry); offset if unsigned."""
+    lines = ("  pop bc",
+             f"  bit {_bit(half)}, b")
+    if unsigned:
+        return lines + ("  jr z, .pos",
+                        "  neg",
+                        ".pos:",
+                        f"  add a, {amplitude}",
+                        "  ret")
+    return lines + ("  ret z",
+                    "  neg",
+                    "  ret")
+
+
+def _parabolic_shift(size: int) -> int:
+    """Shift taking x(half-x) to an 8-bit fraction (peak 256 -> 255)."""
+    return 2 * _bit(size // 2) - 10
+
+
+def parabolic_fixed(size: int, amplitude: int, unsigned: bool) -> list[int]:
+    """Table the parabolic_routine code produces (the float parabola
+    rounded through an 8-bit fraction; can differ from it by 1)."""
+    half = size // 2
+    shift = _parabolic_shift(size)
+    values = []
+    for i in range(size):
+        x = i & (half - 1)
+        p = x * (half - x)
+        if shift > 0:
+            f = (p + (1 << (shift - 1))) >> shift
+        else:
+            f = p << -shift
+        y = (min(f, 255) * amplitude + 128) >> 8
+        if i & half:
+            y = -y
+        values.append(y + amplitude if unsigned else y)
+    return values
+
+
+def parabolic_routine(size: int, amplitude: int, unsigned: bool) -> Routine:
+    """sin(x) ~ 4x(half-x)/half^2 * amplitude with two 8x8 multiplies."""
+    half = size // 2
+    shift = _parabolic_shift(size)
+    if shift > 0:
+        scale = (
+            f"  ld de, {1 << (shift - 1)}",
+            "  add hl, de            ; round",
+            f"  srl h                 ; scale: HL >> {shift}",
+            "  rr l",
+        ) + ("  srl h",
+             "  rr l") * (shift - 1)
+    else:
+        scale = ("  add hl, hl",) * -shift
+    lines = (
+        "para_sin:              ; A = angle -> A = sine",
+        "  ld b, a               ; keep the half bit for the sign",
+        f"  and {half - 1}",
+        "  ld c, a               ; C = x",
+        f"  ld a, {half}",
+        "  sub c",
+        "  ld e, a               ; E = half - x",
+        "  push bc",
+        "  call mul_8x8          ; HL = x * (half - x)",
+    ) + scale + (
+        "  ld a, l",
+        "  sub h                 ; clamp the peak: 256 -> 255",
+    ) + _scale_and_round(amplitude, 128, "a")
+    lines += _sign_tail(half, amplitude, unsigned)
+    return Routine("para_sin", (CodeBlock(lines),))
+
+
+def bhaskara_fixed(size: int, amplitude: int, unsigned: bool) -> list[int]:
+    """Table the bhaskara_routine code produces (the float formula rounded
+    through an 8-bit fraction; can differ from it by 1)."""
+    half = size // 2
+    den_base = 5 * half * half // 4
+    values = []
+    for i in range(size):
+        x = i & (half - 1)
+        p = x * (half - x)
+        f = min(255, (4 * p << 8) // (den_base - p))
+        y = (f * amplitude + 128) >> 8
+        if i & half:
+            y = -y
+        values.append(y + amplitude if unsigned else y)
+    return values
+
+
+def bhaskara_routine(size: int, amplitude: int, unsigned: bool) -> Routine:
+    """Bhaskara I: sin ~ 4p / (5*half^2/4 - p), p = x(half-x)."""
+    half = size // 2
+    return Routine("bhaskara_sin", (
+        CodeBlock((
+            "bhaskara_sin:          ; A = angle -> A = sine",
+            "  ld b, a",
+            f"  and {half - 1}",
+            "  ld c, a               ; C = x",
+            f"  ld a, {half}",
+            "  sub c",
+            "  ld e, a               ; E = half - x",
+            "  push bc",
+            "  call mul_8x8          ; HL = p",
+            "  ld d, h",
+            "  ld e, l",
+            "  add hl, hl",
+            "  add hl, hl            ; HL = 4p (numerator)",
+            "  push hl",
+            f"  ld hl, {5 * half * half // 4}",
+            "  or a",
+            "  sbc hl, de            ; HL = 5*half^2/4 - p (denominator)",
+            "  ex de, hl",
+            "  pop hl",
+            "  call div_frac_8       ; A = 256 * num / den (255 at the peak)",
+        ) + _scale_and_round(amplitude, 128, "a")
+          + _sign_tail(half, amplitude, unsigned)),
+    ))
+
+
+def fill_routine(size: int, lookup: str) -> Routine:
+    """Build the full table by calling a lookup routine per entry."""
+    return Routine("sine_fill", (
+        CodeBlock((
+            "sine_fill:             ; build sine_buffer from the lookup",
+            "  ld hl, sine_buffer",
+            f"  ld b, {size & 0xFF}",
+            "  xor a",
+        )),
+        CodeBlock((
+            ".gen:",
+            "  push af",
+            "  push bc",
+            "  push hl",
+            f"  call {lookup}",
+            "  pop hl",
+            "  ld (hl), a",
+            "  inc hl",
+            "  pop bc",
+            "  pop af",
+            "  inc a",
+            "  djnz .gen",
+        ), runs=size, exits=1),
+        CodeBlock(("  ret",)),
+    ))
+
+
+def delta_unpack_routine(npacked: int, nibble_packed: bool) -> Routine:
+    """Unpack approach 3's deltas into the quarter-wave table."""
+    if nibble_packed:
+        return Routine("unpack", (
+            CodeBlock((
+                f"  ; Unpack nibble-packed deltas into quarter-wave table,",
+                f"  ; then reconstruct full table via symmetry.",
+                f"  ld hl, sine_packed    ; packed nibble data",
+                f"  ld de, sine_buffer    ; destination quarter table",
+                f"  xor a                 ; initial value = 0",
+                f"  ld b, {npacked}              ; packed byte count",
+            )),
+            CodeBlock((
+                f".unpack:",
+                f"  ld (de), a            ; store current value",
+                f"  inc de",
+                f"  ld c, (hl)            ; get packed byte",
+                f"  push af               ; save accumulator",
+                f"  ld a, c",
+                f"  rrca",
+                f"  rrca",
+                f"  rrca",
+                f"  rrca",
+                f"  and $0F               ; high nibble = first delta",
+                f"  ld c, a",
+                f"  pop af",
+                f"  add a, c              ; accumulate first delta",
+                f"  ld (de), a            ; store value",
+                f"  inc de",
+                f"  push af",
+                f"  ld a, (hl)            ; re-read packed byte",
+                f"  and $0F               ; low nibble = second delta",
+                f"  ld c, a",
+                f"  pop af",
+                f"  add a, c              ; accumulate second delta",
+                f"  inc hl                ; next packed byte",
+                f"  djnz .unpack",
+            ), runs=npacked, exits=1),
+        ))
+    return Routine("unpack", (
+        CodeBlock((
+            f"  ; Add byte deltas to reconstruct quarter-wave table.",
+            f"  ld hl, sine_deltas    ; delta byte data",
+            f"  ld de, sine_buffer    ; destination quarter table",
+            f"  xor a                 ; initial value = 0",
+            f"  ld b, {npacked}              ; delta count",
+        )),
+        CodeBlock((
+            f".unpack:",
+            f"  ld (de), a            ; store current value",
+            f"  inc de",
+            f"  add a, (hl)           ; add delta",
+            f"  inc hl",
+            f"  djnz .unpack",
+        ), runs=npacked, exits=1),
+        CodeBlock((
+            f"  ld (de), a            ; store final value",
+        )),
+    ))
+
+
+def recursive_routine(size: int, amplitude: int, unsigned: bool,
+                      coeff_frac: int = RECURSIVE_COEFF_FRAC) -> Routine:
+    """Approach 6's generation loop (one multiply per entry).
+
+    sin(1) and 2cos(theta) are read from sine_recursive_data; each entry
+    is sin(n) rounded from 8.8 and clamped to +/-amplitude."""
+    high = min(255, 128 + amplitude)
+    low = max(0, 128 - amplitude)
+    return Routine("recursive_fill", (
+        CodeBlock((
+            "recursive_fill:        ; fill sine_buffer from the recurrence",
+            "  ld hl, 0",
+            "  ld (rec_prev), hl     ; sin(n-1) = sin(0) = 0 (8.8)",
+            "  ld hl, (sine_recursive_data)",
+            "  ld (rec_curr), hl     ; sin(n) = sin(1) (8.8)",
+            "  ld ix, sine_buffer",
+            f"  ld b, {size & 0xFF}",
+        )),
+        CodeBlock((
+            ".loop:",
+            "  push bc",
+            "  ld hl, (rec_prev)",
+            "  ld a, h",
+            "  xor $80               ; bias: -128..127 -> 0..255",
+            "  sla l",
+            "  adc a, 0              ; round to nearest",
+            "  sbc a, 0              ; 256 saturates at 255",
+            f"  cp {high}",
+            "  jr c, .below",
+            f"  ld a, {high}            ; clamp to +amplitude",
+            ".below:",
+            f"  cp {low}",
+            "  jr nc, .above",
+            f"  ld a, {low}             ; clamp to -amplitude",
+            ".above:",
+            (f"  sub {low}                ; unsigned: sin + amplitude"
+             if unsigned else "  xor $80               ; remove the bias"),
+            "  ld (ix+0), a",
+            "  inc ix",
+            "  ld de, (rec_curr)",
+            f"  ld bc, (sine_recursive_data+2)  ; 2cos(theta) (2.{coeff_frac})",
+            f"  call mul_16x16_shr{coeff_frac}   ; HL = 2cos(theta) * sin(n)",
+            "  ld de, (rec_prev)",
+            "  or a",
+            "  sbc hl, de            ; sin(n+1) = HL - sin(n-1)",
+            "  ld de, (rec_curr)",
+            "  ld (rec_prev), de",
+            "  ld (rec_curr), hl",
+            "  pop bc",
+            "  djnz .loop",
+        ), runs=size, exits=1),
+        CodeBlock(("  ret",)),
+    ))
+
+
+def cordic_routine(amplitude: int, unsigned: bool,
+                   iterations: int = CORDIC_ITERATIONS) -> Routine:
+    """One CORDIC evaluation: HL = 16-bit angle -> A = sine.
+
+    Angles beyond +/-90 degrees start from (0, +/-init_x) at +/-90 degrees,
+    as approach7_cordic does; the cost counts that (longer) path."""
+    shifts = iterations * (iterations - 1) // 2   # sum of i over iterations
+    return Routine("cordic_sin", (
+        CodeBlock((
+            "cordic_sin:            ; HL = angle ($0000-$FFFF) -> A = sine",
+            "  ld (cordic_target), hl",
+            "  ld de, (cordic_init_x)",
+            "  ld (cordic_x), de",
+            "  ld de, 0",
+            "  ld (cordic_y), de",
+            "  ld (cordic_angle), de",
+            "  ld a, h",
+            "  add a, $40            ; |angle| > 90 deg?",
+            "  jp p, .in_range",
+            "  ld (cordic_x), de     ; pre-rotate: x = 0",
+            "  ld hl, (cordic_init_x)",
+            "  ld de, $4000          ; +90 deg: start from (0, init_x)",
+            "  bit 6, a              ; H = $80-$BF: below -90 deg?",
+            "  jr z, .pre_rotate",
+            "  xor a",
+            "  sub l",
+            "  ld l, a",
+            "  sbc a, a",
+            "  sub h",
+            "  ld h, a",
+            "  ld de, $C000          ; -90 deg: start from (0, -init_x)",
+            ".pre_rotate:",
+            "  ld (cordic_y), hl",
+            "  ld (cordic_angle), de",
+            ".in_range:",
+            "  ld ix, cordic_atan_table",
+            "  ld c, 0               ; C = iteration i",
+        )),
+        CodeBlock((
+            ".iter:",
+            "  ld hl, (cordic_angle)",
+            "  ld de, (cordic_target)",
+            "  or a",
+            "  sbc hl, de",
+            "  ld a, h               ; bit 7 set: rotate forwards",
+            "  ld hl, (cordic_y)     ; ty = y >> i",
+            "  ld b, c",
+            "  inc b",
+            "  jr .sy_test",
+        ), runs=iterations),
+        CodeBlock((
+            ".sy_loop:",
+            "  sra h",
+            "  rr l",
+        ), runs=shifts),
+        CodeBlock((
+            ".sy_test:",
+            "  djnz .sy_loop",
+        ), runs=shifts + iterations, exits=iterations),
+        CodeBlock((
+            "  ld (cordic_ty), hl",
+            "  ld hl, (cordic_x)     ; DE = x >> i",
+            "  ld b, c",
+            "  inc b",
+            "  jr .sx_test",
+        ), runs=iterations),
+        CodeBlock((
+            ".sx_loop:",
+            "  sra h",
+            "  rr l",
+        ), runs=shifts),
+        CodeBlock((
+            ".sx_test:",
+            "  djnz .sx_loop",
+        ), runs=shifts + iterations, exits=iterations),
+        CodeBlock((
+            "  ex de, hl",
+            "  ld hl, (cordic_y)",
+            "  bit 7, a",
+            "  jr z, .back",
+            "  add hl, de            ; y += x >> i",
+            "  ld (cordic_y), hl",
+            "  ld hl, (cordic_x)",
+            "  ld de, (cordic_ty)",
+            "  or a",
+            "  sbc hl, de            ; x -= y >> i",
+            "  ld (cordic_x), hl",
+            "  ld hl, (cordic_angle)",
+            "  ld e, (ix+0)",
+            "  ld d, (ix+1)",
+            "  add hl, de            ; angle += atan[i]",
+            "  jr .next",
+        ), runs=iterations),
+        CodeBlock((
+            ".back:                 ; mirror of the forward path",
+            "  or a",
+            "  sbc hl, de            ; y -= x >> i",
+            "  ld (cordic_y), hl",
+            "  ld hl, (cordic_x)",
+            "  ld de, (cordic_ty)",
+            "  add hl, de            ; x += y >> i",
+            "  ld (cordic_x), hl",
+            "  ld hl, (cordic_angle)",
+            "  ld e, (ix+0)",
+            "  ld d, (ix+1)",
+            "  or a",
+            "  sbc hl, de            ; angle -= atan[i]",
+        ), runs=0),
+        CodeBlock((
+            ".next:",
+            "  ld (cordic_angle), hl",
+            "  inc ix",
+            "  inc ix",
+            "  inc c",
+            "  ld a, c",
+            f"  cp {iterations}",
+            "  jr nz, .iter",
+        ), runs=iterations, exits=1),
+        CodeBlock((
+            "  ld hl, (cordic_y)",
+            "  ld de, $0080",
+            "  add hl, de            ; round y to nearest",
+            "  ld a, h               ; integer part of y",
+        ) + ((f"  add a, {amplitude}",) if unsigned else ()) + (
+            "  ret",
+        )),
+    ))
+
+
+def cordic_fill_routine(size: int) -> Routine:
+    """Build the full table with one CORDIC evaluation per entry."""
+    return Routine("cordic_fill", (
+        CodeBlock((
+            "cordic_fill:",
+            "  ld de, sine_buffer",
+            "  ld (cordic_out), de",
+            "  ld hl, 0              ; angle",
+        )),
+        CodeBlock((
+            ".gen:",
+            "  push hl",
+            "  call cordic_sin",
+            "  pop hl",
+            "  ld de, (cordic_out)",
+            "  ld (de), a",
+            "  inc de",
+            "  ld (cordic_out), de",
+            f"  ld bc, {65536 // size}",
+            "  add hl, bc",
+            "  ld a, h",
+            "  or l",
+            "  jr nz, .gen",
+        ), runs=size, exits=1),
+        CodeBlock(("  ret",)),
+    ))
+
+
+class CycleCost(NamedTuple):
+    generate: int       # T-states to build the full size-entry table
+    lookup: int         # T-states per lookup in the approach's normal use
+
+
+def _helper_costs(*routines: Routine) -> dict[str, int]:
+    helpers: dict[str, int] = {}
+    for routine in routines:
+        helpers[routine.name] = routine_tstates(routine, helpers)
+    return helpers
+
+
+@lru_cache(maxsize=None)
+def cycle_cost(approach: int, size: int, amplitude: int, unsigned: bool,
+               coeff_frac: int = RECURSIVE_COEFF_FRAC,
+               iterations: int = CORDIC_ITERATIONS) -> CycleCost:
+    """T-states to generate the table and per lookup, from the Z80 code.
+
+    Table approaches (1, 6, 7) are looked up in the generated table;
+    quarter-wave and delta encoding use the symmetry lookup; parabolic and
+    Bhaskara evaluate their formula per lookup (and per entry to build a
+    table). Calls are included in per-lookup costs.
+    """
+    lut = routine_tstates(lut_lookup_routine())
+    helpers = _helper_costs(mul_8x8_routine(), div_frac_8_routine())
+    if approach == 1:
+        return CycleCost(0, lut)
+    if approach in (2, 3):
+        helpers.update(_helper_costs(quarter_lookup_routine(size)))
+        generate = routine_tstates(fill_routine(size, "sin_quarter"), helpers)
+        if approach == 3:
+            _, _, packed, _, nibble = approach3_delta_encoding(
+                size, amplitude, unsigned)
+            generate += routine_tstates(
+                delta_unpack_routine(len(packed), nibble))
+        return CycleCost(generate, CALL_TSTATES + helpers["sin_quarter"])
+    if approach in (4, 5):
+        routine = (parabolic_routine(size, amplitude, unsigned)
+                   if approach == 4
+                   else bhaskara_routine(size, amplitude, unsigned))
+        helpers[routine.name] = routine_tstates(routine, helpers)
+        generate = routine_tstates(fill_routine(size, routine.name), helpers)
+        return CycleCost(generate, CALL_TSTATES + helpers[routine.name])
+    if approach == 6:
+        helpers = _helper_costs(mul_16x16_shr_routine(coeff_frac))
+        generate = routine_tstates(
+            recursive_routine(size, amplitude, unsigned, coeff_frac), helpers)
+        return CycleCost(generate, lut)
+    if approach == 7:
+        helpers = _helper_costs(cordic_routine(amplitude, unsigned,
+                                               iterations))
+        generate = routine_tstates(cordic_fill_routine(size), helpers)
+        return CycleCost(generate, lut)
+    raise ValueError(f"Unknown approach: {approach}")
+
+
+def cost_line(approach: int, size: int, amplitude: int,
+              unsigned: bool) -> str:
+    """One-line cycle-cost summary for asm headers."""
+    cost = cycle_cost(approach, size, amplitude, unsigned)
+    return (f"Z80 cost: generate {cost.generate} T-states "
+            f"({cost.generate / FRAME_TSTATES:.2f} frames), "
+            f"lookup {cost.lookup} T-states")
+
+
 # ---------------------------------------------------------------------------
 # Output formatting
 # ---------------------------------------------------------------------------
@@ -430,12 +1172,7 @@ APPROACH_NAMES_LONG = {
 
 def format_db_line(values: list[int], start_idx: int, signed: bool) -> str:
     """Format a single DB line with 8 values."""
-    end_idx = start_idx + len(values) - 1
-    if signed:
-        parts = [f"{v:4d}" for v in values]
-    else:
-        parts = [f"{v:4d}" for v in values]
-    return f"    DB  {', '.join(parts)}  ; {start_idx}-{end_idx}"
+    return format_data_line(values, start_idx, "DB")
 
 
 def format_asm_table(label: str, values: list[int], signed: bool,
@@ -477,7 +1214,8 @@ def generate_approach1_asm(size: int, amplitude: int, unsigned: bool) -> str:
     """Generate full LUT assembly output."""
     values = approach1_full_lut(size, amplitude, unsigned)
     errors = compute_errors(values, size, amplitude, unsigned)
-    header = format_asm_header(1, size, amplitude, unsigned, errors)
+    extra = [cost_line(1, size, amplitude, unsigned)]
+    header = format_asm_header(1, size, amplitude, unsigned, errors, extra)
     table = format_asm_table("sine_table", values, not unsigned)
     return header + table
 
@@ -497,6 +1235,10 @@ def generate_approach2_asm(size: int, amplitude: int, unsigned: bool) -> str:
         f"{q+1}..{2*q-1} use table[{2*q}-i],",
         f"       {2*q}..{3*q} negate table[i-{2*q}], "
         f"{3*q+1}..{size-1} negate table[{4*q}-i]",
+        cost_line(2, size, amplitude, unsigned),
+        f"",
+        f"Z80 lookup routine (page-aligned sine_quarter):",
+        *routine_listing(quarter_lookup_routine(size)),
     ]
     header = format_asm_header(2, entries, amplitude, unsigned, errors, extra)
 
@@ -536,60 +1278,14 @@ def generate_approach3_asm(size: int, amplitude: int, unsigned: bool) -> str:
         + (" (fits in 4-bit nibble)" if nibble_packed
            else " (byte per delta)"),
         f"Reconstruct quarter from deltas, then full table via symmetry.",
+        cost_line(3, size, amplitude, unsigned),
     ]
 
-    if nibble_packed:
-        extra += [
-            f"",
-            f"Z80 reconstruction code (unpacks to sine_buffer):",
-            f"  ; Unpack nibble-packed deltas into quarter-wave table,",
-            f"  ; then reconstruct full table via symmetry.",
-            f"  ld hl, sine_packed    ; packed nibble data",
-            f"  ld de, sine_buffer    ; destination quarter table",
-            f"  xor a                 ; initial value = 0",
-            f"  ld b, {len(packed)}              ; packed byte count",
-            f".unpack:",
-            f"  ld (de), a            ; store current value",
-            f"  inc de",
-            f"  ld c, (hl)            ; get packed byte",
-            f"  push af               ; save accumulator",
-            f"  ld a, c",
-            f"  rrca",
-            f"  rrca",
-            f"  rrca",
-            f"  rrca",
-            f"  and $0F               ; high nibble = first delta",
-            f"  ld c, a",
-            f"  pop af",
-            f"  add a, c              ; accumulate first delta",
-            f"  ld (de), a            ; store value",
-            f"  inc de",
-            f"  push af",
-            f"  ld a, (hl)            ; re-read packed byte",
-            f"  and $0F               ; low nibble = second delta",
-            f"  ld c, a",
-            f"  pop af",
-            f"  add a, c              ; accumulate second delta",
-            f"  inc hl                ; next packed byte",
-            f"  djnz .unpack",
-        ]
-    else:
-        extra += [
-            f"",
-            f"Z80 reconstruction code (unpacks to sine_buffer):",
-            f"  ; Add byte deltas to reconstruct quarter-wave table.",
-            f"  ld hl, sine_deltas    ; delta byte data",
-            f"  ld de, sine_buffer    ; destination quarter table",
-            f"  xor a                 ; initial value = 0",
-            f"  ld b, {len(packed)}              ; delta count",
-            f".unpack:",
-            f"  ld (de), a            ; store current value",
-            f"  inc de",
-            f"  add a, (hl)           ; add delta",
-            f"  inc hl",
-            f"  djnz .unpack",
-            f"  ld (de), a            ; store final value",
-        ]
+    extra += [
+        f"",
+        f"Z80 reconstruction code (unpacks to sine_buffer):",
+        *routine_listing(delta_unpack_routine(len(packed), nibble_packed)),
+    ]
 
     header = format_asm_header(3, size, amplitude, unsigned, errors, extra)
 
@@ -628,37 +1324,35 @@ def generate_approach3_asm(size: int, amplitude: int, unsigned: bool) -> str:
     return "\n".join(lines)
 
 
+def _fixed_note(fixed: list[int], values: list[int]) -> str:
+    """How far a formula routine's output is from the listed table."""
+    diffs = [abs(a - b) for a, b in zip(fixed, values)]
+    if not any(diffs):
+        return "Routine output matches the table below exactly."
+    return (f"Routine output differs from the table below by at most "
+            f"{max(diffs)} in {sum(map(bool, diffs))} entries "
+            f"(8-bit fraction).")
+
+
 def generate_approach4_asm(size: int, amplitude: int, unsigned: bool) -> str:
     """Generate parabolic approximation assembly output."""
     values = approach4_parabolic(size, amplitude, unsigned)
     errors = compute_errors(values, size, amplitude, unsigned)
+    fixed_note = _fixed_note(parabolic_fixed(size, amplitude, unsigned),
+                             values)
 
     extra = [
         f"Parabolic approximation: sin(x) ≈ 4x(π-x)/π²",
         f"Max theoretical error vs true sine: ~5.6%",
         f"",
-        f"Z80 implementation (for 0..255 input range, 0..π mapped to 0..128):",
-        f"  ; Input: A = angle (0..255), Output: A = sin(angle)",
-        f"  ; Uses parabolic formula in fixed-point",
-        f"  ; For x in 0..128 (0..π):",
-        f"  ;   sin(x) ≈ 4*x*(128-x)/128  (scaled)",
-        f"  ; For x in 128..255 (π..2π):",
-        f"  ;   sin(x) = -sin(x-128)",
-        f"  ;",
-        f"  ; This requires one multiply but no lookup table.",
-        f"  para_sin:",
-        f"  ;   ld b, a          ; save original",
-        f"  ;   bit 7, a",
-        f"  ;   jr z, .positive",
-        f"  ;   neg              ; A = 256-A for second half",
-        f"  ; .positive:",
-        f"  ;   ld c, a          ; C = x (0..128)",
-        f"  ;   ld a, 128",
-        f"  ;   sub c            ; A = 128-x",
-        f"  ;   ; multiply C * A, result in HL",
-        f"  ;   call mul_8x8     ; HL = x*(128-x)",
-        f"  ;   ; scale: HL * 4 / 128 = HL >> 5",
-        f"  ;   ... (shift and negate if needed)",
+        cost_line(4, size, amplitude, unsigned),
+        f"",
+        f"Z80 implementation ({size // 2} = π, two 8x8 multiplies, "
+        f"no table):",
+        fixed_note,
+        *routine_listing(parabolic_routine(size, amplitude, unsigned)),
+        f"",
+        *routine_listing(mul_8x8_routine()),
     ]
     header = format_asm_header(4, size, amplitude, unsigned, errors, extra)
 
@@ -674,22 +1368,22 @@ def generate_approach5_asm(size: int, amplitude: int, unsigned: bool) -> str:
     """Generate Bhaskara I approximation assembly output."""
     values = approach5_bhaskara(size, amplitude, unsigned)
     errors = compute_errors(values, size, amplitude, unsigned)
+    fixed_note = _fixed_note(bhaskara_fixed(size, amplitude, unsigned), values)
 
     extra = [
         f"Bhaskara I approximation: sin(x) ≈ 16x(π-x) / (5π²-4x(π-x))",
         f"Max theoretical error vs true sine: ~0.15%",
         f"",
-        f"Z80 implementation sketch (fixed-point, 0..128 = 0..π):",
-        f"  ; Input: A = angle (0..255), Output: A = sin(angle)",
-        f"  ; For x in 0..128:",
-        f"  ;   p = x*(128-x)       ; 8-bit multiply",
-        f"  ;   num = 16*p           ; = p << 4",
-        f"  ;   den = 5*128*128 - 4*p  ; = 81920 - 4*p",
-        f"  ;   sin ≈ num / den      ; 16-bit division",
-        f"  ; For x in 128..255: negate result of (x-128)",
-        f"  ;",
-        f"  ; Requires 8x8 multiply and 16-bit divide.",
-        f"  ; More accurate than parabolic but heavier on CPU.",
+        cost_line(5, size, amplitude, unsigned),
+        f"",
+        f"Z80 implementation ({size // 2} = π, two 8x8 multiplies and an "
+        f"8-bit fraction divide):",
+        fixed_note,
+        *routine_listing(bhaskara_routine(size, amplitude, unsigned)),
+        f"",
+        *routine_listing(mul_8x8_routine()),
+        f"",
+        *routine_listing(div_frac_8_routine()),
     ]
     header = format_asm_header(5, size, amplitude, unsigned, errors, extra)
 
@@ -708,10 +1402,8 @@ def generate_approach6_asm(size: int, amplitude: int, unsigned: bool) -> str:
     theta = 2.0 * math.pi / size
     cos_theta = math.cos(theta)
 
-    COEFF_FRAC = 14
-    COEFF_SCALE = 1 << COEFF_FRAC
-    VAL_FRAC = 8
-    VAL_SCALE = 1 << VAL_FRAC
+    COEFF_SCALE = 1 << RECURSIVE_COEFF_FRAC
+    VAL_SCALE = 1 << RECURSIVE_VAL_FRAC
 
     two_cos_fp = int(round(2.0 * cos_theta * COEFF_SCALE))
     sin1_fp = int(round(math.sin(theta) * amplitude * VAL_SCALE))
@@ -726,26 +1418,12 @@ def generate_approach6_asm(size: int, amplitude: int, unsigned: bool) -> str:
         f"  sin(0) = 0, sin(1) = {sin1_fp} (${sin1_fp & 0xFFFF:04X}) (8.8)",
         f"",
         f"Z80 reconstruction code:",
-        f"  ; BC = sin(n-1) (8.8), DE = sin(n) (8.8)",
-        f"  ; Constant: 2cos(theta) = ${two_cos_fp & 0xFFFF:04X} (2.14)",
-        f"  ld bc, $0000           ; sin(0) = 0",
-        f"  ld de, ${sin1_fp & 0xFFFF:04X}           ; sin(1) in 8.8",
-        f".loop:",
-        f"  ld a, d                ; high byte = integer sine value",
-        f"  ; ... use A as sine value ...",
-        f"  ; Compute sin(n+1) = 2cos(theta)*sin(n) - sin(n-1)",
-        f"  push bc                ; save sin(n-1)",
-        f"  ; multiply DE (8.8) by 2cos (2.14) -> 32-bit, shift >>14",
-        f"  call mul_16x16_shr14   ; HL = (2cos * sin(n)) >> 14",
-        f"  pop bc                 ; BC = sin(n-1)",
-        f"  or a",
-        f"  sbc hl, bc             ; HL = result - sin(n-1)",
-        f"  ld b, d",
-        f"  ld c, e                ; BC = old sin(n)",
-        f"  ex de, hl              ; DE = new sin(n+1)",
-        f"  djnz .loop",
+        *routine_listing(recursive_routine(size, amplitude, unsigned)),
+        f"",
+        *routine_listing(mul_16x16_shr_routine(RECURSIVE_COEFF_FRAC)),
         f"",
         f"Bytes needed: 4 (two 16-bit values: sin(1), 2*cos(theta))",
+        cost_line(6, size, amplitude, unsigned),
     ]
     header = format_asm_header(6, size, amplitude, unsigned, errors, extra)
 
@@ -767,7 +1445,7 @@ def generate_approach7_asm(size: int, amplitude: int, unsigned: bool) -> str:
     values = approach7_cordic(size, amplitude, unsigned)
     errors = compute_errors(values, size, amplitude, unsigned)
 
-    ITERATIONS = 14
+    ITERATIONS = CORDIC_ITERATIONS
 
     # Atan table as 16-bit angle values (0..65536 = 0..2π)
     ANGLE_SCALE = 65536.0 / (2.0 * math.pi)
@@ -780,7 +1458,7 @@ def generate_approach7_asm(size: int, amplitude: int, unsigned: bool) -> str:
         K *= math.cos(atan_table_rad[i])
 
     # 8.8 fixed-point initial x
-    COORD_SCALE = 256
+    COORD_SCALE = 1 << CORDIC_COORD_FRAC
     init_x_fp = int(round(K * amplitude * COORD_SCALE))
 
     extra = [
@@ -800,20 +1478,14 @@ def generate_approach7_asm(size: int, amplitude: int, unsigned: bool) -> str:
 
     extra += [
         f"",
-        f"Z80 reconstruction code:",
-        f"  ; For each target angle, pre-rotate if |angle| > 90 deg,",
-        f"  ; then run {ITERATIONS} CORDIC iterations.",
-        f"  ; Pre-rotation: if target > $4000, start with (0, init_x)",
-        f"  ;               if target < $C000, start with (0, -init_x)",
-        f"  ; Each iteration: compare angle vs target,",
-        f"  ;   d = +1 if angle < target, else -1",
-        f"  ;   x' = x - d*(y >> i)  (arithmetic shift)",
-        f"  ;   y' = y + d*(x >> i)",
-        f"  ;   angle += d * atan_table[i]",
-        f"  ; Result: y >> 8 = sin(target_angle) * amplitude",
+        f"Z80 reconstruction code (one evaluation per table entry):",
+        *routine_listing(cordic_routine(amplitude, unsigned, ITERATIONS)),
+        f"",
+        *routine_listing(cordic_fill_routine(size)),
         f"",
         f"Data: {ITERATIONS * 2 + 2} bytes "
         f"({ITERATIONS} x 16-bit atan + 16-bit init_x)",
+        cost_line(7, size, amplitude, unsigned),
     ]
     header = format_asm_header(7, size, amplitude, unsigned, errors, extra)
 
@@ -965,25 +1637,30 @@ def generate_output(approach: int, size: int, amplitude: int,
 # --compare mode
 # ---------------------------------------------------------------------------
 
-def estimate_bytes(approach: int, size: int) -> str:
-    """Estimate storage bytes for each approach."""
+def approach_bytes(approach: int, size: int,
+                   iterations: int = CORDIC_ITERATIONS) -> int | None:
+    """Storage bytes for each approach (None if unknown)."""
     if approach == 1:
-        return str(size)
+        return size
     elif approach == 2:
-        return str(size // 4 + 1)
+        return size // 4 + 1
     elif approach == 3:
         # 1 initial + size/4/2 packed nibble bytes
-        return str(1 + size // 8)
-    elif approach == 4:
-        return "0"
-    elif approach == 5:
-        return "0"
+        return 1 + size // 8
+    elif approach in (4, 5):
+        return 0
     elif approach == 6:
-        return "4"
+        return 4
     elif approach == 7:
-        # 14 x 16-bit atan values + 16-bit init_x = 30 bytes
-        return "30"
-    return "?"
+        # 16-bit atan per iteration + 16-bit init_x (30 bytes for 14)
+        return iterations * 2 + 2
+    return None
+
+
+def estimate_bytes(approach: int, size: int) -> str:
+    """Estimate storage bytes for each approach."""
+    nbytes = approach_bytes(approach, size)
+    return "?" if nbytes is None else str(nbytes)
 
 
 def approach_notes(approach: int) -> str:
@@ -1006,10 +1683,12 @@ def run_compare(size: int, amplitude: int, unsigned: bool) -> str:
     lines = [
         f"Sine Table Approach Comparison (size={size}, "
         f"amplitude={amplitude}, {mode})",
-        f"=" * 72,
+        f"=" * 104,
         f"{'Approach':<10}{'Name':<25}{'Bytes':>6}  "
-        f"{'Max Error':>10}  {'RMS Error':>10}  {'Notes'}",
-        f"{'-'*10}{'-'*25}{'-'*6}  {'-'*10}  {'-'*10}  {'-'*20}",
+        f"{'Max Error':>10}  {'RMS Error':>10}  {'Gen T':>8}  "
+        f"{'Frames':>6}  {'Lookup T':>8}  {'Notes'}",
+        f"{'-'*10}{'-'*25}{'-'*6}  {'-'*10}  {'-'*10}  {'-'*8}  "
+        f"{'-'*6}  {'-'*8}  {'-'*20}",
     ]
 
     for approach in range(1, 8):
@@ -1026,18 +1705,574 @@ def run_compare(size: int, amplitude: int, unsigned: bool) -> str:
             max_str = f"{errors.max_pct:.3f}%"
             rms_str = f"{errors.rms_pct:.3f}%"
 
+        cost = cycle_cost(approach, size, amplitude, unsigned)
+        frames = f"{cost.generate / FRAME_TSTATES:.2f}"
+
         lines.append(
             f"{approach:<10}{name:<25}{bytes_str:>6}  "
-            f"{max_str:>10}  {rms_str:>10}  {notes}"
+            f"{max_str:>10}  {rms_str:>10}  {cost.generate:>8}  "
+            f"{frames:>6}  {cost.lookup:>8}  {notes}"
         )
 
     return "\n".join(lines)
 
 
+# ---------------------------------------------------------------------------
+# --sweep mode
+# ---------------------------------------------------------------------------
+
+SWEEP_SIZES = (64, 128, 256)
+SWEEP_AMPLITUDES = (63, 127)
+SWEEP_COEFF_FRACS = range(8, RECURSIVE_COEFF_FRAC + 1)
+SWEEP_VAL_FRACS = range(4, 9)
+SWEEP_ITERATIONS = range(6, 17)
+
+
+class SweepPoint(NamedTuple):
+    approach: int
+    size: int
+    amplitude: int
+    coeff_frac: int | None    # approach 6: coefficient fraction bits
+    val_frac: int | None      # approaches 6, 7: value fraction bits
+    iterations: int | None    # approach 7: CORDIC iterations
+    nbytes: int
+    tstates: int
+    max_err: float
+    rms_err: float
+
+
+def fits_16bit(amplitude: int, val_frac: int) -> bool:
+    """True if amplitude in val_frac fixed-point fits a signed register pair."""
+    return amplitude << val_frac <= 0x7FFF
+
+
+def sweep_grid(sizes, amplitudes, approaches=range(1, 8)
+               ) -> list[tuple[int, int, int, int | None, int | None,
+                               int | None]]:
+    """All (approach, size, amplitude, coeff_frac, val_frac, iterations)
+    points to evaluate, skipping formats that overflow 16 bits."""
+    grid = []
+    for size in sizes:
+        for amplitude in amplitudes:
+            for approach in approaches:
+                if approach in (2, 3) and size % 4:
+                    continue
+                if approach == 6:
+                    grid += [(6, size, amplitude, cf, vf, None)
+                             for cf in SWEEP_COEFF_FRACS
+                             for vf in SWEEP_VAL_FRACS
+                             if fits_16bit(amplitude, vf)]
+                elif approach == 7:
+                    grid += [(7, size, amplitude, None, vf, n)
+                             for n in SWEEP_ITERATIONS
+                             for vf in SWEEP_VAL_FRACS
+                             if fits_16bit(amplitude, vf)]
+                else:
+                    grid.append((approach, size, amplitude, None, None, None))
+    return grid
+
+
+def evaluate_point(point: tuple, unsigned: bool = False) -> SweepPoint:
+    """Generate one sweep point's table and measure it."""
+    approach, size, amplitude, coeff_frac, val_frac, iterations = point
+    if approach == 6:
+        values = approach6_recursive(size, amplitude, unsigned,
+                                     coeff_frac, val_frac)
+    elif approach == 7:
+        values = approach7_cordic(size, amplitude, unsigned,
+                                  iterations, val_frac)
+    else:
+        values = generate_values(approach, size, amplitude, unsigned)
+
+    if approach == 3:
+        # the real packed size (byte-packed when deltas exceed a nibble)
+        nbytes = approach3_delta_encoding(size, amplitude, unsigned)[3]
+    else:
+        nbytes = approach_bytes(approach, size, iterations or 0)
+    errors = compute_errors(values, size, amplitude, unsigned)
+    return SweepPoint(
+        approach, size, amplitude, coeff_frac, val_frac, iterations,
+        nbytes,
+        cycle_cost(approach, size, amplitude, unsigned,
+                   coeff_frac or RECURSIVE_COEFF_FRAC,
+                   iterations or CORDIC_ITERATIONS).generate,
+        errors.max_err, errors.rms_err,
+    )
+
+
+def _evaluate_signed(point: tuple) -> SweepPoint:
+    return evaluate_point(point, False)
+
+
+def _evaluate_unsigned(point: tuple) -> SweepPoint:
+    return evaluate_point(point, True)
+
+
+def pareto_front(points: list[SweepPoint]) -> list[SweepPoint]:
+    """Points not dominated on (bytes, T-states, max error), all minimised.
+
+    Duplicated objective vectors are kept once, first occurrence wins.
+    """
+    keys = [(p.nbytes, p.tstates, p.max_err) for p in points]
+    front = [points[j] for j in pareto_indices(keys)]
+    return sorted(front, key=lambda p: (p.nbytes, p.tstates, p.max_err))
+
+
+def run_sweep(sizes, amplitudes, unsigned: bool, jobs: int = 1,
+              approaches=range(1, 8)) -> list[tuple[SweepPoint, bool]]:
+    """Evaluate the sweep grid and return the Pareto-optimal points.
+
+    Fronts are taken per approach at each (size, amplitude), since error
+    in amplitude units only compares within one table shape. Each point
+    is paired with a flag: True if it is also on the front across all
+    approaches at that shape. With jobs > 1 the points are spread over a
+    process pool.
+    """
+    grid = sweep_grid(sizes, amplitudes, approaches)
+    worker = _evaluate_unsigned if unsigned else _evaluate_signed
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunk = max(1, len(grid) // (jobs * 8))
+            results = list(pool.map(worker, grid, chunksize=chunk))
+    else:
+        results = [worker(point) for point in grid]
+
+    rows: list[tuple[SweepPoint, bool]] = []
+    for size in sizes:
+        for amplitude in amplitudes:
+            shape = [r for r in results
+                     if r.size == size and r.amplitude == amplitude]
+            overall = set(pareto_front(shape))
+            for approach in approaches:
+                front = pareto_front([r for r in shape
+                                      if r.approach == approach])
+                rows += [(p, p in overall) for p in front]
+    return rows
+
+
+SWEEP_FIELDS = ("approach", "name", "size", "amplitude", "coeff_frac",
+                "val_frac", "iterations", "bytes", "tstates", "frames",
+                "max_error", "rms_error", "max_error_pct", "overall")
+
+
+def _sweep_row(p: SweepPoint, overall: bool) -> dict:
+    return {
+        "approach": p.approach,
+        "name": APPROACH_NAMES_LONG[p.approach],
+        "size": p.size,
+        "amplitude": p.amplitude,
+        "coeff_frac": p.coeff_frac,
+        "val_frac": p.val_frac,
+        "iterations": p.iterations,
+        "bytes": p.nbytes,
+        "tstates": p.tstates,
+        "frames": round(p.tstates / FRAME_TSTATES, 3),
+        "max_error": round(float(p.max_err), 4),
+        "rms_error": round(p.rms_err, 4),
+        "max_error_pct": round(p.max_err / p.amplitude * 100.0, 4),
+        "overall": int(overall),
+    }
+
+
+def format_sweep(points: list[tuple[SweepPoint, bool]], fmt: str) -> str:
+    """Format sweep results (see run_sweep) as CSV (default) or JSON."""
+    rows = [_sweep_row(p, overall) for p, overall in points]
+    if fmt == "json":
+        return json.dumps(rows, indent=2)
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=SWEEP_FIELDS,
+                            lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue().rstrip("\n")
+
+
+# ---------------------------------------------------------------------------
+# Coefficient search — minimax parabolic / Bhaskara routines
+# ---------------------------------------------------------------------------
+#
+# The textbook parabola and Bhaskara formulas are fitted to the real sine,
+# not to what an 8-bit routine can produce after truncation. Here each
+# routine is modelled exactly in integers (the same products, shifts and
+# divides the Z80 code does, over the half wave x = 0..half-1) and every
+# coefficient set on the lattice is scored against the rounded sine:
+# lowest max error first, then lowest squared error. All coefficients are
+# 8-bit multipliers, shift counts or small shift-and-add factors.
+#
+#   parabolic            y = ((p >> t) * m + r) >> 8,  p = x(half - x)
+#                        (t < 0 shifts left, for small tables)
+#   parabolic-corrected  y - (((y(B - y)) >> 6) * c >> 8), y as above
+#   bhaskara             y = (f * m + r) >> 8,  f = 256 * a*p // (K - p)
+#
+# r is 0 or 128 (round to nearest).
+
+OPTIMISE_FAMILIES = ("parabolic", "parabolic-corrected", "bhaskara")
+OPT_CORR_SPAN = 32                  # B = peak .. peak + 31
+OPT_CORR_MULS = range(1, 64)        # c, 6-bit
+OPTIMISE_COEFFICIENTS = {
+    "parabolic": ("pre_shift", "mul", "rounding"),
+    "parabolic-corrected": ("pre_shift", "mul", "rounding", "corr_base",
+                            "corr_mul"),
+    "bhaskara": ("num_mul", "den_const", "mul", "rounding"),
+}
+BHASKARA_NUM_MULS = (1, 2, 3, 4, 5, 6)
+BHASKARA_KAPPA = (4, 6)             # K / max(p) window; textbook is 5
+BHASKARA_K_BLOCK = 64
+DIV_FRAC_MAX = 32767                # div_frac_8 needs DE < 32768
+_SCORE_SHIFT = 24                   # score = max_err << 24 | sum of squares
+_INVALID = 1 << 62
+
+
+class Coefficients(NamedTuple):
+    family: str
+    size: int
+    amplitude: int
+    unsigned: bool
+    max_err: int
+    rms_err: float
+    candidates: int     # lattice points scored
+    mul: int            # m: final 8-bit multiplier
+    rounding: int       # r: 0 or 128
+    pre_shift: int = 0  # t: parabolic p >> t (<< -t if negative)
+    corr_base: int = 0  # B: corrected parabola
+    corr_mul: int = 0   # c: corrected parabola
+    num_mul: int = 0    # a: Bhaskara numerator a*p
+    den_const: int = 0  # K: Bhaskara denominator K - p
+
+
+def optimisable_size(size: int) -> bool:
+    """Sizes the routines can index: a power of two, 4..256."""
+    return 4 <= size <= 256 and size & (size - 1) == 0
+
+
+def _half_products(size: int):
+    half = size // 2
+    x = np.arange(half, dtype=np.int64)
+    return x * (half - x)
+
+
+def parabolic_model(size: int, pre_shift: int, mul, rounding):
+    """Half-wave output of the parabolic routine (broadcasts mul and
+    rounding against the half-wave axis, which is last)."""
+    p = _half_products(size)
+    q = p >> pre_shift if pre_shift >= 0 else p << -pre_shift
+    return (q * np.asarray(mul)[..., None] + np.asarray(rounding)[..., None]) >> 8
+
+
+def correction_model(y, corr_base, corr_mul):
+    """Apply the corrected-parabola step to half-wave values y."""
+    w = y * (np.asarray(corr_base)[..., None] - y)
+    return y - (((w >> 6) * np.asarray(corr_mul)[..., None]) >> 8)
+
+
+def bhaskara_fraction(size: int, num_mul: int, den_const):
+    """f = 256 * a*p // (K - p) as div_frac_8 computes it, with a mask of
+    the K values for which the divide is in range at every x."""
+    p = _half_products(size)
+    den = np.asarray(den_const)[..., None] - p
+    num = num_mul * p
+    valid = ((num < den) & (den <= DIV_FRAC_MAX)).all(axis=-1)
+    return (num << 8) // np.maximum(den, 1), valid
+
+
+def optimised_half_wave(c: Coefficients):
+    """Half-wave output of the routine for a coefficient set."""
+    if c.family == "bhaskara":
+        frac, _ = bhaskara_fraction(c.size, c.num_mul, c.den_const)
+        return (frac * c.mul + c.rounding) >> 8
+    y = parabolic_model(c.size, c.pre_shift, c.mul, c.rounding)
+    if c.family == "parabolic-corrected":
+        y = correction_model(y, c.corr_base, c.corr_mul)
+    return y
+
+
+def optimised_values(c: Coefficients) -> list[int]:
+    """Full table the routine produces, for output and verification."""
+    y = optimised_half_wave(c)
+    values = np.concatenate([y, -y])
+    if c.unsigned:
+        values += c.amplitude
+    return values.tolist()
+
+
+def _score(y, size: int, amplitude: int, unsigned: bool):
+    """Score half-wave candidates (last axis) against the rounded sine;
+    candidates that leave the output range score _INVALID."""
+    ref = reference_table(size, amplitude, unsigned).astype(y.dtype)
+    half = size // 2
+    offset = amplitude if unsigned else 0
+    top = min(amplitude, 255 - amplitude) if unsigned else 127
+    e1 = np.abs(y + (offset - ref[:half]))
+    e2 = np.abs((offset - ref[half:]) - y)
+    max_err = np.maximum(e1.max(axis=-1), e2.max(axis=-1))
+    sum_sq = (e1 * e1).sum(axis=-1) + (e2 * e2).sum(axis=-1)
+    valid = (y >= 0).all(axis=-1) & (y <= top).all(axis=-1)
+    score = (max_err.astype(np.int64) << _SCORE_SHIFT) | sum_sq
+    return np.where(valid, score, _INVALID)
+
+
+def _best(scores) -> tuple[int, tuple[int, ...]]:
+    """Lowest score and its index into the candidate axes."""
+    j = int(np.argmin(scores))
+    return int(scores.flat[j]), tuple(map(int, np.unravel_index(j, scores.shape)))
+
+
+def _lattice(family: str, size: int, amplitude: int) -> list[tuple]:
+    """Outer lattice points; each is searched with the inner axes
+    vectorised (see _search_item)."""
+    pmax = int(_half_products(size).max())
+    t_min = pmax.bit_length() - 8        # negative: shift p left
+    if family == "parabolic":
+        return [(t, r) for t in range(t_min, t_min + 3) for r in (0, 128)]
+    if family == "parabolic-corrected":
+        return [(t, m, r) for t in range(t_min, t_min + 3)
+                for m in range(1, 256) for r in (0, 128)]
+    items = []
+    for a in BHASKARA_NUM_MULS:
+        lo = max(BHASKARA_KAPPA[0] * pmax, (a + 1) * pmax + 1)
+        hi = min(BHASKARA_KAPPA[1] * pmax, DIV_FRAC_MAX)
+        items += [(a, k) for k in range(lo, hi + 1, BHASKARA_K_BLOCK)]
+    return items
+
+
+def _search_item(item: tuple) -> tuple[int, tuple, int]:
+    """Best (score, coefficients, candidates) at one outer lattice point.
+
+    item = (family, size, amplitude, unsigned, outer)."""
+    family, size, amplitude, unsigned, outer = item
+    muls = np.arange(1, 256, dtype=np.int32)
+    if family == "parabolic":
+        t, r = outer
+        y = parabolic_model(size, t, muls, r)
+        score, (jm,) = _best(_score(y, size, amplitude, unsigned))
+        return score, (t, jm + 1, r), len(muls)
+    if family == "parabolic-corrected":
+        t, m, r = outer
+        y = parabolic_model(size, t, m, r)
+        peak = int(y.max())
+        if peak > 255:
+            return _INVALID, (), 0
+        bases = np.arange(peak, min(255, peak + OPT_CORR_SPAN - 1) + 1)
+        corr = np.array(OPT_CORR_MULS)
+        y2 = correction_model(y, bases[:, None], corr[None, :])
+        score, (jb, jc) = _best(_score(y2, size, amplitude, unsigned))
+        return (score, (t, m, r, int(bases[jb]), int(corr[jc])),
+                bases.size * corr.size)
+    a, k0 = outer
+    pmax = int(_half_products(size).max())
+    k_hi = min(BHASKARA_KAPPA[1] * pmax, DIV_FRAC_MAX)
+    ks = np.arange(k0, min(k0 + BHASKARA_K_BLOCK, k_hi + 1))
+    frac, valid = bhaskara_fraction(size, a, ks)
+    frac = frac.astype(np.int32)        # products stay < 2^16
+    rounding = np.array([0, 128], dtype=np.int32)
+    # axes: (K, m, r, x)
+    y = (frac[:, None, None, :] * muls[None, :, None, None]
+         + rounding[None, None, :, None]) >> 8
+    scores = _score(y, size, amplitude, unsigned)
+    scores = np.where(valid[:, None, None], scores, _INVALID)
+    score, (jk, jm, jr) = _best(scores)
+    return (score, (a, int(ks[jk]), jm + 1, int(rounding[jr])),
+            scores.size)
+
+
+def optimise(family: str, size: int, amplitude: int, unsigned: bool,
+             jobs: int = 1) -> Coefficients:
+    """Exhaustive minimax search over the family's coefficient lattice.
+
+    Raises ValueError if no coefficient set stays in the output range.
+    """
+    items = [(family, size, amplitude, unsigned, outer)
+             for outer in _lattice(family, size, amplitude)]
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunk = max(1, len(items) // (jobs * 8))
+            results = list(pool.map(_search_item, items, chunksize=chunk))
+    else:
+        results = [_search_item(item) for item in items]
+
+    score, params = min((s, p) for s, p, _ in results)
+    if score >= _INVALID:
+        raise ValueError(f"no {family} coefficients fit size {size}, "
+                         f"amplitude {amplitude}")
+    candidates = sum(n for _, _, n in results)
+    max_err = score >> _SCORE_SHIFT
+    rms_err = math.sqrt((score & ((1 << _SCORE_SHIFT) - 1)) / size)
+    common = dict(family=family, size=size, amplitude=amplitude,
+                  unsigned=unsigned, max_err=max_err, rms_err=rms_err,
+                  candidates=candidates)
+    if family == "parabolic":
+        t, m, r = params
+        return Coefficients(**common, mul=m, rounding=r, pre_shift=t)
+    if family == "parabolic-corrected":
+        t, m, r, b, c = params
+        return Coefficients(**common, mul=m, rounding=r, pre_shift=t,
+                            corr_base=b, corr_mul=c)
+    a, k, m, r = params
+    return Coefficients(**common, mul=m, rounding=r, num_mul=a, den_const=k)
+
+
+def _times_de(factor: int) -> tuple[str, ...]:
+    """HL = factor * DE for HL = DE on entry, by shift-and-add."""
+    lines = []
+    for bit in bin(factor)[3:]:
+        lines.append("  add hl, hl")
+        if bit == "1":
+            lines.append("  add hl, de")
+    return tuple(lines)
+
+
+def _scale_and_round(mul: int, rounding: int, what: str) -> tuple[str, ...]:
+    lines = (
+        f"  ld c, {what}",
+        f"  ld e, {mul}",
+        "  call mul_8x8          ; HL = C * E",
+        "  ld a, h               ; A = HL >> 8",
+    )
+    if rounding:
+        lines += (
+            "  sla l                 ; carry = bit 7 of L",
+            "  adc a, 0              ; round to nearest",
+        )
+    return lines
+
+
+def optimised_routine(c: Coefficients) -> Routine:
+    """The Z80 routine whose output optimised_values() models exactly."""
+    half = c.size // 2
+    name = "bhaskara_sin" if c.family == "bhaskara" else "para_sin"
+    lines = (
+        f"{name}:{' ' * max(1, 22 - len(name))}; A = angle -> A = sine",
+        "  ld b, a               ; keep the half bit for the sign",
+        f"  and {half - 1}",
+        "  ld c, a               ; C = x",
+        f"  ld a, {half}",
+        "  sub c",
+        "  ld e, a               ; E = half - x",
+        "  push bc",
+        "  call mul_8x8          ; HL = p = x * (half - x)",
+    )
+    if c.family == "bhaskara":
+        lines += ("  ld d, h",
+                  "  ld e, l               ; DE = p",
+                  ) + _times_de(c.num_mul) + (
+                  f"  push hl               ; {c.num_mul}p (numerator)",
+                  f"  ld hl, {c.den_const}",
+                  "  or a",
+                  "  sbc hl, de",
+                  "  ex de, hl             ; DE = K - p (denominator)",
+                  "  pop hl",
+                  "  call div_frac_8       ; A = 256 * num / den",
+                  ) + _scale_and_round(c.mul, c.rounding, "a")
+    else:
+        if c.pre_shift >= 0:
+            lines += ("  srl h",
+                      "  rr l") * c.pre_shift
+        else:
+            lines += ("  add hl, hl",) * -c.pre_shift
+        lines += _scale_and_round(c.mul, c.rounding, "l")
+    if c.family == "parabolic-corrected":
+        lines += (
+            "  ld c, a               ; C = y",
+            "  neg",
+            f"  add a, {c.corr_base}",
+            f"  ld e, a               ; E = {c.corr_base} - y",
+            "  call mul_8x8          ; HL = y * (B - y)",
+            "  add hl, hl",
+            "  add hl, hl            ; H = HL >> 6",
+            "  ld a, c",
+            "  ld c, h",
+            f"  ld e, {c.corr_mul}",
+            "  push af",
+            "  call mul_8x8          ; H = correction",
+            "  pop af",
+            "  sub h                 ; A = y - correction",
+        )
+    lines += _sign_tail(half, c.amplitude, c.unsigned)
+    return Routine(name, (CodeBlock(lines),))
+
+
+def optimised_cost(c: Coefficients) -> CycleCost:
+    """T-states per lookup (with the call) and to fill the full table."""
+    routine = optimised_routine(c)
+    helpers = _helper_costs(mul_8x8_routine(), div_frac_8_routine())
+    helpers[routine.name] = routine_tstates(routine, helpers)
+    generate = routine_tstates(fill_routine(c.size, routine.name), helpers)
+    return CycleCost(generate, CALL_TSTATES + helpers[routine.name])
+
+
+def _coefficient_text(c: Coefficients) -> str:
+    if c.family == "bhaskara":
+        return f"a={c.num_mul}, K={c.den_const}, m={c.mul}, r={c.rounding}"
+    text = f"t={c.pre_shift}, m={c.mul}, r={c.rounding}"
+    if c.family == "parabolic-corrected":
+        text += f", B={c.corr_base}, c={c.corr_mul}"
+    return text
+
+
+def format_optimised(c: Coefficients, fmt: str) -> str:
+    """The best coefficients as a ready-to-assemble routine, or JSON."""
+    textbook = 5 if c.family == "bhaskara" else 4
+    baseline = compute_errors(generate_values(textbook, c.size, c.amplitude,
+                                              c.unsigned),
+                              c.size, c.amplitude, c.unsigned)
+    cost = optimised_cost(c)
+    if fmt == "json":
+        data = {
+            "family": c.family,
+            "size": c.size,
+            "amplitude": c.amplitude,
+            "unsigned": c.unsigned,
+            "coefficients": {k: getattr(c, k)
+                             for k in OPTIMISE_COEFFICIENTS[c.family]},
+            "candidates": c.candidates,
+            "max_error": c.max_err,
+            "rms_error": round(c.rms_err, 4),
+            "textbook_max_error": baseline.max_err,
+            "lookup_tstates": cost.lookup,
+            "generate_tstates": cost.generate,
+            "values": optimised_values(c),
+        }
+        return json.dumps(data, indent=2)
+
+    mode = "unsigned" if c.unsigned else "signed"
+    amp = c.amplitude
+    helpers = [mul_8x8_routine()]
+    if c.family == "bhaskara":
+        helpers.append(div_frac_8_routine())
+    lines = [
+        f"; Minimax {c.family} sine, {c.size} entries, amplitude {amp} "
+        f"({mode})",
+        f"; Generated by sinetable.py --optimise (spectools)",
+        f"; Coefficients: {_coefficient_text(c)} "
+        f"(best of {c.candidates} candidates)",
+        f"; Max error: {c.max_err} ({c.max_err / amp * 100.0:.3f}%), "
+        f"RMS error: {c.rms_err:.3f} ({c.rms_err / amp * 100.0:.3f}%) "
+        f"vs rounded sine",
+        f"; Textbook approach {textbook} ({APPROACH_NAMES[textbook]}): "
+        f"max error {baseline.max_err}",
+        f"; Z80 cost: lookup {cost.lookup} T-states, full table "
+        f"{cost.generate} T-states ({cost.generate / FRAME_TSTATES:.2f} "
+        f"frames)",
+        "",
+        *routine_listing(optimised_routine(c)),
+    ]
+    for helper in helpers:
+        lines += ["", *routine_listing(helper)]
+    return "\n".join(lines)
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
 
+def _int_list(text: str) -> tuple[int, ...]:
+    """argparse type for comma-separated integers."""
+    try:
+        return tuple(int(v) for v in text.split(",") if v.strip())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a list of integers: {text}")
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(
@@ -1049,7 +2284,9 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
                "  %(prog)s --approach 1 --size 256 --amplitude 127\n"
                "  %(prog)s --approach 2 --size 256 --amplitude 127 --format c\n"
                "  %(prog)s --approach 5 --unsigned --amplitude 100\n"
-               "  %(prog)s --compare\n",
+               "  %(prog)s --compare\n"
+               "  %(prog)s --sweep --sizes 64,128,256 --amplitudes 127 -j 0\n"
+               "  %(prog)s --optimise bhaskara --size 256 -j 0\n",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
@@ -1090,6 +2327,37 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         help="Compare all 7 approaches side by side. "
              "Ignores --approach flag."
     )
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Sweep size x amplitude x fixed-point format x iterations "
+             "and print the Pareto front (bytes, T-states, max error) per "
+             "approach as CSV, or JSON with --format json"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=_int_list, default=SWEEP_SIZES, metavar="N,N,...",
+        help="Table sizes for --sweep (default: 64,128,256)"
+    )
+    parser.add_argument(
+        "--amplitudes",
+        type=_int_list, default=SWEEP_AMPLITUDES, metavar="N,N,...",
+        help="Amplitudes for --sweep (default: 63,127)"
+    )
+    parser.add_argument(
+        "--optimise",
+        choices=OPTIMISE_FAMILIES, metavar="FAMILY",
+        help="Search integer coefficients for the minimax parabolic, "
+             "parabolic-corrected or bhaskara routine at --size and "
+             "--amplitude; prints the routine (asm) or the coefficients "
+             "and table (json). Needs NumPy"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int, default=1, metavar="N",
+        help="Worker processes for --sweep and --optimise "
+             "(default: 1, 0 = all CPUs)"
+    )
 
     args = parser.parse_args(argv)
 
@@ -1104,6 +2372,23 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     if not args.unsigned and args.amplitude > 127:
         parser.error("--amplitude exceeds signed byte range (max 127). "
                      "Use --unsigned for larger values.")
+    if args.optimise:
+        if not optimisable_size(args.size):
+            parser.error("--optimise needs a power-of-two --size, 4..256")
+        if args.format == "c":
+            parser.error("--optimise prints asm or json")
+        if args.amplitude > 127:
+            parser.error("--optimise needs --amplitude at most 127: an "
+                         "unsigned routine's output spans 0..2*amplitude, "
+                         "which must fit a byte")
+    if args.sweep:
+        if min(args.sizes) < 4:
+            parser.error("--sizes must all be at least 4")
+        if min(args.amplitudes) < 1:
+            parser.error("--amplitudes must all be at least 1")
+        if not args.unsigned and max(args.amplitudes) > 127:
+            parser.error("--amplitudes exceed signed byte range (max 127). "
+                         "Use --unsigned for larger values.")
 
     return args
 
@@ -1112,7 +2397,24 @@ def main(argv: list[str] | None = None) -> None:
     """Main entry point."""
     args = parse_args(argv)
 
-    if args.compare:
+    if args.optimise:
+        if np is None:
+            print("Error: --optimise needs NumPy.\n"
+                  "Install it with:  pip install spectools[fast]",
+                  file=sys.stderr)
+            sys.exit(1)
+        try:
+            best = optimise(args.optimise, args.size, args.amplitude,
+                            args.unsigned, jobs=args.jobs or os.cpu_count() or 1)
+        except ValueError as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            sys.exit(1)
+        print(format_optimised(best, args.format))
+    elif args.sweep:
+        points = run_sweep(args.sizes, args.amplitudes, args.unsigned,
+                           jobs=args.jobs or os.cpu_count() or 1)
+        print(format_sweep(points, args.format))
+    elif args.compare:
         print(run_compare(args.size, args.amplitude, args.unsigned))
     else:
         output = generate_output(
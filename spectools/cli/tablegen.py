@@ -0,0 +1,669 @@
+#!/usr/bin/env python3
+"""
+Function Table Generator for Z80 Assembly Development.
+
+The sinetable pipeline (ideal -> quantise -> approximate -> error ->
+asm/C/JSON) for any function: square tables for multiplies, reciprocal
+and perspective tables, log/exp, atan, colour maps. Tables are declared
+in a TOML config as vectorised NumPy expressions over the index array,
+and one run emits all of them.
+Part of spectools for the "Coding the Impossible" book project.
+
+Usage:
+    python tablegen.py ../../demo/tables.toml
+    python tablegen.py ../../demo/tables.toml -o ../../build/tables.a80
+    python tablegen.py ../../demo/tables.toml --compare
+    python tablegen.py ../../demo/tables.toml --check ../../demo/src/*.a80
+
+Config:
+    [params]                      # constants visible to every expression
+    view_dist = 200
+
+    [[table]]
+    name = "sqr4"                 # label
+    size = 512
+    expr = "i * i / 4"            # ideal value, float; i = 0..size-1
+    type = "u16"                  # u8, s8, u16, s16
+    round = "floor"               # nearest (default), floor, ceil, trunc
+    split = true                  # DW tables as sqr4_lo / sqr4_hi pages
+    align = 256
+
+    [[table]]
+    name = "sin_parabolic"
+    size = 256
+    expr = "127 * sin(2 * pi * i / n)"
+    approx = "..."                # stored values; errors are vs expr
+    type = "s8"
+    group = "sine"                # --compare marks the Pareto front per group
+
+Expressions see i, n (the size), pi, e, the [params] and per-table
+params, and NumPy's elementwise functions (sin, cos, arctan2, log2,
+sqrt, where, clip, ...). No builtins. Requires NumPy (spectools[fast]).
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import numpy as np
+except ImportError:  # required for expressions; checked in main()
+    np = None
+
+try:
+    import tomllib
+except ModuleNotFoundError:
+    # Python < 3.11
+    try:
+        import tomli as tomllib  # type: ignore[no-redef]
+    except ModuleNotFoundError:
+        tomllib = None  # type: ignore[assignment]
+
+
+# ---------------------------------------------------------------------------
+# Table specs
+# ---------------------------------------------------------------------------
+
+# type -> (min, max, bytes per entry)
+TYPE_RANGES = {
+    "u8": (0, 255, 1),
+    "s8": (-128, 127, 1),
+    "u16": (0, 65535, 2),
+    "s16": (-32768, 32767, 2),
+}
+
+C_TYPES = {"u8": "uint8_t", "s8": "int8_t", "u16": "uint16_t",
+           "s16": "int16_t"}
+
+ROUND_MODES = ("nearest", "floor", "ceil", "trunc")
+
+EXPR_FUNCTIONS = (
+    "sin", "cos", "tan", "arcsin", "arccos", "arctan", "arctan2",
+    "sinh", "cosh", "tanh", "exp", "exp2", "log", "log2", "log10",
+    "sqrt", "cbrt", "abs", "sign", "floor", "ceil", "trunc", "rint",
+    "hypot", "minimum", "maximum", "clip", "where", "mod", "power",
+    "radians", "degrees",
+)
+
+
+class TableSpec(NamedTuple):
+    """One [[table]] entry. Hashable, so generation can be memoised."""
+    name: str
+    size: int
+    expr: str
+    approx: str = ""
+    type: str = "u8"
+    round: str = "nearest"
+    clamp: bool = False
+    align: int = 0
+    split: bool = False
+    hex: bool = False
+    per_line: int = 8
+    group: str = ""
+    comment: str = ""
+    params: tuple[tuple[str, float], ...] = ()
+
+    @property
+    def width(self) -> int:
+        return TYPE_RANGES[self.type][2]
+
+    @property
+    def signed(self) -> bool:
+        return self.type.startswith("s")
+
+    @property
+    def nbytes(self) -> int:
+        return self.size * self.width
+
+
+def spec_from_config(entry: dict, params: dict | None = None) -> TableSpec:
+    """Build a TableSpec from a [[table]] dict, merging global params.
+
+    Raises ValueError for unknown keys or out-of-range settings.
+    """
+    fields = set(TableSpec._fields)
+    unknown = set(entry) - fields
+    if unknown:
+        raise ValueError(f"table {entry.get('name', '?')}: unknown key(s) "
+                         f"{', '.join(sorted(unknown))}")
+    for key in ("name", "size", "expr"):
+        if key not in entry:
+            raise ValueError(f"table {entry.get('name', '?')}: "
+                             f"missing '{key}'")
+    merged = dict(params or {})
+    merged.update(entry.get("params", {}))
+    spec = TableSpec(**{**entry, "params": tuple(sorted(merged.items()))})
+
+    if spec.type not in TYPE_RANGES:
+        raise ValueError(f"table {spec.name}: type must be one of "
+                         f"{', '.join(TYPE_RANGES)}")
+    if spec.round not in ROUND_MODES:
+        raise ValueError(f"table {spec.name}: round must be one of "
+                         f"{', '.join(ROUND_MODES)}")
+    if spec.size < 1:
+        raise ValueError(f"table {spec.name}: size must be at least 1")
+    if spec.per_line < 1:
+        raise ValueError(f"table {spec.name}: per_line must be at least 1")
+    if spec.split and spec.width == 1:
+        raise ValueError(f"table {spec.name}: split needs a 16-bit type")
+    return spec
+
+
+def load_config(path: str) -> tuple[list[TableSpec], dict]:
+    """Read a TOML table config. Returns (specs, raw config)."""
+    if tomllib is None:
+        print("Error: Python 3.11+ or 'tomli' package required for TOML support",
+              file=sys.stderr)
+        sys.exit(1)
+
+    config_path = Path(path)
+    if not config_path.exists():
+        print(f"Error: config file not found: {config_path}", file=sys.stderr)
+        sys.exit(1)
+
+    with open(config_path, "rb") as f:
+        config = tomllib.load(f)
+
+    params = config.get("params", {})
+    specs = [spec_from_config(entry, params)
+             for entry in config.get("table", [])]
+    names = [s.name for s in specs]
+    dupes = sorted({n for n in names if names.count(n) > 1})
+    if dupes:
+        raise ValueError(f"duplicate table name(s): {', '.join(dupes)}")
+    return specs, config
+
+
+# ---------------------------------------------------------------------------
+# Generation — ideal -> quantise, memoised
+# ---------------------------------------------------------------------------
+
+class ErrorStats(NamedTuple):
+    max_err: float      # maximum absolute error vs ideal (in output units)
+    rms_err: float      # RMS error vs ideal
+    max_pct: float      # max error as percentage of amplitude
+    rms_pct: float      # RMS error as percentage of amplitude
+
+
+class Table(NamedTuple):
+    spec: TableSpec
+    ideal: tuple[float, ...]
+    values: tuple[int, ...]
+    errors: ErrorStats
+
+
+@lru_cache(maxsize=None)
+def _namespace() -> dict:
+    ns = {name: getattr(np, name) for name in EXPR_FUNCTIONS}
+    ns.update(pi=math.pi, e=math.e)
+    return ns
+
+
+def evaluate(expr: str, size: int, params: tuple = ()) -> "np.ndarray":
+    """Evaluate an expression over i = 0..size-1 as a float64 array."""
+    ns = dict(_namespace())
+    ns.update(params)
+    ns.update(i=np.arange(size), n=size)
+    try:
+        code = compile(expr, "<expr>", "eval")
+        result = eval(code, {"__builtins__": {}}, ns)
+    except Exception as exc:
+        raise ValueError(f"cannot evaluate '{expr}': {exc}") from None
+    values = np.asarray(result, dtype=np.float64)
+    if values.ndim > 1:
+        raise ValueError(f"'{expr}' is not one-dimensional")
+    return np.broadcast_to(values, (size,))
+
+
+def quantize_array(values: "np.ndarray", mode: str) -> "np.ndarray":
+    """Round a float array to int64 with the given rounding mode."""
+    rounders = {"nearest": np.rint, "floor": np.floor, "ceil": np.ceil,
+                "trunc": np.trunc}
+    if not np.isfinite(values).all():
+        raise ValueError("expression is not finite at every index")
+    return rounders[mode](values).astype(np.int64)
+
+
+def error_stats(approx, ideal, amplitude: float) -> ErrorStats:
+    """Max/RMS error of approx against ideal, absolute and relative."""
+    err = np.abs(np.asarray(approx, dtype=np.float64) - ideal)
+    max_err = float(err.max()) if err.size else 0.0
+    rms_err = math.sqrt(float(np.dot(err, err)) / err.size) if err.size else 0.0
+    amp = amplitude if amplitude > 0 else 1.0
+    return ErrorStats(
+        max_err=max_err,
+        rms_err=rms_err,
+        max_pct=max_err / amp * 100.0,
+        rms_pct=rms_err / amp * 100.0,
+    )
+
+
+@lru_cache(maxsize=None)
+def _generate(expr: str, approx: str, size: int, type_: str, mode: str,
+              clamp: bool, params: tuple) -> tuple:
+    # keyed on what determines the values only, so tables that differ in
+    # name or layout share one evaluation
+    ideal = evaluate(expr, size, params)
+    values = quantize_array(evaluate(approx or expr, size, params), mode)
+    lo, hi, _ = TYPE_RANGES[type_]
+    if clamp:
+        values = np.clip(values, lo, hi)
+    elif values.size and (values.min() < lo or values.max() > hi):
+        bad = int(np.flatnonzero((values < lo) | (values > hi))[0])
+        raise ValueError(f"value {int(values[bad])} at index {bad} is out of "
+                         f"{type_} range {lo}..{hi} (set clamp = true?)")
+    amplitude = float(np.abs(ideal).max()) if size else 0.0
+    errors = error_stats(values, ideal, amplitude)
+    return tuple(ideal.tolist()), tuple(values.tolist()), errors
+
+
+def build_table(spec: TableSpec) -> Table:
+    """Generate a table from its spec (memoised on the value inputs)."""
+    try:
+        ideal, values, errors = _generate(spec.expr, spec.approx, spec.size,
+                                          spec.type, spec.round, spec.clamp,
+                                          spec.params)
+    except ValueError as exc:
+        raise ValueError(f"table {spec.name}: {exc}") from None
+    return Table(spec, ideal, values, errors)
+
+
+def table_bytes(table: Table) -> bytes:
+    """The table as it sits in Z80 memory (little-endian; split tables
+    as the low page followed by the high page)."""
+    spec = table.spec
+    mask = (1 << (8 * spec.width)) - 1
+    words = [v & mask for v in table.values]
+    if spec.width == 1:
+        return bytes(words)
+    if spec.split:
+        return bytes(w & 0xFF for w in words) + bytes(w >> 8 for w in words)
+    return b"".join(w.to_bytes(2, "little") for w in words)
+
+
+# ---------------------------------------------------------------------------
+# Pareto comparison
+# ---------------------------------------------------------------------------
+
+def pareto_indices(keys: list[tuple]) -> list[int]:
+    """Indices of the keys not dominated by any other, all objectives
+    minimised. Duplicated keys are kept once, first occurrence wins."""
+    if not keys:
+        return []
+    if np is not None:
+        obj = np.array(keys, dtype=np.float64)
+        le = (obj[:, None, :] <= obj[None, :, :]).all(axis=2)
+        lt = (obj[:, None, :] < obj[None, :, :]).any(axis=2)
+        dominated = (le & lt).any(axis=0)
+        keep = np.flatnonzero(~dominated).tolist()
+    else:
+        keep = [
+            j for j, kj in enumerate(keys)
+            if not any(all(a <= b for a, b in zip(ki, kj)) and ki != kj
+                       for ki in keys)
+        ]
+    seen: set[tuple] = set()
+    front = []
+    for j in keep:
+        if keys[j] not in seen:
+            seen.add(keys[j])
+            front.append(j)
+    return front
+
+
+def pareto_tables(tables: list[Table]) -> set[str]:
+    """Names of the tables on the (bytes, max error, RMS error) front of
+    their group. Ungrouped tables are their own group."""
+    groups: dict[str, list[Table]] = {}
+    for t in tables:
+        groups.setdefault(t.spec.group or t.spec.name, []).append(t)
+    front = set()
+    for members in groups.values():
+        keys = [(t.spec.nbytes, t.errors.max_err, t.errors.rms_err)
+                for t in members]
+        front.update(members[j].spec.name for j in pareto_indices(keys))
+    return front
+
+
+def run_compare(tables: list[Table]) -> str:
+    """Side-by-side size and error summary, Pareto front marked '*'."""
+    front = pareto_tables(tables)
+    lines = []
+    lines.append(f"{'':1s} {'Table':<20s} {'Group':<12s} {'Type':<4s} "
+                 f"{'Size':>6s} {'Bytes':>6s} {'Max err':>9s} "
+                 f"{'Max %':>8s} {'RMS err':>9s}")
+    lines.append("-" * 82)
+    for t in tables:
+        s, e = t.spec, t.errors
+        mark = "*" if s.name in front else " "
+        lines.append(f"{mark} {s.name:<20s} {s.group or '-':<12s} "
+                     f"{s.type:<4s} {s.size:>6d} {s.nbytes:>6d} "
+                     f"{e.max_err:>9.3f} {e.max_pct:>7.3f}% "
+                     f"{e.rms_err:>9.3f}")
+    lines.append("")
+    lines.append("* = Pareto-optimal on (bytes, max error, RMS error) "
+                 "within its group")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Output formatting — shared emitter
+# ---------------------------------------------------------------------------
+
+def format_data_line(values, start_idx: int, directive: str = "DB",
+                     hex_digits: int = 0) -> str:
+    """Format one DB/DW line, decimal with an index-range comment or,
+    with hex_digits, as $-prefixed hex."""
+    if hex_digits:
+        mask = (1 << (4 * hex_digits)) - 1
+        parts = [f"${v & mask:0{hex_digits}X}" for v in values]
+        return f"    {directive} {', '.join(parts)}"
+    end_idx = start_idx + len(values) - 1
+    parts = [f"{v:4d}" for v in values]
+    return f"    {directive}  {', '.join(parts)}  ; {start_idx}-{end_idx}"
+
+
+def format_data_block(label: str, values, directive: str = "DB",
+                      per_line: int = 8, hex_digits: int = 0,
+                      align: int = 0) -> list[str]:
+    """Label plus data lines, optionally preceded by ALIGN."""
+    lines = [f"    ALIGN {align}"] if align else []
+    lines.append(f"{label}:")
+    for i in range(0, len(values), per_line):
+        lines.append(format_data_line(values[i:i + per_line], i,
+                                      directive, hex_digits))
+    return lines
+
+
+def _error_line(errors: ErrorStats) -> str:
+    if errors.max_err == 0:
+        return "Max error: 0.000 (exact)"
+    return (f"Max error: {errors.max_err:.3f} ({errors.max_pct:.3f}%), "
+            f"RMS error: {errors.rms_err:.3f} ({errors.rms_pct:.3f}%)")
+
+
+def format_asm_table(table: Table) -> str:
+    spec = table.spec
+    lines = [f"; {spec.name} — {spec.size} x {spec.type}, "
+             f"{spec.approx or spec.expr}"]
+    if spec.comment:
+        lines.append(f"; {spec.comment}")
+    if spec.approx:
+        lines.append(f"; Approximates {spec.expr}")
+    lines.append(f"; {_error_line(table.errors)}")
+
+    hex_digits = 2 * spec.width if spec.hex else 0
+    if spec.split:
+        mask = (1 << 16) - 1
+        words = [v & mask for v in table.values]
+        lines += format_data_block(f"{spec.name}_lo", [w & 0xFF for w in words],
+                                   "DB", spec.per_line, spec.hex and 2,
+                                   spec.align)
+        lines += format_data_block(f"{spec.name}_hi", [w >> 8 for w in words],
+                                   "DB", spec.per_line, spec.hex and 2,
+                                   spec.align)
+    else:
+        directive = "DB" if spec.width == 1 else "DW"
+        lines += format_data_block(spec.name, table.values, directive,
+                                   spec.per_line, hex_digits, spec.align)
+    return "\n".join(lines)
+
+
+def format_asm(tables: list[Table], source: str) -> str:
+    parts = [f"; Generated by tablegen.py (spectools) from {source}",
+             "; Do not edit — change the config and regenerate", ""]
+    for t in tables:
+        parts.append(format_asm_table(t))
+        parts.append("")
+    return "\n".join(parts)
+
+
+def format_c_table(table: Table) -> str:
+    spec = table.spec
+    lines = [f"/* {spec.name}: {spec.approx or spec.expr} */",
+             f"/* {_error_line(table.errors)} */",
+             f"const {C_TYPES[spec.type]} {spec.name}[{spec.size}] = {{"]
+    per_line = spec.per_line
+    for i in range(0, spec.size, per_line):
+        chunk = table.values[i:i + per_line]
+        sep = "," if i + per_line < spec.size else ""
+        lines.append(f"    {', '.join(f'{v:6d}' for v in chunk)}{sep}")
+    lines.append("};")
+    return "\n".join(lines)
+
+
+def format_c(tables: list[Table], source: str) -> str:
+    parts = [f"/* Generated by tablegen.py (spectools) from {source} */",
+             "", "#include <stdint.h>", ""]
+    for t in tables:
+        parts.append(format_c_table(t))
+        parts.append("")
+    return "\n".join(parts)
+
+
+def format_json(tables: list[Table], source: str) -> str:
+    data = {
+        "source": source,
+        "tables": [
+            {
+                "name": t.spec.name,
+                "size": t.spec.size,
+                "type": t.spec.type,
+                "expr": t.spec.expr,
+                "approx": t.spec.approx or None,
+                "bytes": t.spec.nbytes,
+                "max_error": round(t.errors.max_err, 4),
+                "rms_error": round(t.errors.rms_err, 4),
+                "values": list(t.values),
+            }
+            for t in tables
+        ],
+    }
+    return json.dumps(data, indent=2) + "\n"
+
+
+FORMATTERS = {"asm": format_asm, "c": format_c, "json": format_json}
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Write text to path unless it already holds exactly that. Keeps
+    mtimes stable so make doesn't rebuild on a no-op regeneration."""
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Checking against hand-written sources
+# ---------------------------------------------------------------------------
+
+LABEL_RE = re.compile(r"^([A-Za-z_.][\w.]*):")
+DATA_RE = re.compile(r"^\s+(DB|DEFB|DW|DEFW)\s+(.*)$", re.IGNORECASE)
+
+
+def _parse_number(token: str) -> int:
+    token = token.strip()
+    sign = -1 if token.startswith("-") else 1
+    token = token.lstrip("+-").strip()
+    if token[:1] in "$#":
+        return sign * int(token[1:], 16)
+    if token[:1] == "%":
+        return sign * int(token[1:], 2)
+    if token.lower().endswith("h"):
+        return sign * int(token[:-1], 16)
+    return sign * int(token, 0)
+
+
+def parse_asm_tables(path: Path) -> dict[str, bytes]:
+    """Numeric DB/DW data under each label of an assembly source, as
+    bytes. Data lines with symbols or strings end the label's data."""
+    tables: dict[str, bytearray] = {}
+    current = None
+    for raw in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        line = raw.split(";", 1)[0].rstrip()
+        if not line.strip():
+            continue
+        m = LABEL_RE.match(line)
+        if m:
+            current = m.group(1)
+            tables[current] = bytearray()
+            continue
+        m = DATA_RE.match(line)
+        if current is None or not m:
+            if not line.strip().upper().startswith("ALIGN"):
+                current = None
+            continue
+        width = 1 if m.group(1).upper() in ("DB", "DEFB") else 2
+        try:
+            values = [_parse_number(t) for t in m.group(2).split(",")]
+        except ValueError:
+            current = None
+            continue
+        for v in values:
+            tables[current] += (v & ((1 << (8 * width)) - 1)).to_bytes(
+                width, "little")
+    return {name: bytes(data) for name, data in tables.items() if data}
+
+
+def _split_sources(table: Table, sources: dict[str, bytes]) -> bytes | None:
+    spec = table.spec
+    lo = sources.get(f"{spec.name}_lo")
+    hi = sources.get(f"{spec.name}_hi")
+    return lo + hi if lo is not None and hi is not None else None
+
+
+def check_tables(tables: list[Table], paths: list[str]) -> tuple[str, bool]:
+    """Compare generated tables with the same labels in asm sources.
+    Returns (report, ok); tables absent from every source are listed
+    but don't fail the check."""
+    sources: dict[str, tuple[str, bytes]] = {}
+    for path in paths:
+        for name, data in parse_asm_tables(Path(path)).items():
+            sources.setdefault(name, (path, data))
+
+    lines, ok, found = [], True, 0
+    flat = {name: data for name, (_, data) in sources.items()}
+    for t in tables:
+        name = t.spec.name
+        want = table_bytes(t)
+        if name in sources:
+            origin, have = sources[name]
+        elif t.spec.split and _split_sources(t, flat) is not None:
+            origin, have = sources[f"{name}_lo"][0], _split_sources(t, flat)
+        else:
+            lines.append(f"  --  {name} (not in sources)")
+            continue
+        found += 1
+        if have == want:
+            lines.append(f"  OK  {name} ({origin})")
+            continue
+        ok = False
+        if len(have) != len(want):
+            lines.append(f"DIFF  {name} ({origin}): {len(have)} bytes in "
+                         f"source, {len(want)} generated")
+        else:
+            k = next(j for j in range(len(want)) if have[j] != want[j])
+            lines.append(f"DIFF  {name} ({origin}): byte {k} is "
+                         f"${have[k]:02X} in source, ${want[k]:02X} generated")
+    if not found:
+        ok = False
+        lines.append("No generated table found in the given sources")
+    return "\n".join(lines), ok
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="tablegen",
+        description="Function Table Generator for Z80 Assembly Development. "
+                    "Generates every table in a TOML config from NumPy "
+                    "expressions, with error analysis against the ideal.",
+        epilog="Examples:\n"
+               "  %(prog)s demo/tables.toml\n"
+               "  %(prog)s demo/tables.toml -o build/tables.a80\n"
+               "  %(prog)s demo/tables.toml --format c --only sin_table\n"
+               "  %(prog)s demo/tables.toml --compare\n"
+               "  %(prog)s demo/tables.toml --check demo/src/*.a80\n",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("config", help="TOML table config")
+    parser.add_argument(
+        "-o", "--output", metavar="FILE",
+        help="Write to FILE (only if its content changes) instead of stdout"
+    )
+    parser.add_argument(
+        "--format", "-f",
+        choices=list(FORMATTERS), default="asm",
+        help="Output format (default: asm)"
+    )
+    parser.add_argument(
+        "--only", metavar="NAME,NAME,...",
+        help="Generate only these tables"
+    )
+    parser.add_argument(
+        "--compare", "-c",
+        action="store_true",
+        help="Print size and error per table, marking the Pareto front "
+             "of each group"
+    )
+    parser.add_argument(
+        "--check", nargs="+", metavar="ASM",
+        help="Verify the generated bytes match the same labels in these "
+             "assembly sources; exit 1 on any mismatch"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Main entry point."""
+    args = parse_args(argv)
+
+    if np is None:
+        print("Error: NumPy is required for table expressions.\n"
+              "Install it with:  pip install spectools[fast]",
+              file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        specs, _ = load_config(args.config)
+        if args.only:
+            wanted = [n.strip() for n in args.only.split(",") if n.strip()]
+            missing = set(wanted) - {s.name for s in specs}
+            if missing:
+                raise ValueError(f"no such table(s): "
+                                 f"{', '.join(sorted(missing))}")
+            specs = [s for s in specs if s.name in wanted]
+        tables = [build_table(spec) for spec in specs]
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.check:
+        report, ok = check_tables(tables, args.check)
+        print(report)
+        if not ok:
+            sys.exit(1)
+    elif args.compare:
+        print(run_compare(tables))
+    else:
+        text = FORMATTERS[args.format](tables, Path(args.config).name)
+        if args.output:
+            if write_if_changed(Path(args.output), text):
+                print(f"Wrote {args.output}", file=sys.stderr)
+        else:
+            print(text, end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@ Usage:
 """
 
 import argparse
+import csv
 import json
 import math
 import shutil
@@ -272,9 +273,46 @@ def load_config(config_path):
                 resolved.append(p)
             effect["_resolved_data"] = resolved
 
+    # Per-frame music cost curve (musicprof CSV) replacing music_tstates
+    music = config.get("music", {})
+    if "profile" in music:
+        p = Path(music["profile"])
+        if not p.is_absolute():
+            candidate = config_dir / p
+            if not candidate.exists():
+                candidate = ROOT / p
+            p = candidate
+        music["_resolved_profile"] = p
+
     return config
 
 
+def load_music_profile(path):
+    """Read the music_tstates column of a musicprof CSV."""
+    if not path.exists():
+        print(f"Error: music profile not found: {path}", file=sys.stderr)
+        sys.exit(1)
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        if "music_tstates" not in (reader.fieldnames or []):
+            print(f"Error: {path} has no music_tstates column", file=sys.stderr)
+            sys.exit(1)
+        try:
+            profile = [int(row["music_tstates"]) for row in reader]
+        except ValueError as e:
+            print(f"Error: {path}: {e}", file=sys.stderr)
+            sys.exit(1)
+    if not profile:
+        print(f"Error: music profile {path} is empty", file=sys.stderr)
+        sys.exit(1)
+    return profile
+
+
+def music_window(profile, start, duration):
+    """Music cost of frames start..start+duration; the song loops."""
+    return [profile[(start + f) % len(profile)] for f in range(duration)]
+
+
 # ---------------------------------------------------------------------------
 # Mode: bench
 # ---------------------------------------------------------------------------
@@ -547,6 +585,9 @@ def cmd_timeline(args):
         print("No effects defined in config.", file=sys.stderr)
         sys.exit(1)
 
+    music_path = config.get("music", {}).get("_resolved_profile")
+    profile = load_music_profile(music_path) if music_path else None
+
     # Build effect list with computed compressed sizes
     effect_list = []
     for eff in effects:
@@ -629,6 +670,7 @@ def cmd_timeline(args):
 
         remaining = eff["compressed"] - overlap
 
+        min_needed = 0
         if remaining > 0:
             if eff["streaming"]:
                 # Streaming: only need code_size decompressed to start
@@ -636,6 +678,34 @@ def cmd_timeline(args):
                 if min_needed > 0:
                     pause_t = min_needed * eff["tpb"]
                     entry["pause_frames"] = math.ceil(pause_t / tpf)
+            else:
+                # Full decompression required before start
+                pause_t = remaining * eff["tpb"]
+                entry["pause_frames"] = math.ceil(pause_t / tpf)
+
+        current_frame += entry["pause_frames"]
+        entry["play_start"] = current_frame
+        entry["play_end"] = current_frame + eff["duration"]
+        current_frame = entry["play_end"]
+
+        if profile is not None and eff["duration"] > 0:
+            # Music runs from frame 0 of the demo; cost this effect's window
+            window = music_window(profile, entry["play_start"], eff["duration"])
+            eff["music_t"] = round(sum(window) / len(window))
+            eff["music_peak"] = max(window)
+            eff["spare_t"] = round(sum(max(0, tpf - eff["render_t"] - m)
+                                       for m in window) / len(window))
+            over = sum(1 for m in window if eff["render_t"] + m > tpf)
+            entry["music_mean"] = eff["music_t"]
+            entry["music_peak"] = eff["music_peak"]
+            entry["frames_over_budget"] = over
+            if over:
+                entry["notes"].append(
+                    f"WARNING: {over} frames over budget "
+                    f"(render + music peak {eff['music_peak']:,d}T)")
+
+        if remaining > 0:
+            if eff["streaming"]:
                 # Rest decompressed during playback
                 still_left = remaining - min_needed
                 if still_left > 0 and eff["spare_t"] > 0:
@@ -647,15 +717,6 @@ def cmd_timeline(args):
                             f"WARNING: streaming needs {stream_frames}f "
                             f"but effect lasts {eff['duration']}f!")
                 entry["notes"].append("streaming enabled")
-            else:
-                # Full decompression required before start
-                pause_t = remaining * eff["tpb"]
-                entry["pause_frames"] = math.ceil(pause_t / tpf)
-
-        current_frame += entry["pause_frames"]
-        entry["play_start"] = current_frame
-        entry["play_end"] = current_frame + eff["duration"]
-        current_frame = entry["play_end"]
 
         transitions.append(entry)
 
@@ -702,6 +763,10 @@ def cmd_timeline(args):
             print(f"    streaming: {t['stream_during']} frames of background "
                   f"decompression during playback")
 
+        if "music_peak" in t:
+            print(f"    music: mean {t['music_mean']:,d} T/frame, "
+                  f"peak {t['music_peak']:,d} T (profile)")
+
         spare_bpf = eff["spare_t"] / eff["tpb"] if eff["tpb"] > 0 else 0
         print(f"    spare: {eff['spare_t']:,d} T/frame → "
               f"{spare_bpf:,.0f} bytes/frame for next effect")
@@ -8,28 +8,48 @@ Context: A sine table has 256 entries indexed by angle (0=0 deg, 64=90 deg,
 representing -1.0 to ~+1.0. This is the standard demoscene format.
 
 For the book: "Coding the Impossible: Z80 Demoscene Techniques for Modern Makers"
+
+Run without arguments for the comparison report (Appendix B). --verify
+runs the regression harness instead: every sinetable approach and
+optimised routine at several table sizes, plus the 256-entry variants
+below, in a process pool. Results are cached under build/cache keyed on
+the hash of the table engine's source, and compared with
+verify/sine_baseline.json; any error that grows beyond --tolerance, or
+any size or T-state cost that grows, fails the run.
+
+Usage:
+    python3 verify/sine_compare.py
+    python3 verify/sine_compare.py --verify -j 0
+    python3 verify/sine_compare.py --verify --json > summary.json
+    python3 verify/sine_compare.py --update-baseline
 """
 
+import argparse
+import hashlib
+import json
 import math
+import os
 import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add project root to path for the spectools table engine
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from spectools.cli import sinetable
+
+AMPLITUDE = 127
 
 # ---------------------------------------------------------------------------
 # Generate the ground-truth 256-byte sine table
 # ---------------------------------------------------------------------------
 
 def true_sine_table():
-    """Generate the reference 256-entry signed-byte sine table."""
-    table = []
-    for i in range(256):
-        # angle in radians: full circle = 256 steps
-        angle = 2.0 * math.pi * i / 256.0
-        # scale to signed byte range: sin in [-1,1] -> [-128, +127]
-        # We use round() for best accuracy; clamp to [-128, 127]
-        val = math.sin(angle) * 127.0
-        val = int(round(val))
-        val = max(-128, min(127, val))
-        table.append(val)
-    return table
+    """The reference 256-entry signed-byte sine table: round(127 * sin),
+    from sinetable's exact LUT."""
+    return sinetable.approach1_full_lut(256, AMPLITUDE, False)
 
 
 # ---------------------------------------------------------------------------
@@ -182,22 +202,9 @@ def approach_parabolic(true_table):
         ; Check sign bit of original angle and negate: ~5 bytes
       ; Total estimate: ~35 bytes for inline, ~40 with multiply routine
     """
-    parabolic = []
-    for i in range(256):
-        x = i & 0x7F  # 0..127
-        # parabola: x * (128-x), max at x=64 = 4096
-        raw = x * (128 - x)
-        # scale to 0..127: divide by 4096 and multiply by 127
-        # = raw * 127 / 4096
-        # For integer: raw >> 5 gives max 128, close enough
-        # Let's use the more accurate: int(round(raw * 127.0 / 4096.0))
-        val = int(round(raw * 127.0 / 4096.0))
-
-        if i >= 128:
-            val = -val
-
-        val = max(-128, min(127, val))
-        parabolic.append(val)
+    # round(x * (128 - x) * 127 / 4096) per half, negated for the second:
+    # sinetable's approach 4 at 256 entries
+    parabolic = sinetable.approach4_parabolic(256, AMPLITUDE, False)
 
     code_bytes = 38  # realistic estimate for Z80 with 8x8 multiply
 
@@ -628,36 +635,10 @@ def approach_bhaskara(true_table):
 
     On Z80 this needs 8x8→16 multiply + 16÷16 divide.
     """
-    # Compute first half (indices 0-128, covering 0° to 180°) via Bhaskara I.
-    # The formula works for x in [0, π]. Map index i in [0, 128] to
-    # x = i*π/128 radians.
-    half_bhaskara = []
-    for i in range(129):
-        if i == 0 or i == 128:
-            half_bhaskara.append(0)
-        else:
-            x = i * math.pi / 128.0
-            prod = x * (math.pi - x)
-            numerator = 16.0 * prod
-            denominator = 5.0 * math.pi * math.pi - 4.0 * prod
-            val = 127.0 * numerator / denominator
-            half_bhaskara.append(int(round(val)))
-
-    # Extract quarter (first 65 entries)
-    quarter_bhaskara = half_bhaskara[0:65]
-
-    # Reconstruct full 256-entry table from quarter
-    bhaskara_table = [0] * 256
-    for i in range(256):
-        negate = (i >= 128)
-        idx = i if i < 128 else i - 128
-        if idx <= 64:
-            val = quarter_bhaskara[idx]
-        else:
-            val = quarter_bhaskara[128 - idx]
-        if negate:
-            val = max(-128, -val)
-        bhaskara_table[i] = val
+    # sinetable's approach 5 at 256 entries; it is symmetric, so the
+    # first 65 entries are the quarter wave
+    bhaskara_table = sinetable.approach5_bhaskara(256, AMPLITUDE, False)
+    quarter_bhaskara = bhaskara_table[0:65]
 
     # Count how many quarter-wave entries differ from true sine
     quarter_true = true_table[0:65]
@@ -702,15 +683,11 @@ def approach_bhaskara(true_table):
 # ---------------------------------------------------------------------------
 
 def measure_error(true_table, test_table):
-    """Compute max absolute error and RMS error."""
-    max_err = 0
-    sum_sq = 0
-    for i in range(256):
-        err = abs(true_table[i] - test_table[i])
-        max_err = max(max_err, err)
-        sum_sq += err * err
-    rms = math.sqrt(sum_sq / 256.0)
-    return max_err, rms
+    """Max absolute and RMS error vs true_table, which is sinetable's
+    rounded reference, so its compute_errors does the work."""
+    stats = sinetable.compute_errors(test_table, len(true_table), AMPLITUDE,
+                                     False)
+    return int(stats.max_err), stats.rms_err
 
 
 # ---------------------------------------------------------------------------
@@ -748,13 +725,12 @@ def visual_comparison(true_table, parabolic_table):
 
 
 # ---------------------------------------------------------------------------
-# Main comparison
+# Comparison entries
 # ---------------------------------------------------------------------------
 
-def main():
-    true_table = true_sine_table()
-
-    # Generate all approaches
+def comparison_entries(true_table):
+    """Every variant as a uniform dict: name, data/code/total bytes,
+    max/RMS error, notes and the RAM buffer it needs."""
     a1 = approach_full_table(true_table)
     a2 = approach_quarter_wave(true_table)
     a3 = approach_parabolic(true_table)
@@ -765,75 +741,6 @@ def main():
     a8 = approach_hybrid_quarter_delta(true_table)
     a9 = approach_bhaskara(true_table)
 
-    # --------------- Visual comparison ---------------
-    visual_comparison(true_table, a3["table"])
-
-    # --------------- Delta analysis ---------------
-    print("=" * 78)
-    print("DELTA ANALYSIS")
-    print("=" * 78)
-
-    print("\n--- Approach 4: Parabolic correction deltas ---")
-    print(f"  Full 256 delta range:    {a4['delta_range_full']}")
-    print(f"  Unique delta values:     {len(a4['unique_deltas_full'])} "
-          f"values: {a4['unique_deltas_full']}")
-    print(f"  Bits needed (signed):    {a4['bits_needed']}")
-    print(f"  Quarter 64 delta range:  {a4['delta_range_quarter']}")
-    print(f"  Quarter unique values:   {len(a4['unique_deltas_quarter'])} "
-          f"values: {a4['unique_deltas_quarter']}")
-
-    print("\n--- Approach 5: First differences of true sine ---")
-    print(f"  Delta range: {a5['delta_range']}")
-    print(f"  Bits per delta: {a5['bits_per_delta']}")
-    print(f"  Fits in 4-bit signed (nibble): {a5['fits_4bit']}")
-    print(f"  Fits in 5-bit signed:          {a5['fits_5bit']}")
-    print(f"  Quarter delta range:           {a5['delta_quarter_range']}")
-    print(f"  Quarter delta bits:            {a5['delta_quarter_bits']}")
-
-    print("\n--- Approach 6: RLE on deltas ---")
-    print(f"  Full: {a6['num_runs_full']} runs "
-          f"({a6['data_bytes_full']} bytes)")
-    print(f"  Quarter: {a6['num_runs_quarter']} runs "
-          f"({a6['data_bytes_quarter']} bytes)")
-
-    print("\n--- Approach 7: Second-order deltas ---")
-    print(f"  d2 range:   {a7['d2_range']}")
-    print(f"  d2 unique:  {a7['d2_unique']}")
-    print(f"  d2 bits:    {a7['d2_bits']}")
-    print(f"  Quarter d2 range:   {a7['d2q_range']}")
-    print(f"  Quarter d2 unique:  {a7['d2q_unique']}")
-    print(f"  Quarter d2 bits:    {a7['d2q_bits']}")
-
-    print("\n--- Approach 8: Hybrid quarter + delta ---")
-    print(f"  Quarter d1 range:   {a8['d1_range']}")
-    print(f"  Quarter d1 bits:    {a8['d1_bits']}")
-    print(f"  Quarter d2 range:   {a8['d2_range']}")
-    print(f"  Quarter d2 unique:  {a8['d2_unique']}")
-    print(f"  Quarter d2 bits:    {a8['d2_bits']}")
-
-    print("\n--- Approach 9: Bhaskara I (629 CE) ---")
-    print(f"  Corrections needed: {a9['num_corrections']} out of 65 quarter entries")
-    print(f"  Correction positions: {a9['corrections']}")
-    print(f"  Code (standalone):  ~{a9['code_bytes']}B (includes mul+div)")
-    print(f"  Code (marginal):    ~{a9['code_bytes_marginal']}B (if mul+div exist)")
-
-    # Print first 16 deltas of each type for inspection
-    print("\n--- Sample deltas (first 16 of full stream) ---")
-    d5 = a5["deltas_full"][:16]
-    d4 = a4["deltas_full"][:16]
-    d7_d1 = [true_table[i + 1] - true_table[i] for i in range(16)]
-    d7_d2 = [d7_d1[i + 1] - d7_d1[i] for i in range(15)]
-    print(f"  True sine values: {true_table[:16]}")
-    print(f"  1st diff (d5):    {d5}")
-    print(f"  2nd diff (d7):    {d7_d2}")
-    print(f"  Para correction:  {d4}")
-
-    # --------------- Main comparison table ---------------
-    print()
-    print("=" * 98)
-    print("COMPREHENSIVE COMPARISON TABLE")
-    print("=" * 98)
-
     # Collect all variants into a uniform list
     entries = []
 
@@ -1061,6 +968,97 @@ def main():
                  f"positions. Exact. No RAM needed.",
         "needs_ram": 0,
     })
+    return entries
+
+
+# ---------------------------------------------------------------------------
+# Main comparison
+# ---------------------------------------------------------------------------
+
+def print_report():
+    true_table = true_sine_table()
+
+    # Generate all approaches
+    a1 = approach_full_table(true_table)
+    a2 = approach_quarter_wave(true_table)
+    a3 = approach_parabolic(true_table)
+    a4 = approach_parabolic_correction(true_table)
+    a5 = approach_delta_encoded(true_table)
+    a6 = approach_delta_rle(true_table)
+    a7 = approach_second_order_delta(true_table)
+    a8 = approach_hybrid_quarter_delta(true_table)
+    a9 = approach_bhaskara(true_table)
+
+    # --------------- Visual comparison ---------------
+    visual_comparison(true_table, a3["table"])
+
+    # --------------- Delta analysis ---------------
+    print("=" * 78)
+    print("DELTA ANALYSIS")
+    print("=" * 78)
+
+    print("\n--- Approach 4: Parabolic correction deltas ---")
+    print(f"  Full 256 delta range:    {a4['delta_range_full']}")
+    print(f"  Unique delta values:     {len(a4['unique_deltas_full'])} "
+          f"values: {a4['unique_deltas_full']}")
+    print(f"  Bits needed (signed):    {a4['bits_needed']}")
+    print(f"  Quarter 64 delta range:  {a4['delta_range_quarter']}")
+    print(f"  Quarter unique values:   {len(a4['unique_deltas_quarter'])} "
+          f"values: {a4['unique_deltas_quarter']}")
+
+    print("\n--- Approach 5: First differences of true sine ---")
+    print(f"  Delta range: {a5['delta_range']}")
+    print(f"  Bits per delta: {a5['bits_per_delta']}")
+    print(f"  Fits in 4-bit signed (nibble): {a5['fits_4bit']}")
+    print(f"  Fits in 5-bit signed:          {a5['fits_5bit']}")
+    print(f"  Quarter delta range:           {a5['delta_quarter_range']}")
+    print(f"  Quarter delta bits:            {a5['delta_quarter_bits']}")
+
+    print("\n--- Approach 6: RLE on deltas ---")
+    print(f"  Full: {a6['num_runs_full']} runs "
+          f"({a6['data_bytes_full']} bytes)")
+    print(f"  Quarter: {a6['num_runs_quarter']} runs "
+          f"({a6['data_bytes_quarter']} bytes)")
+
+    print("\n--- Approach 7: Second-order deltas ---")
+    print(f"  d2 range:   {a7['d2_range']}")
+    print(f"  d2 unique:  {a7['d2_unique']}")
+    print(f"  d2 bits:    {a7['d2_bits']}")
+    print(f"  Quarter d2 range:   {a7['d2q_range']}")
+    print(f"  Quarter d2 unique:  {a7['d2q_unique']}")
+    print(f"  Quarter d2 bits:    {a7['d2q_bits']}")
+
+    print("\n--- Approach 8: Hybrid quarter + delta ---")
+    print(f"  Quarter d1 range:   {a8['d1_range']}")
+    print(f"  Quarter d1 bits:    {a8['d1_bits']}")
+    print(f"  Quarter d2 range:   {a8['d2_range']}")
+    print(f"  Quarter d2 unique:  {a8['d2_unique']}")
+    print(f"  Quarter d2 bits:    {a8['d2_bits']}")
+
+    print("\n--- Approach 9: Bhaskara I (629 CE) ---")
+    print(f"  Corrections needed: {a9['num_corrections']} out of 65 quarter entries")
+    print(f"  Correction positions: {a9['corrections']}")
+    print(f"  Code (standalone):  ~{a9['code_bytes']}B (includes mul+div)")
+    print(f"  Code (marginal):    ~{a9['code_bytes_marginal']}B (if mul+div exist)")
+
+    # Print first 16 deltas of each type for inspection
+    print("\n--- Sample deltas (first 16 of full stream) ---")
+    d5 = a5["deltas_full"][:16]
+    d4 = a4["deltas_full"][:16]
+    d7_d1 = [true_table[i + 1] - true_table[i] for i in range(16)]
+    d7_d2 = [d7_d1[i + 1] - d7_d1[i] for i in range(15)]
+    print(f"  True sine values: {true_table[:16]}")
+    print(f"  1st diff (d5):    {d5}")
+    print(f"  2nd diff (d7):    {d7_d2}")
+    print(f"  Para correction:  {d4}")
+
+    # --------------- Main comparison table ---------------
+    print()
+    print("=" * 98)
+    print("COMPREHENSIVE COMPARISON TABLE")
+    print("=" * 98)
+
+    entries = comparison_entries(true_table)
 
     # Print main table
     hdr = (f"{'#':>3} {'Approach':<38} {'Data':>5} {'Code':>5} "
@@ -1184,5 +1182,262 @@ For Z80 demoscene work, the practical choices come down to:
 """)
 
 
+# ---------------------------------------------------------------------------
+# Regression harness
+# ---------------------------------------------------------------------------
+
+HARNESS_SIZES = (64, 128, 256)
+BASELINE = Path(__file__).with_name("sine_baseline.json")
+CACHE = ROOT / "build" / "cache" / "sine_compare.json"
+ENGINE_SOURCES = (
+    ROOT / "spectools" / "cli" / "sinetable.py",
+    ROOT / "spectools" / "cli" / "tablegen.py",
+    ROOT / "spectools" / "cli" / "tstate.py",
+    Path(__file__).resolve(),
+)
+
+
+def source_hash() -> str:
+    """SHA-256 over the table engine and this file; results computed by
+    the same sources are reused from the cache."""
+    h = hashlib.sha256()
+    for path in ENGINE_SOURCES:
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def harness_tasks(sizes) -> list[tuple]:
+    """(kind, approach, size) for every result the harness checks."""
+    tasks = [("sinetable", str(a), size)
+             for size in sizes for a in range(1, 8)]
+    if sinetable.np is not None:  # the optimiser needs NumPy
+        tasks += [("optimise", family, size) for size in sizes
+                  for family in sinetable.OPTIMISE_FAMILIES]
+    if 256 in sizes:  # the report's variants are 256-entry only
+        tasks.append(("variants", "", 256))
+    return tasks
+
+
+def _task_key(task: tuple) -> str:
+    kind, approach, size = task
+    return f"{kind}/{approach}/{size}"
+
+
+def run_task(task: tuple) -> list[dict]:
+    """Evaluate one harness task; returns one result row per approach."""
+    kind, approach, size = task
+    if kind == "sinetable":
+        n = int(approach)
+        values = sinetable.generate_values(n, size, AMPLITUDE, False)
+        stats = sinetable.compute_errors(values, size, AMPLITUDE, False)
+        cost = sinetable.cycle_cost(n, size, AMPLITUDE, False)
+        return [{
+            "id": f"sinetable/{n}/{size}",
+            "name": sinetable.APPROACH_NAMES_LONG[n],
+            "size": size,
+            "bytes": sinetable.approach_bytes(n, size),
+            "generate_tstates": cost.generate,
+            "lookup_tstates": cost.lookup,
+            "max_error": float(stats.max_err),
+            "rms_error": round(stats.rms_err, 4),
+        }]
+    if kind == "optimise":
+        best = sinetable.optimise(approach, size, AMPLITUDE, False)
+        cost = sinetable.optimised_cost(best)
+        return [{
+            "id": f"optimise/{approach}/{size}",
+            "name": f"Minimax {approach}",
+            "size": size,
+            "bytes": 0,
+            "generate_tstates": cost.generate,
+            "lookup_tstates": cost.lookup,
+            "max_error": float(best.max_err),
+            "rms_error": round(best.rms_err, 4),
+        }]
+    return [{
+        "id": f"variants/{e['name'].split('.')[0]}/256",
+        "name": e["name"],
+        "size": 256,
+        "bytes": e["total"],
+        "generate_tstates": None,
+        "lookup_tstates": None,
+        "max_error": float(e["max_err"]),
+        "rms_error": round(e["rms_err"], 4),
+    } for e in comparison_entries(true_sine_table())]
+
+
+def _load_json(path: Path) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def run_harness(sizes, jobs: int = 1, use_cache: bool = True) -> dict:
+    """Run every task (reusing cached results from identical sources)
+    and return the summary: source hash, amplitude and result rows."""
+    digest = source_hash()
+    cached = _load_json(CACHE) if use_cache else None
+    done = {}
+    if cached and cached.get("source_hash") == digest:
+        done = cached.get("tasks", {})
+
+    tasks = harness_tasks(sizes)
+    todo = [t for t in tasks if _task_key(t) not in done]
+    if jobs > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            fresh = list(pool.map(run_task, todo))
+    else:
+        fresh = [run_task(t) for t in todo]
+    for task, rows in zip(todo, fresh):
+        done[_task_key(task)] = rows
+
+    if use_cache and todo:
+        CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with open(CACHE, "w", encoding="utf-8") as f:
+            json.dump({"source_hash": digest, "tasks": done}, f)
+
+    results = [row for t in tasks for row in done[_task_key(t)]]
+    return {"source_hash": digest, "amplitude": AMPLITUDE,
+            "results": results}
+
+
+def compare_baseline(summary: dict, baseline: dict,
+                     tolerance: float) -> tuple[list[str], bool]:
+    """Report lines and pass/fail for summary vs baseline. An error that
+    grows by more than tolerance, a byte or T-state cost that grows, or a
+    baseline row that is no longer produced, fails; improvements and new
+    rows are listed. Baseline rows for table sizes this run didn't cover
+    are ignored."""
+    current = {r["id"]: r for r in summary["results"]}
+    sizes = {r["size"] for r in summary["results"]}
+    lines, ok = [], True
+    if baseline.get("source_hash") != summary.get("source_hash"):
+        lines.append("NOTE  table engine source differs from the baseline's")
+    for old in baseline.get("results", []):
+        if old["size"] not in sizes:
+            continue
+        new = current.get(old["id"])
+        if new is None:
+            if old["id"].startswith("optimise/") and sinetable.np is None:
+                lines.append(f"SKIP  {old['id']} (needs NumPy)")
+                continue
+            lines.append(f"GONE  {old['id']}")
+            ok = False
+            continue
+        for field, allowed in (("max_error", tolerance),
+                               ("rms_error", tolerance),
+                               ("bytes", 0),
+                               ("generate_tstates", 0),
+                               ("lookup_tstates", 0)):
+            if old[field] is None or new[field] is None:
+                if old[field] != new[field]:
+                    lines.append(f"FAIL  {old['id']}: {field} "
+                                 f"{old[field]} -> {new[field]}")
+                    ok = False
+                continue
+            delta = new[field] - old[field]
+            if delta > allowed:
+                lines.append(f"FAIL  {old['id']}: {field} "
+                             f"{old[field]} -> {new[field]}")
+                ok = False
+            elif delta < 0:
+                lines.append(f"BETTER {old['id']}: {field} "
+                             f"{old[field]} -> {new[field]}")
+    known = {r["id"] for r in baseline.get("results", [])}
+    for row in summary["results"]:
+        if row["id"] not in known:
+            lines.append(f"NEW   {row['id']}")
+    return lines, ok
+
+
+def format_summary(summary: dict) -> str:
+    lines = [f"{'Result':<34} {'Bytes':>5} {'Gen T':>9} {'Lookup T':>8} "
+             f"{'MaxE':>5} {'RMS':>7}",
+             "-" * 73]
+    for r in summary["results"]:
+        gen = "-" if r["generate_tstates"] is None else r["generate_tstates"]
+        look = "-" if r["lookup_tstates"] is None else r["lookup_tstates"]
+        nbytes = "-" if r["bytes"] is None else r["bytes"]
+        lines.append(f"{r['id']:<34} {nbytes:>5} {gen:>9} {look:>8} "
+                     f"{r['max_error']:5.0f} {r['rms_error']:7.4f}")
+    return "\n".join(lines)
+
+
+def _int_list(text: str) -> tuple[int, ...]:
+    """argparse type for comma-separated integers."""
+    try:
+        return tuple(int(v) for v in text.split(",") if v.strip())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a list of integers: {text}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Sine table approach comparison and regression harness")
+    parser.add_argument("--verify", action="store_true",
+                        help="Run the regression harness against the baseline")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Run the harness and write its summary as the "
+                             "new baseline")
+    parser.add_argument("--json", action="store_true",
+                        help="With --verify, print the summary as JSON")
+    parser.add_argument("--baseline", type=Path, default=BASELINE,
+                        metavar="FILE",
+                        help=f"Baseline summary (default: "
+                             f"{BASELINE.relative_to(ROOT)})")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        metavar="X",
+                        help="Allowed growth in max/RMS error (default: 0)")
+    parser.add_argument("--sizes", type=_int_list, default=HARNESS_SIZES,
+                        metavar="N,N,...",
+                        help="Table sizes (default: 64,128,256)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, metavar="N",
+                        help="Worker processes (default: 1, 0 = all CPUs)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Recompute everything and leave the cache alone")
+    args = parser.parse_args(argv)
+    bad = [n for n in args.sizes if not sinetable.optimisable_size(n)
+           or n < 16]
+    if bad:
+        parser.error("--sizes must be powers of two, 16..256")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not (args.verify or args.update_baseline):
+        print_report()
+        return
+
+    summary = run_harness(args.sizes, jobs=args.jobs or os.cpu_count() or 1,
+                          use_cache=not args.no_cache)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+            f.write("\n")
+        print(f"Wrote {args.baseline} ({len(summary['results'])} results)")
+        return
+
+    print(json.dumps(summary, indent=2) if args.json
+          else format_summary(summary))
+    baseline = _load_json(args.baseline)
+    if baseline is None:
+        print(f"Error: no baseline at {args.baseline} "
+              f"(run with --update-baseline)", file=sys.stderr)
+        sys.exit(1)
+    lines, ok = compare_baseline(summary, baseline, args.tolerance)
+    out = sys.stderr if args.json else sys.stdout
+    if not args.json:
+        print()
+    for line in lines:
+        print(line, file=out)
+    print(f"{'OK' if ok else 'REGRESSION'}: {len(summary['results'])} "
+          f"results vs {args.baseline.name}", file=out)
+    if not ok:
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()